@@ -0,0 +1,93 @@
+"""store enum columns as smallint
+
+Revision ID: 4f1a7c2e9d30
+Revises: b26bd24389e0
+Create Date: 2026-10-17 16:02:11.418203
+
+"""
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f1a7c2e9d30'
+down_revision: Union[str, None] = 'b26bd24389e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+ASSET_TYPES = ('STOCK', 'ETF', 'CRYPTO', 'BOND', 'COMMODITY', 'CASH')
+RISK_CATEGORIES = ('LOW', 'MEDIUM', 'HIGH', 'VERY_HIGH')
+DIVIDEND_TYPES = ('CASH', 'STOCK', 'REINVESTED')
+
+# (table, column, enum type name, member names, nullable)
+ENUM_COLUMNS = (
+    ('portfolios', 'risk_category', 'riskcategoryenum', RISK_CATEGORIES, True),
+    ('pies', 'risk_category', 'riskcategoryenum', RISK_CATEGORIES, True),
+    ('positions', 'asset_type', 'assettypeenum', ASSET_TYPES, False),
+    ('dividends', 'dividend_type', 'dividendtypeenum', DIVIDEND_TYPES, False),
+)
+
+
+def _case(column: str, mapping, cast_to: Optional[str] = None) -> str:
+    whens = ' '.join(f"WHEN {source} THEN {target}" for source, target in mapping)
+    case = f"CASE {column} {whens} END"
+    return f"CAST({case} AS {cast_to})" if cast_to else case
+
+
+def _convert(table: str, column: str, new_type, mapping, nullable: bool, cast_to: Optional[str] = None) -> None:
+    """Copy a column through a CASE mapping into a new column of ``new_type``."""
+    temp_column = f"{column}_new"
+    op.add_column(table, sa.Column(temp_column, new_type, nullable=True))
+    op.execute(f"UPDATE {table} SET {temp_column} = {_case(column, mapping, cast_to)}")
+    with op.batch_alter_table(table) as batch_op:
+        batch_op.drop_column(column)
+        batch_op.alter_column(
+            temp_column,
+            new_column_name=column,
+            existing_type=new_type,
+            nullable=nullable
+        )
+
+
+def upgrade() -> None:
+    for table, column, _, members, nullable in ENUM_COLUMNS:
+        mapping = [(f"'{name}'", value) for value, name in enumerate(members, start=1)]
+        _convert(table, column, sa.SmallInteger(), mapping, nullable)
+
+    # Native enum types are left behind on PostgreSQL once no column uses them
+    for type_name in sorted({type_name for _, _, type_name, _, _ in ENUM_COLUMNS}):
+        sa.Enum(name=type_name).drop(op.get_bind(), checkfirst=True)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+
+    # Codes added after this revision (e.g. dividend types 4-7) have no enum
+    # member to go back to; refuse rather than write NULL into NOT NULL columns
+    for table, column, _, members, _ in ENUM_COLUMNS:
+        unmapped = bind.execute(sa.text(
+            f"SELECT COUNT(*) FROM {table} "
+            f"WHERE {column} IS NOT NULL AND {column} NOT BETWEEN 1 AND {len(members)}"
+        )).scalar()
+        if unmapped:
+            raise RuntimeError(
+                f"Cannot downgrade {table}.{column}: {unmapped} rows hold codes "
+                f"outside 1-{len(members)} with no {', '.join(members)} equivalent"
+            )
+
+    for type_name, members in (
+        ('riskcategoryenum', RISK_CATEGORIES),
+        ('assettypeenum', ASSET_TYPES),
+        ('dividendtypeenum', DIVIDEND_TYPES),
+    ):
+        sa.Enum(*members, name=type_name).create(bind, checkfirst=True)
+
+    # CASE yields text, which PostgreSQL only assigns to a native enum with an explicit cast
+    is_postgresql = bind.dialect.name == 'postgresql'
+    for table, column, type_name, members, nullable in ENUM_COLUMNS:
+        mapping = [(value, f"'{name}'") for value, name in enumerate(members, start=1)]
+        enum_type = sa.Enum(*members, name=type_name, create_type=False)
+        _convert(table, column, enum_type, mapping, nullable, cast_to=type_name if is_postgresql else None)
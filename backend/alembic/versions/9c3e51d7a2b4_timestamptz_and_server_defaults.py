@@ -0,0 +1,55 @@
+"""store timestamps as timestamptz with server defaults
+
+Revision ID: 9c3e51d7a2b4
+Revises: 4f1a7c2e9d30
+Create Date: 2026-10-17 16:41:52.207316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3e51d7a2b4'
+down_revision: Union[str, None] = '4f1a7c2e9d30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, nullable, has server default)
+TIMESTAMP_COLUMNS = (
+    ('portfolios', 'created_at', False, True),
+    ('portfolios', 'last_updated', False, True),
+    ('portfolios', 'last_sync', True, False),
+    ('pies', 'created_at', False, False),
+    ('pies', 'last_rebalanced', True, False),
+    ('pies', 'last_updated', False, True),
+    ('positions', 'last_updated', False, True),
+    ('dividends', 'created_at', False, True),
+    ('historical_data', 'created_at', False, True),
+    ('performance_snapshots', 'created_at', False, True),
+)
+
+
+def _alter(new_type, existing_type, with_default: bool) -> None:
+    for table, column, nullable, server_default in TIMESTAMP_COLUMNS:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(
+                column,
+                type_=new_type,
+                existing_type=existing_type,
+                existing_nullable=nullable,
+                server_default=sa.text('CURRENT_TIMESTAMP') if with_default and server_default else None,
+                # Existing naive values were written as UTC
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'"
+            )
+
+
+def upgrade() -> None:
+    _alter(sa.DateTime(timezone=True), sa.DateTime(), with_default=True)
+
+
+def downgrade() -> None:
+    _alter(sa.DateTime(), sa.DateTime(timezone=True), with_default=False)
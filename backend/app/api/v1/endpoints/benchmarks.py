@@ -8,7 +8,7 @@ from app.core.deps import get_trading212_api_key, get_current_user_id
 from app.core.config import settings
 from app.services.trading212_service import Trading212Service, Trading212APIError
 from app.services.benchmark_service import BenchmarkService, BenchmarkAPIError
-from app.models.benchmark import BenchmarkData, BenchmarkComparison, BenchmarkInfo
+from app.models.benchmark import BenchmarkData, BenchmarkComparison, BenchmarkInfo, CustomBenchmark
 
 logger = logging.getLogger(__name__)
 
@@ -692,7 +692,6 @@ async def compare_to_custom_benchmark(
                     detail=f"Custom benchmark {custom_benchmark_id} not found"
                 )
             
-            from app.models.benchmark import CustomBenchmark
             custom_benchmark = CustomBenchmark(**cached_data)
             
             # Calculate custom benchmark data
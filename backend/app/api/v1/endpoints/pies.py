@@ -1,12 +1,13 @@
 from typing import Any, List, Optional, Dict
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query, Path
 from datetime import datetime
 from decimal import Decimal
 
 from app.core.deps import get_trading212_api_key, get_current_user_id
 from app.services.trading212_service import Trading212Service, Trading212APIError
 from app.models.pie import Pie, PieMetrics
-from app.models.position import Position
+from app.models.position import Position, dump_positions_json
+from app.models.position_batch import top_positions
 
 router = APIRouter()
 
@@ -246,7 +247,7 @@ async def get_pie_positions(
             if limit:
                 positions = positions[:limit]
             
-            return positions
+            return Response(content=dump_positions_json(positions), media_type="application/json")
             
     except Trading212APIError as e:
         raise HTTPException(
@@ -423,13 +424,9 @@ async def get_pie_top_holdings(
                     detail=f"Pie with ID {pie_id} not found"
                 )
             
-            top_holdings = sorted(
-                pie.positions, 
-                key=lambda p: p.market_value, 
-                reverse=True
-            )[:limit]
+            top_holdings = top_positions(pie.positions, limit)
             
-            return top_holdings
+            return Response(content=dump_positions_json(top_holdings), media_type="application/json")
             
     except Trading212APIError as e:
         raise HTTPException(
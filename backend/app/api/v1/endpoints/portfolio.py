@@ -1,5 +1,5 @@
 from typing import Any, List, Optional, Dict
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from datetime import datetime, timedelta
 from decimal import Decimal
 import asyncio
@@ -8,7 +8,8 @@ from app.core.deps import get_trading212_api_key, get_current_user_id, get_redis
 from app.services.trading212_service import Trading212Service, Trading212APIError
 from app.services.calculations_service import CalculationsService
 from app.models.portfolio import Portfolio, PortfolioMetrics
-from app.models.position import Position
+from app.models.position import Position, dump_positions_json
+from app.models.position_batch import top_positions
 from app.models.pie import Pie
 from app.models.historical import HistoricalData
 import redis
@@ -222,7 +223,9 @@ async def get_portfolio_positions(
                 )
             
             portfolio = await service.fetch_portfolio_data()
-            all_positions = portfolio.all_positions
+            
+            # Copy the cached holdings list before sorting it in place
+            all_positions = list(portfolio.all_positions)
             
             # Sort positions
             reverse_sort = sort_order == "desc"
@@ -241,7 +244,7 @@ async def get_portfolio_positions(
             if limit:
                 all_positions = all_positions[:limit]
             
-            return all_positions
+            return Response(content=dump_positions_json(all_positions), media_type="application/json")
             
     except Trading212APIError as e:
         raise HTTPException(
@@ -280,13 +283,9 @@ async def get_top_holdings(
                 )
             
             portfolio = await service.fetch_portfolio_data()
-            top_holdings = sorted(
-                portfolio.all_positions, 
-                key=lambda p: p.market_value, 
-                reverse=True
-            )[:limit]
+            top_holdings = top_positions(portfolio.all_positions, limit)
             
-            return top_holdings
+            return Response(content=dump_positions_json(top_holdings), media_type="application/json")
             
     except Trading212APIError as e:
         raise HTTPException(
@@ -573,7 +572,7 @@ async def get_portfolio_diversification_analysis(
             
             return {
                 "diversification_scores": diversification,
-                "total_positions": len(portfolio.all_positions),
+                "total_positions": portfolio.total_positions,
                 "total_value": float(portfolio.metrics.total_value)
             }
             
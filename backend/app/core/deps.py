@@ -1,4 +1,4 @@
-from typing import Generator, Optional
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
@@ -6,7 +6,7 @@ import redis
 
 from app.core.security import verify_token
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.db.session import get_db  # noqa: F401  (re-exported dependency)
 
 # Security scheme for JWT tokens
 security = HTTPBearer()
@@ -15,15 +15,6 @@ security = HTTPBearer()
 redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
 
 
-def get_db() -> Generator:
-    """Database dependency"""
-    try:
-        db = SessionLocal()
-        yield db
-    finally:
-        db.close()
-
-
 def get_redis() -> redis.Redis:
     """Redis dependency"""
     return redis_client
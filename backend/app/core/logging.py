@@ -14,8 +14,10 @@ from datetime import datetime
 from typing import Any, Dict, Optional, Set
 from contextvars import ContextVar
 
-# Context variables for request tracking
-request_id_var: ContextVar[str] = ContextVar('request_id')
+import orjson
+
+# Context variables for request tracking; an empty request ID means no request
+request_id_var: ContextVar[str] = ContextVar('request_id', default='')
 user_id_var: ContextVar[Optional[str]] = ContextVar('user_id', default=None)
 
 
@@ -106,6 +108,15 @@ class SecurityFilter(logging.Filter):
             return value
 
 
+# Standard LogRecord attributes that are not copied into the JSON "extra" block
+_RECORD_ATTRS = frozenset({
+    'name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 'filename',
+    'module', 'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
+    'thread', 'threadName', 'processName', 'process', 'getMessage',
+    'exc_info', 'exc_text', 'stack_info', 'timestamp'
+})
+
+
 class ContextualFormatter(logging.Formatter):
     """
     Custom formatter that includes request context and outputs structured JSON logs.
@@ -147,20 +158,19 @@ class ContextualFormatter(logging.Formatter):
                 }
             
             # Add any extra fields from the log record
-            extra_fields = {}
-            for key, value in record.__dict__.items():
-                if key not in {
-                    'name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 'filename',
-                    'module', 'lineno', 'funcName', 'created', 'msecs', 'relativeCreated',
-                    'thread', 'threadName', 'processName', 'process', 'getMessage',
-                    'exc_info', 'exc_text', 'stack_info', 'timestamp'
-                }:
-                    extra_fields[key] = value
+            extra_fields = {
+                key: value for key, value in record.__dict__.items()
+                if key not in _RECORD_ATTRS
+            }
             
             if extra_fields:
                 log_data['extra'] = extra_fields
             
-            return json.dumps(log_data, default=str, ensure_ascii=False)
+            try:
+                return orjson.dumps(log_data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+            except TypeError:
+                # orjson rejects some values (e.g. integers beyond 64 bits)
+                return json.dumps(log_data, default=str, ensure_ascii=False)
         
         except Exception as e:
             # Fallback to simple format if JSON formatting fails
@@ -170,17 +180,13 @@ class ContextualFormatter(logging.Formatter):
         """Get current request context from context variables."""
         context = {}
         
-        try:
-            context['request_id'] = request_id_var.get()
-        except LookupError:
-            pass
+        request_id = request_id_var.get()
+        if request_id:
+            context['request_id'] = request_id
         
-        try:
-            user_id = user_id_var.get()
-            if user_id:
-                context['user_id'] = user_id
-        except LookupError:
-            pass
+        user_id = user_id_var.get()
+        if user_id:
+            context['user_id'] = user_id
         
         return context if context else None
 
@@ -325,17 +331,13 @@ class ContextLogger:
         context = {}
         
         # Add request context if available
-        try:
-            context['request_id'] = request_id_var.get()
-        except LookupError:
-            pass
+        request_id = request_id_var.get()
+        if request_id:
+            context['request_id'] = request_id
         
-        try:
-            user_id = user_id_var.get()
-            if user_id:
-                context['user_id'] = user_id
-        except LookupError:
-            pass
+        user_id = user_id_var.get()
+        if user_id:
+            context['user_id'] = user_id
         
         # Merge with provided extra data
         if extra:
@@ -343,8 +345,14 @@ class ContextLogger:
         
         return context
     
+    def isEnabledFor(self, level: int) -> bool:
+        """Check whether messages at the given level would be emitted."""
+        return self.logger.isEnabledFor(level)
+    
     def debug(self, message: str, extra: Optional[Dict] = None) -> None:
         """Log debug message with context."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         self.logger.debug(message, extra=self._get_extra_context(extra))
     
     def info(self, message: str, extra: Optional[Dict] = None) -> None:
@@ -6,14 +6,17 @@ API health monitoring, user analytics, and system health tracking.
 """
 
 import asyncio
+import logging
+import os
 import time
 from collections import defaultdict, deque
+from itertools import islice
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Deque
+from typing import Dict, List, Optional, Any, Deque, Tuple
 from dataclasses import dataclass, field
-from enum import Enum
-import json
+from enum import IntEnum
 
+import orjson
 import redis.asyncio as redis
 from app.core.logging import get_context_logger
 from app.core.config import settings
@@ -21,16 +24,42 @@ from app.core.config import settings
 
 logger = get_context_logger(__name__)
 
+_DEBUG = logging.DEBUG
 
-class MetricType(str, Enum):
+# Shared placeholders for records without metadata or tags; never mutated
+_EMPTY_METADATA: Dict[str, Any] = {}
+_EMPTY_TAGS: Dict[str, str] = {}
+
+# Fixed-schema tag dicts reused across metric points
+_HEALTH_STATUS_TAGS: Dict[str, Dict[str, str]] = {
+    status: {'status': status}
+    for status in ("unknown", "healthy", "degraded", "unhealthy")
+}
+
+# Redis stream storage for metric points
+METRICS_STREAM_PREFIX = "metrics:"
+METRICS_STREAM_MAXLEN = 100_000
+METRICS_STREAM_TTL_SECONDS = 7 * 24 * 3600  # streams not written for a week expire
+
+# Bounded write-behind queue feeding Redis; oldest points are dropped when full
+METRICS_REDIS_QUEUE_MAXLEN = 10_000
+METRICS_REDIS_BATCH_SIZE = 500
+METRICS_FLUSH_INTERVAL_SECONDS = 1.0
+
+
+class MetricType(IntEnum):
     """Types of metrics that can be collected."""
-    COUNTER = "counter"
-    GAUGE = "gauge"
-    HISTOGRAM = "histogram"
-    TIMER = "timer"
+    COUNTER = 0
+    GAUGE = 1
+    HISTOGRAM = 2
+    TIMER = 3
+
 
+# Serialized metric type names, indexed by MetricType value
+_TYPE_NAMES = ("counter", "gauge", "histogram", "timer")
 
-@dataclass
+
+@dataclass(slots=True)
 class MetricPoint:
     """A single metric data point."""
     name: str
@@ -40,23 +69,35 @@ class MetricPoint:
     metric_type: MetricType = MetricType.GAUGE
 
 
-@dataclass
+@dataclass(slots=True)
 class APIHealthMetrics:
     """Metrics for API health monitoring."""
     endpoint: str
     total_requests: int = 0
     successful_requests: int = 0
     failed_requests: int = 0
-    avg_response_time: float = 0.0
     max_response_time: float = 0.0
     min_response_time: float = float('inf')
-    error_rate: float = 0.0
     last_success: Optional[datetime] = None
     last_failure: Optional[datetime] = None
     response_times: Deque[float] = field(default_factory=lambda: deque(maxlen=100))
+    
+    @property
+    def avg_response_time(self) -> float:
+        """Mean of the most recent response times."""
+        if not self.response_times:
+            return 0.0
+        return sum(self.response_times) / len(self.response_times)
+    
+    @property
+    def error_rate(self) -> float:
+        """Percentage of failed requests."""
+        if not self.total_requests:
+            return 0.0
+        return self.failed_requests * 100.0 / self.total_requests
 
 
-@dataclass
+@dataclass(slots=True)
 class Trading212APIMetrics:
     """Specific metrics for Trading 212 API monitoring."""
     total_requests: int = 0
@@ -67,14 +108,30 @@ class Trading212APIMetrics:
     current_rate_limit: int = 60
     remaining_requests: int = 60
     rate_limit_reset_time: Optional[datetime] = None
-    avg_response_time: float = 0.0
+    avg_response_time: float = 0.0  # Exponentially weighted over successful requests
     last_request_time: Optional[datetime] = None
     consecutive_failures: int = 0
-    error_rate: float = 0.0
-    health_status: str = "unknown"  # healthy, degraded, unhealthy
+    
+    @property
+    def error_rate(self) -> float:
+        """Percentage of failed requests."""
+        if not self.total_requests:
+            return 0.0
+        return self.failed_requests * 100.0 / self.total_requests
+    
+    @property
+    def health_status(self) -> str:
+        """Health status: unknown, healthy, degraded or unhealthy."""
+        if not self.total_requests:
+            return "unknown"
+        if self.consecutive_failures >= 5:
+            return "unhealthy"
+        if self.consecutive_failures >= 2 or (self.error_rate > 10 and self.total_requests > 10):
+            return "degraded"
+        return "healthy"
 
 
-@dataclass
+@dataclass(slots=True)
 class UserActionMetrics:
     """Metrics for user actions and behavior."""
     total_sessions: int = 0
@@ -87,7 +144,7 @@ class UserActionMetrics:
     session_durations: Deque[float] = field(default_factory=lambda: deque(maxlen=100))
 
 
-@dataclass
+@dataclass(slots=True)
 class SystemHealthMetrics:
     """System-wide health metrics."""
     uptime_seconds: float = 0.0
@@ -108,9 +165,20 @@ class MetricsCollector:
     API health tracking, user analytics, and system health.
     """
     
+    # User action name -> UserActionMetrics counter attribute
+    _ACTION_ATTRS: Dict[str, str] = {
+        "session_created": "total_sessions",
+        "api_key_setup": "api_key_setups",
+        "api_key_validation": "api_key_validations",
+        "portfolio_data_fetch": "portfolio_data_fetches",
+        "dashboard_view": "dashboard_views",
+    }
+    
     def __init__(self, redis_client: Optional[redis.Redis] = None):
         self.redis_client = redis_client
         self.start_time = datetime.utcnow()
+        self._pid = os.getpid()
+        self._ewma_alpha = settings.METRICS_EWMA_ALPHA
         
         # In-memory metric storage
         self.api_metrics: Dict[str, APIHealthMetrics] = {}
@@ -120,9 +188,23 @@ class MetricsCollector:
         
         # Metric points for time series data
         self.metric_points: Deque[MetricPoint] = deque(maxlen=10000)
+        self._record_points = bool(redis_client) or settings.METRICS_KEEP_TIMESERIES
         
-        # Error tracking
-        self.recent_errors: Deque[Dict[str, Any]] = deque(maxlen=1000)
+        # Interned point names and tag dicts for per-endpoint metric points
+        self._api_point_cache: Dict[str, Tuple[str, str, Dict[str, str]]] = {}
+        self._api_status_tag_cache: Dict[Tuple[str, int], Dict[str, str]] = {}
+        self._rate_limit_tag_cache: Dict[int, Dict[str, str]] = {}
+        
+        # Pending Redis writes, drained by a background flusher so producers
+        # never wait on Redis
+        self._redis_queue: Deque[MetricPoint] = deque(maxlen=METRICS_REDIS_QUEUE_MAXLEN)
+        self._dropped_points = 0
+        self._flush_task: Optional[asyncio.Task] = None
+        
+        # Error tracking as compact
+        # (timestamp, error_type, error_message, component, severity, metadata)
+        # records; dicts are only built when errors are read
+        self.recent_errors: Deque[Tuple[float, str, str, str, str, Dict[str, Any]]] = deque(maxlen=1000)
         
         logger.info("MetricsCollector initialized")
     
@@ -137,6 +219,30 @@ class MetricsCollector:
         """
         Record API endpoint performance metrics.
         
+        Args:
+            endpoint: API endpoint path
+            method: HTTP method
+            status_code: Response status code
+            response_time: Request duration in seconds
+            error_type: Type of error if request failed
+        """
+        self.record_api_request_nowait(endpoint, method, status_code, response_time, error_type)
+    
+    def record_api_request_nowait(
+        self,
+        endpoint: str,
+        method: str,
+        status_code: int,
+        response_time: float,
+        error_type: Optional[str] = None
+    ) -> None:
+        """
+        Record API endpoint performance metrics without awaiting.
+        
+        Only in-memory aggregates are updated here; Redis persistence is
+        handled by the background flusher, so callers on the response path
+        never wait on I/O.
+        
         Args:
             endpoint: API endpoint path
             method: HTTP method
@@ -150,59 +256,60 @@ class MetricsCollector:
         metrics = self.api_metrics[metric_key]
         
         # Update request counts
+        now = datetime.utcnow()
         metrics.total_requests += 1
         if 200 <= status_code < 300:
             metrics.successful_requests += 1
-            metrics.last_success = datetime.utcnow()
+            metrics.last_success = now
         else:
             metrics.failed_requests += 1
-            metrics.last_failure = datetime.utcnow()
+            metrics.last_failure = now
         
         # Update response time metrics
         metrics.response_times.append(response_time)
-        if metrics.response_times:
-            metrics.avg_response_time = sum(metrics.response_times) / len(metrics.response_times)
-            metrics.max_response_time = max(metrics.max_response_time, response_time)
-            metrics.min_response_time = min(metrics.min_response_time, response_time)
-        
-        # Calculate error rate
-        if metrics.total_requests > 0:
-            metrics.error_rate = (metrics.failed_requests / metrics.total_requests) * 100
+        if response_time > metrics.max_response_time:
+            metrics.max_response_time = response_time
+        if response_time < metrics.min_response_time:
+            metrics.min_response_time = response_time
         
         # Record metric points for time series
-        await self._record_metric_point(
-            f"api.requests.{metric_key.replace(' ', '_').replace('/', '_')}",
-            1,
-            MetricType.COUNTER,
-            {
+        point_names = self._api_point_cache.get(metric_key)
+        if point_names is None:
+            safe_key = metric_key.replace(' ', '_').replace('/', '_')
+            point_names = self._api_point_cache[metric_key] = (
+                f"api.requests.{safe_key}",
+                f"api.response_time.{safe_key}",
+                {'endpoint': endpoint, 'method': method}
+            )
+        requests_name, response_time_name, endpoint_tags = point_names
+        
+        status_tags = self._api_status_tag_cache.get((metric_key, status_code))
+        if status_tags is None:
+            status_tags = self._api_status_tag_cache[(metric_key, status_code)] = {
                 'endpoint': endpoint,
                 'method': method,
                 'status_code': str(status_code),
                 'success': str(200 <= status_code < 300)
             }
-        )
-        
-        await self._record_metric_point(
-            f"api.response_time.{metric_key.replace(' ', '_').replace('/', '_')}",
-            response_time * 1000,  # Convert to milliseconds
-            MetricType.HISTOGRAM,
-            {
-                'endpoint': endpoint,
-                'method': method
-            }
-        )
         
-        logger.debug(
-            "API request metrics recorded",
-            extra={
-                'endpoint': endpoint,
-                'method': method,
-                'status_code': status_code,
-                'response_time_ms': round(response_time * 1000, 2),
-                'total_requests': metrics.total_requests,
-                'error_rate': round(metrics.error_rate, 2)
-            }
-        )
+        self._record_metric_points([
+            (requests_name, 1, MetricType.COUNTER, status_tags),
+            # Response time in milliseconds
+            (response_time_name, response_time * 1000, MetricType.HISTOGRAM, endpoint_tags)
+        ], now)
+        
+        if logger.isEnabledFor(_DEBUG):
+            logger.debug(
+                "API request metrics recorded",
+                extra={
+                    'endpoint': endpoint,
+                    'method': method,
+                    'status_code': status_code,
+                    'response_time_ms': round(response_time * 1000, 2),
+                    'total_requests': metrics.total_requests,
+                    'error_rate': round(metrics.error_rate, 2)
+                }
+            )
     
     async def record_trading212_request(
         self,
@@ -229,8 +336,9 @@ class MetricsCollector:
         metrics = self.trading212_metrics
         
         # Update request counts
+        now = datetime.utcnow()
         metrics.total_requests += 1
-        metrics.last_request_time = datetime.utcnow()
+        metrics.last_request_time = now
         
         if success:
             metrics.successful_requests += 1
@@ -252,68 +360,53 @@ class MetricsCollector:
         if rate_limit_reset is not None:
             metrics.rate_limit_reset_time = rate_limit_reset
         
-        # Update response time
+        # Update response time as an exponentially weighted moving average
         if success:
-            # Simple moving average
-            if metrics.total_requests == 1:
+            if metrics.successful_requests == 1:
                 metrics.avg_response_time = response_time
             else:
-                metrics.avg_response_time = (
-                    (metrics.avg_response_time * (metrics.successful_requests - 1) + response_time) /
-                    metrics.successful_requests
-                )
-        
-        # Calculate error rate
-        if metrics.total_requests > 0:
-            metrics.error_rate = (metrics.failed_requests / metrics.total_requests) * 100
-        
-        # Determine health status
-        if metrics.consecutive_failures >= 5:
-            metrics.health_status = "unhealthy"
-        elif metrics.consecutive_failures >= 2 or (metrics.error_rate > 10 and metrics.total_requests > 10):
-            metrics.health_status = "degraded"
-        else:
-            metrics.health_status = "healthy"
+                metrics.avg_response_time += self._ewma_alpha * (response_time - metrics.avg_response_time)
         
         # Record metric points
-        await self._record_metric_point(
-            "trading212.requests.total",
-            1,
-            MetricType.COUNTER,
-            {
-                'endpoint': endpoint,
-                'success': str(success),
-                'rate_limited': str(rate_limited),
-                'auth_failure': str(auth_failure)
-            }
-        )
-        
-        await self._record_metric_point(
-            "trading212.rate_limit.remaining",
-            metrics.remaining_requests,
-            MetricType.GAUGE,
-            {'limit': str(metrics.current_rate_limit)}
-        )
-        
-        await self._record_metric_point(
-            "trading212.health.consecutive_failures",
-            metrics.consecutive_failures,
-            MetricType.GAUGE,
-            {'status': metrics.health_status}
-        )
-        
-        logger.debug(
-            "Trading 212 API metrics recorded",
-            extra={
-                'endpoint': endpoint,
-                'success': success,
-                'response_time_ms': round(response_time * 1000, 2),
-                'rate_limited': rate_limited,
-                'remaining_requests': metrics.remaining_requests,
-                'health_status': metrics.health_status,
-                'consecutive_failures': metrics.consecutive_failures
-            }
-        )
+        self._record_metric_points([
+            (
+                "trading212.requests.total",
+                1,
+                MetricType.COUNTER,
+                {
+                    'endpoint': endpoint,
+                    'success': str(success),
+                    'rate_limited': str(rate_limited),
+                    'auth_failure': str(auth_failure)
+                }
+            ),
+            (
+                "trading212.rate_limit.remaining",
+                metrics.remaining_requests,
+                MetricType.GAUGE,
+                self._rate_limit_tags(metrics.current_rate_limit)
+            ),
+            (
+                "trading212.health.consecutive_failures",
+                metrics.consecutive_failures,
+                MetricType.GAUGE,
+                _HEALTH_STATUS_TAGS[metrics.health_status]
+            )
+        ], now)
+        
+        if logger.isEnabledFor(_DEBUG):
+            logger.debug(
+                "Trading 212 API metrics recorded",
+                extra={
+                    'endpoint': endpoint,
+                    'success': success,
+                    'response_time_ms': round(response_time * 1000, 2),
+                    'rate_limited': rate_limited,
+                    'remaining_requests': metrics.remaining_requests,
+                    'health_status': metrics.health_status,
+                    'consecutive_failures': metrics.consecutive_failures
+                }
+            )
     
     async def record_user_action(
         self,
@@ -334,19 +427,12 @@ class MetricsCollector:
         metrics = self.user_metrics
         
         # Update action-specific counters
-        if action == "session_created":
-            metrics.total_sessions += 1
-        elif action == "api_key_setup":
-            metrics.api_key_setups += 1
-        elif action == "api_key_validation":
-            metrics.api_key_validations += 1
-        elif action == "portfolio_data_fetch":
-            metrics.portfolio_data_fetches += 1
-        elif action == "dashboard_view":
-            metrics.dashboard_views += 1
+        attr = self._ACTION_ATTRS.get(action)
+        if attr is not None:
+            setattr(metrics, attr, getattr(metrics, attr) + 1)
         
         # Record metric point
-        await self._record_metric_point(
+        self._record_metric_point(
             f"user.actions.{action}",
             1,
             MetricType.COUNTER,
@@ -357,15 +443,16 @@ class MetricsCollector:
             }
         )
         
-        logger.debug(
-            "User action metrics recorded",
-            extra={
-                'action': action,
-                'session_id': session_id,
-                'success': success,
-                'metadata': metadata
-            }
-        )
+        if logger.isEnabledFor(_DEBUG):
+            logger.debug(
+                "User action metrics recorded",
+                extra={
+                    'action': action,
+                    'session_id': session_id,
+                    'success': success,
+                    'metadata': metadata
+                }
+            )
     
     async def record_error(
         self,
@@ -385,20 +472,13 @@ class MetricsCollector:
             severity: Error severity level
             metadata: Additional error metadata
         """
-        error_record = {
-            'timestamp': datetime.utcnow().isoformat(),
-            'error_type': error_type,
-            'error_message': error_message,
-            'component': component,
-            'severity': severity,
-            'metadata': metadata or {}
-        }
-        
-        self.recent_errors.append(error_record)
+        self.recent_errors.append(
+            (time.time(), error_type, error_message, component, severity, metadata or _EMPTY_METADATA)
+        )
         self.system_metrics.total_errors += 1
         
         # Record metric point
-        await self._record_metric_point(
+        self._record_metric_point(
             f"errors.{component}.{error_type}",
             1,
             MetricType.COUNTER,
@@ -409,15 +489,16 @@ class MetricsCollector:
             }
         )
         
-        logger.debug(
-            "Error metrics recorded",
-            extra={
-                'error_type': error_type,
-                'component': component,
-                'severity': severity,
-                'total_errors': self.system_metrics.total_errors
-            }
-        )
+        if logger.isEnabledFor(_DEBUG):
+            logger.debug(
+                "Error metrics recorded",
+                extra={
+                    'error_type': error_type,
+                    'component': component,
+                    'severity': severity,
+                    'total_errors': self.system_metrics.total_errors
+                }
+            )
     
     async def update_system_metrics(
         self,
@@ -440,68 +521,51 @@ class MetricsCollector:
         metrics = self.system_metrics
         
         # Update uptime
-        metrics.uptime_seconds = (datetime.utcnow() - self.start_time).total_seconds()
+        now = datetime.utcnow()
+        metrics.uptime_seconds = (now - self.start_time).total_seconds()
+        
+        points: List[Tuple[str, float, MetricType, Optional[Dict[str, str]]]] = []
         
         if memory_usage_mb is not None:
             metrics.memory_usage_mb = memory_usage_mb
-            await self._record_metric_point(
-                "system.memory.usage_mb",
-                memory_usage_mb,
-                MetricType.GAUGE
-            )
+            points.append(("system.memory.usage_mb", memory_usage_mb, MetricType.GAUGE, None))
         
         if cpu_usage_percent is not None:
             metrics.cpu_usage_percent = cpu_usage_percent
-            await self._record_metric_point(
-                "system.cpu.usage_percent",
-                cpu_usage_percent,
-                MetricType.GAUGE
-            )
+            points.append(("system.cpu.usage_percent", cpu_usage_percent, MetricType.GAUGE, None))
         
         if active_connections is not None:
             metrics.active_connections = active_connections
-            await self._record_metric_point(
-                "system.connections.active",
-                active_connections,
-                MetricType.GAUGE
-            )
+            points.append(("system.connections.active", active_connections, MetricType.GAUGE, None))
         
         if redis_connected is not None:
             metrics.redis_connected = redis_connected
-            await self._record_metric_point(
-                "system.redis.connected",
-                1 if redis_connected else 0,
-                MetricType.GAUGE
-            )
+            points.append(("system.redis.connected", 1 if redis_connected else 0, MetricType.GAUGE, None))
         
         if database_connected is not None:
             metrics.database_connected = database_connected
-            await self._record_metric_point(
-                "system.database.connected",
-                1 if database_connected else 0,
-                MetricType.GAUGE
+            points.append(("system.database.connected", 1 if database_connected else 0, MetricType.GAUGE, None))
+        
+        # Record uptime and metric points lost to queue overflow
+        points.append(("system.uptime.seconds", metrics.uptime_seconds, MetricType.GAUGE, None))
+        points.append(("system.metrics.dropped", self._dropped_points, MetricType.COUNTER, None))
+        
+        self._record_metric_points(points, now)
+        
+        if logger.isEnabledFor(_DEBUG):
+            logger.debug(
+                "System metrics updated",
+                extra={
+                    'uptime_seconds': round(metrics.uptime_seconds, 2),
+                    'memory_usage_mb': memory_usage_mb,
+                    'cpu_usage_percent': cpu_usage_percent,
+                    'active_connections': active_connections,
+                    'redis_connected': redis_connected,
+                    'database_connected': database_connected
+                }
             )
-        
-        # Record uptime
-        await self._record_metric_point(
-            "system.uptime.seconds",
-            metrics.uptime_seconds,
-            MetricType.GAUGE
-        )
-        
-        logger.debug(
-            "System metrics updated",
-            extra={
-                'uptime_seconds': round(metrics.uptime_seconds, 2),
-                'memory_usage_mb': memory_usage_mb,
-                'cpu_usage_percent': cpu_usage_percent,
-                'active_connections': active_connections,
-                'redis_connected': redis_connected,
-                'database_connected': database_connected
-            }
-        )
     
-    async def _record_metric_point(
+    def _record_metric_point(
         self,
         name: str,
         value: float,
@@ -509,46 +573,134 @@ class MetricsCollector:
         tags: Optional[Dict[str, str]] = None
     ) -> None:
         """Record a metric point for time series data."""
-        point = MetricPoint(
-            name=name,
-            value=value,
-            timestamp=datetime.utcnow(),
-            tags=tags or {},
-            metric_type=metric_type
-        )
+        self._record_metric_points([(name, value, metric_type, tags)])
+    
+    def _record_metric_points(
+        self,
+        points: List[Tuple[str, float, MetricType, Optional[Dict[str, str]]]],
+        timestamp: Optional[datetime] = None
+    ) -> None:
+        """
+        Record a batch of (name, value, metric_type, tags) metric points.
+        
+        Args:
+            points: Metric points sharing one timestamp
+            timestamp: Event time already read by the caller, if any
+        """
+        if not self._record_points:
+            return
+        
+        if timestamp is None:
+            timestamp = datetime.utcnow()
+        batch = [
+            MetricPoint(
+                name=name,
+                value=value,
+                timestamp=timestamp,
+                tags=tags or _EMPTY_TAGS,
+                metric_type=metric_type
+            )
+            for name, value, metric_type, tags in points
+        ]
         
-        self.metric_points.append(point)
+        self.metric_points.extend(batch)
         
-        # Optionally store in Redis for persistence
+        # Optionally queue for Redis persistence; a full queue evicts the
+        # oldest points instead of blocking
         if self.redis_client:
+            overflow = len(self._redis_queue) + len(batch) - METRICS_REDIS_QUEUE_MAXLEN
+            if overflow > 0:
+                self._dropped_points += overflow
+            self._redis_queue.extend(batch)
+            self._ensure_flush_task()
+    
+    def _ensure_flush_task(self) -> None:
+        """Start the background Redis flusher if it is not running."""
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        
+        self._flush_task = loop.create_task(self._flush_loop())
+    
+    async def _flush_loop(self) -> None:
+        """Periodically drain queued metric points to Redis."""
+        while True:
+            await asyncio.sleep(METRICS_FLUSH_INTERVAL_SECONDS)
+            await self.flush()
+    
+    async def flush(self) -> None:
+        """Write all queued metric points to Redis in batches."""
+        queue = self._redis_queue
+        while queue:
+            batch = [queue.popleft() for _ in range(min(METRICS_REDIS_BATCH_SIZE, len(queue)))]
             try:
-                await self._store_metric_in_redis(point)
+                await self._store_metrics_in_redis(batch)
             except Exception as e:
+                self._dropped_points += len(batch)
                 logger.warning(
-                    "Failed to store metric in Redis",
+                    "Failed to store metrics in Redis",
                     extra={
-                        'metric_name': name,
+                        'point_count': len(batch),
                         'error_type': type(e).__name__,
                         'error_message': str(e)
                     }
                 )
     
-    async def _store_metric_in_redis(self, point: MetricPoint) -> None:
-        """Store metric point in Redis for persistence."""
-        if not self.redis_client:
-            return
+    async def close(self) -> None:
+        """Stop the background flusher and write any remaining points."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
         
-        # Store in time series format
-        key = f"metrics:{point.name}:{point.timestamp.strftime('%Y%m%d%H')}"
-        data = {
-            'timestamp': point.timestamp.isoformat(),
-            'value': point.value,
-            'tags': json.dumps(point.tags),
-            'type': point.metric_type.value
-        }
+        await self.flush()
+    
+    def _rate_limit_tags(self, limit: int) -> Dict[str, str]:
+        """Get the shared tag dict for a rate limit value."""
+        tags = self._rate_limit_tag_cache.get(limit)
+        if tags is None:
+            tags = self._rate_limit_tag_cache[limit] = {'limit': str(limit)}
+        return tags
+    
+    async def _store_metrics_in_redis(self, points: List[MetricPoint]) -> None:
+        """Store a batch of metric points in Redis with a single round trip."""
+        if not self.redis_client or not points:
+            return
         
-        await self.redis_client.lpush(key, json.dumps(data))
-        await self.redis_client.expire(key, 86400 * 7)  # Keep for 7 days
+        # Append to capped streams; entry IDs carry the timestamp and MAXLEN
+        # bounds each stream's length. Every write also renews the stream's
+        # TTL so streams that stop receiving points expire.
+        # Entries carry the writing process so streams shared by several
+        # workers can be aggregated or split per worker when scraped.
+        # Tags can hold client-supplied values, so they are kept in one JSON
+        # field where they cannot clash with the reserved fields or fail encoding
+        pid = self._pid
+        streams = set()
+        pipe = self.redis_client.pipeline(transaction=False)
+        for point in points:
+            stream = f"{METRICS_STREAM_PREFIX}{point.name}"
+            streams.add(stream)
+            pipe.xadd(
+                stream,
+                {
+                    'v': point.value,
+                    't': _TYPE_NAMES[point.metric_type],
+                    'pid': pid,
+                    'tags': orjson.dumps(point.tags, default=str)
+                },
+                maxlen=METRICS_STREAM_MAXLEN,
+                approximate=True
+            )
+        for stream in streams:
+            pipe.expire(stream, METRICS_STREAM_TTL_SECONDS)
+        await pipe.execute()
     
     def get_api_health_summary(self) -> Dict[str, Any]:
         """Get summary of API health metrics."""
@@ -611,12 +763,28 @@ class MetricsCollector:
             'database_connected': metrics.database_connected,
             'active_connections': metrics.active_connections,
             'total_errors': metrics.total_errors,
-            'error_rate_per_minute': metrics.error_rate_per_minute
+            'error_rate_per_minute': metrics.error_rate_per_minute,
+            'dropped_metric_points': self._dropped_points
         }
     
     def get_recent_errors(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent error records."""
-        return list(self.recent_errors)[-limit:]
+        if limit <= 0:
+            return []
+        
+        start = max(len(self.recent_errors) - limit, 0)
+        return [
+            {
+                'timestamp': datetime.utcfromtimestamp(timestamp).isoformat(),
+                'error_type': error_type,
+                'error_message': error_message,
+                'component': component,
+                'severity': severity,
+                'metadata': dict(metadata)
+            }
+            for timestamp, error_type, error_message, component, severity, metadata
+            in islice(self.recent_errors, start, None)
+        ]
     
     def get_comprehensive_health_report(self) -> Dict[str, Any]:
         """Get comprehensive health report with all metrics."""
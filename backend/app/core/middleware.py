@@ -6,106 +6,247 @@ tracking request/response cycles, and managing user context across
 async operations.
 """
 
+import logging
+import re
 import time
-import uuid
-from typing import Callable, Optional
+from functools import lru_cache
+from secrets import token_hex
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import unquote_to_bytes
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response as StarletteResponse
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.logging import get_context_logger, request_id_var, user_id_var
 from app.core.metrics import get_metrics_collector
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+# Probe and static paths that bypass request logging and metrics
+SKIP_PATHS = frozenset({"/healthz", "/health", "/metrics", "/favicon.ico", "/ready"})
+
+# Metrics endpoint for requests that matched no route (404s, scanners)
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Raw ASGI header names and values
+RawHeaders = Dict[bytes, bytes]
+
+
+def _header(headers: RawHeaders, name: bytes) -> Optional[str]:
+    """Decode a single raw header value, or None if it is absent."""
+    value = headers.get(name)
+    return value.decode('latin-1') if value is not None else None
+
+
+def _route_template(scope: Scope) -> str:
+    """
+    Path template of the route that handled a request, e.g. ``/api/v1/pies/{pie_id}``.
+    
+    Metrics are keyed by template rather than raw path so IDs and probe URLs
+    do not each create their own series. Requests no route matched share one key.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+@lru_cache(maxsize=4096)
+def _decode_token_subject(token: str) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Decode a JWT once and cache its subject and expiry.
+    
+    Args:
+        token: Raw bearer token
+    
+    Returns:
+        Tuple of (subject, expiry timestamp), or (None, None) if invalid
+    """
+    # Import here to avoid circular imports
+    from app.core.security import decode_access_token
+    
+    payload = decode_access_token(token)
+    if not payload:
+        return None, None
+    return payload.get('sub'), payload.get('exp')
+
+
+class FastPathMiddleware:
+    """
+    Pure ASGI middleware that answers probe requests with pre-encoded bodies.
+    
+    Load balancer and uptime probes poll endpoints such as ``/health`` many
+    times per second. Answering them here, outside every other middleware,
+    skips CORS, host checks, logging and metrics for body-less probe traffic.
+    Only GET requests are answered; other methods fall through to the app.
+    """
+    
+    def __init__(self, app: ASGIApp, responses: Dict[str, bytes]):
+        self.app = app
+        self.responses = {
+            path: (
+                [
+                    (b'content-type', b'application/json'),
+                    (b'content-length', str(len(body)).encode()),
+                ],
+                body
+            )
+            for path, body in responses.items()
+        }
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve a cached response for fast paths, otherwise call the app."""
+        cached = (
+            self.responses.get(scope["path"])
+            if scope["type"] == "http" and scope["method"] == "GET" else None
+        )
+        if cached is None:
+            await self.app(scope, receive, send)
+            return
+        
+        headers, body = cached
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+class ObservabilityMiddleware:
     """
-    Middleware to add request context to logs and track request/response cycles.
+    Pure ASGI middleware for request logging, security and performance monitoring.
     
-    This middleware:
+    This middleware handles each HTTP request in a single pass:
     - Generates unique request IDs for tracking
     - Extracts user context from JWT tokens
     - Logs request start/completion/errors
-    - Adds timing information
+    - Records API request metrics
+    - Logs suspicious request patterns and auth failures
+    - Logs slow requests
     - Manages context variables for async operations
     """
     
-    def __init__(self, app, logger_name: str = "app.requests"):
-        super().__init__(app)
+    def __init__(
+        self,
+        app: ASGIApp,
+        slow_request_threshold: float = 1.0,
+        logger_name: str = "app.requests",
+        security_logger_name: str = "app.security",
+        performance_logger_name: str = "app.performance"
+    ):
+        self.app = app
         self.logger = get_context_logger(logger_name)
+        self.security_logger = get_context_logger(security_logger_name)
+        self.performance_logger = get_context_logger(performance_logger_name)
         self.metrics = get_metrics_collector()
+        self.slow_request_threshold = slow_request_threshold  # seconds
+        self.suspicious_patterns = (
+            '/admin', '/.env', '/config', '/backup',
+            'wp-admin', 'phpmyadmin', '.git', '.svn'
+        )
+        
+        # Single-pass bytes matchers run directly on the raw ASGI path and query
+        self._suspicious_path_re = re.compile(
+            b'|'.join(re.escape(pattern.encode()) for pattern in self.suspicious_patterns),
+            re.IGNORECASE
+        )
+        self._sql_injection_re = re.compile(rb'union\s+select|drop\s+table|1=1', re.IGNORECASE)
     
-    async def dispatch(self, request: Request, call_next: Callable) -> StarletteResponse:
-        """Process request with context tracking and logging."""
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process request with context tracking, logging and monitoring."""
+        if scope["type"] != "http" or scope["path"] in SKIP_PATHS:
+            await self.app(scope, receive, send)
+            return
+        
+        request = Request(scope)
+        
+        # Read method and path straight from the scope; building a URL is costly
+        method = scope["method"]
+        path = scope.get("root_path", "") + scope["path"]
+        
+        # Index the raw headers once; ASGI header names are lower-cased bytes
+        headers: RawHeaders = dict(scope["headers"])
+        
         # Generate unique request ID
-        request_id = str(uuid.uuid4())
-        request_id_var.set(request_id)
+        request_id = token_hex(16)
+        request_id_token = request_id_var.set(request_id)
         
         # Extract user ID from request
-        user_id = await self._extract_user_id(request)
-        if user_id:
-            user_id_var.set(user_id)
+        user_id = self._extract_user_id(headers)
+        user_id_token = user_id_var.set(user_id)
         
-        # Prepare request context
-        request_context = {
-            'request_id': request_id,
-            'user_id': user_id,
-            'method': request.method,
-            'url': str(request.url),
-            'path': request.url.path,
-            'query_params': dict(request.query_params),
-            'user_agent': request.headers.get('user-agent'),
-            'ip_address': self._get_client_ip(request),
-            'content_type': request.headers.get('content-type'),
-            'content_length': request.headers.get('content-length')
-        }
+        self._check_suspicious_request(request, headers)
         
-        # Log request start
-        self.logger.info(
-            f"Request started: {request.method} {request.url.path}",
-            extra=request_context
+        # Only materialize the full request context when it will be logged
+        log_requests = self.logger.isEnabledFor(logging.INFO)
+        request_context = (
+            self._build_request_context(request, headers, request_id, user_id) if log_requests else None
         )
         
-        start_time = time.time()
+        # Log request start
+        if log_requests:
+            self.logger.info(
+                f"Request started: {method} {path}",
+                extra=request_context
+            )
+        
+        response_info = {'status_code': 500, 'response_size': None}
+        
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add request ID to response headers for tracing
+                response_headers = MutableHeaders(scope=message)
+                response_headers.append('X-Request-ID', request_id)
+                response_info['status_code'] = message["status"]
+                response_info['response_size'] = response_headers.get('content-length')
+            await send(message)
+        
+        start_ns = time.perf_counter_ns()
         
         try:
-            # Process request
-            response = await call_next(request)
+            # Call the app directly so handlers share this context and any
+            # user ID they bind after authenticating is visible below
+            await self.app(scope, receive, send_wrapper)
             
             # Calculate duration
-            duration_ms = round((time.time() - start_time) * 1000, 2)
+            duration_ns = time.perf_counter_ns() - start_ns
+            processing_time = duration_ns / 1_000_000_000
+            duration_ms = duration_ns / 1_000_000
+            status_code = response_info['status_code']
             
             # Log successful request completion
-            self.logger.info(
-                f"Request completed: {request.method} {request.url.path}",
-                extra={
-                    **request_context,
-                    'status_code': response.status_code,
-                    'duration_ms': duration_ms,
-                    'response_size': response.headers.get('content-length')
-                }
-            )
+            if log_requests:
+                self.logger.info(
+                    f"Request completed: {method} {path}",
+                    extra={
+                        **request_context,
+                        'user_id': user_id_var.get(),
+                        'status_code': status_code,
+                        'duration_ms': duration_ms,
+                        'response_size': response_info['response_size']
+                    }
+                )
             
             # Record metrics
-            await self.metrics.record_api_request(
-                endpoint=request.url.path,
-                method=request.method,
-                status_code=response.status_code,
-                response_time=duration_ms / 1000  # Convert to seconds
+            self.metrics.record_api_request_nowait(
+                endpoint=_route_template(scope),
+                method=method,
+                status_code=status_code,
+                response_time=processing_time
             )
             
-            # Add request ID to response headers for tracing
-            response.headers['X-Request-ID'] = request_id
-            
-            return response
-            
+            self._check_auth_failure(request, headers, path, status_code)
+            self._check_performance(method, path, status_code, processing_time)
+        
         except Exception as e:
             # Calculate duration for failed request
-            duration_ms = round((time.time() - start_time) * 1000, 2)
+            duration_ns = time.perf_counter_ns() - start_ns
+            processing_time = duration_ns / 1_000_000_000
+            duration_ms = duration_ns / 1_000_000
             
             # Log request error
+            user_id = user_id_var.get()
+            if request_context is None:
+                request_context = self._build_request_context(request, headers, request_id, user_id)
+            else:
+                request_context['user_id'] = user_id
             self.logger.error(
-                f"Request failed: {request.method} {request.url.path}",
+                f"Request failed: {method} {path}",
                 extra={
                     **request_context,
                     'error_type': type(e).__name__,
@@ -115,12 +256,24 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                 exc_info=True
             )
             
+            self.performance_logger.error(
+                f"Request error: {method} {path}",
+                extra={
+                    'method': method,
+                    'path': path,
+                    'processing_time_seconds': processing_time,
+                    'error_type': type(e).__name__,
+                    'error_message': str(e)
+                },
+                exc_info=True
+            )
+            
             # Record error metrics
-            await self.metrics.record_api_request(
-                endpoint=request.url.path,
-                method=request.method,
+            self.metrics.record_api_request_nowait(
+                endpoint=_route_template(scope),
+                method=method,
                 status_code=500,  # Internal server error
-                response_time=duration_ms / 1000,  # Convert to seconds
+                response_time=processing_time,
                 error_type=type(e).__name__
             )
             
@@ -130,8 +283,8 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                 component="api_request",
                 severity="error",
                 metadata={
-                    'endpoint': request.url.path,
-                    'method': request.method,
+                    'endpoint': path,
+                    'method': method,
                     'user_id': user_id
                 }
             )
@@ -140,220 +293,201 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             raise
         
         finally:
-            # Clean up context variables
-            try:
-                request_id_var.set("")
-                user_id_var.set(None)
-            except Exception:
-                pass
+            # Restore context variables to their pre-request values
+            request_id_var.reset(request_id_token)
+            user_id_var.reset(user_id_token)
     
-    async def _extract_user_id(self, request: Request) -> Optional[str]:
+    def _build_request_context(
+        self,
+        request: Request,
+        headers: RawHeaders,
+        request_id: str,
+        user_id: Optional[str]
+    ) -> Dict[str, Any]:
         """
-        Extract user ID from JWT token in Authorization header.
+        Build the request context attached to request log records.
         
         Args:
-            request: FastAPI request object
+            request: Incoming request
+            headers: Raw request headers
+            request_id: Generated request ID
+            user_id: User ID extracted from the token, if any
             
         Returns:
-            User ID if found, None otherwise
+            Request context dictionary
         """
-        try:
-            auth_header = request.headers.get('authorization')
-            if not auth_header or not auth_header.startswith('Bearer '):
-                return None
-            
-            token = auth_header.split(' ')[1]
-            
-            # Import here to avoid circular imports
-            from app.core.security import decode_access_token
-            
-            payload = decode_access_token(token)
-            return payload.get('sub') if payload else None
-            
-        except Exception as e:
-            self.logger.debug(
-                "Failed to extract user ID from token",
-                extra={'error': str(e)}
-            )
-            return None
+        return {
+            'request_id': request_id,
+            'user_id': user_id,
+            'method': request.method,
+            'url': str(request.url),
+            'path': request.url.path,
+            'query_params': dict(request.query_params),
+            'user_agent': _header(headers, b'user-agent'),
+            'ip_address': self._get_client_ip(request, headers),
+            'content_type': _header(headers, b'content-type'),
+            'content_length': _header(headers, b'content-length')
+        }
     
-    def _get_client_ip(self, request: Request) -> Optional[str]:
+    def _check_suspicious_request(self, request: Request, headers: RawHeaders) -> None:
         """
-        Get client IP address from request headers.
+        Log suspicious paths and potential SQL injection attempts.
         
         Args:
-            request: FastAPI request object
-            
-        Returns:
-            Client IP address
+            request: Incoming request
+            headers: Raw request headers
         """
-        # Check for forwarded headers first (for proxy/load balancer scenarios)
-        forwarded_for = request.headers.get('x-forwarded-for')
-        if forwarded_for:
-            # Take the first IP in the chain
-            return forwarded_for.split(',')[0].strip()
+        scope = request.scope
         
-        real_ip = request.headers.get('x-real-ip')
-        if real_ip:
-            return real_ip
-        
-        # Fall back to direct client IP
-        return request.client.host if request.client else None
-
-
-class SecurityLoggingMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware for security event logging.
-    
-    This middleware logs security-related events such as:
-    - Authentication attempts
-    - Suspicious request patterns
-    - Rate limiting violations
-    - Invalid token usage
-    """
-    
-    def __init__(self, app, logger_name: str = "app.security"):
-        super().__init__(app)
-        self.logger = get_context_logger(logger_name)
-        self.suspicious_patterns = [
-            '/admin', '/.env', '/config', '/backup',
-            'wp-admin', 'phpmyadmin', '.git', '.svn'
-        ]
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> StarletteResponse:
-        """Process request with security monitoring."""
-        # Check for suspicious patterns
-        if any(pattern in request.url.path.lower() for pattern in self.suspicious_patterns):
-            self.logger.warning(
+        # Check for suspicious patterns; percent-encoded paths are decoded first
+        raw_path = scope.get("raw_path")
+        if raw_path is None or b'%' in raw_path:
+            raw_path = scope["path"].encode()
+        if self._suspicious_path_re.search(raw_path):
+            self.security_logger.warning(
                 "Suspicious request pattern detected",
                 extra={
                     'path': request.url.path,
-                    'ip_address': self._get_client_ip(request),
-                    'user_agent': request.headers.get('user-agent'),
+                    'ip_address': self._get_client_ip(request, headers),
+                    'user_agent': _header(headers, b'user-agent'),
                     'pattern_type': 'suspicious_path'
                 }
             )
         
-        # Check for potential SQL injection patterns
-        query_string = str(request.query_params)
-        if any(pattern in query_string.lower() for pattern in ['union select', 'drop table', '1=1', 'or 1=1']):
-            self.logger.warning(
+        # Check for potential SQL injection patterns in the decoded query string
+        query_string = scope["query_string"]
+        if query_string and self._sql_injection_re.search(
+            unquote_to_bytes(query_string.replace(b'+', b' '))
+        ):
+            self.security_logger.warning(
                 "Potential SQL injection attempt detected",
                 extra={
                     'path': request.url.path,
                     'query_params': dict(request.query_params),
-                    'ip_address': self._get_client_ip(request),
+                    'ip_address': self._get_client_ip(request, headers),
                     'pattern_type': 'sql_injection'
                 }
             )
+    
+    def _check_auth_failure(
+        self,
+        request: Request,
+        headers: RawHeaders,
+        path: str,
+        status_code: int
+    ) -> None:
+        """
+        Log authentication and authorization failures.
         
-        # Process request normally
-        response = await call_next(request)
+        Args:
+            request: Incoming request
+            headers: Raw request headers
+            path: Request path
+            status_code: Response status code
+        """
+        if status_code == 401:
+            message = "Authentication failure"
+        elif status_code == 403:
+            message = "Authorization failure"
+        else:
+            return
         
-        # Log authentication failures
-        if response.status_code == 401:
-            self.logger.warning(
-                "Authentication failure",
-                extra={
-                    'path': request.url.path,
-                    'ip_address': self._get_client_ip(request),
-                    'user_agent': request.headers.get('user-agent'),
-                    'status_code': response.status_code
-                }
-            )
+        self.security_logger.warning(
+            message,
+            extra={
+                'path': path,
+                'ip_address': self._get_client_ip(request, headers),
+                'user_agent': _header(headers, b'user-agent'),
+                'status_code': status_code
+            }
+        )
+    
+    def _check_performance(self, method: str, path: str, status_code: int, processing_time: float) -> None:
+        """
+        Log slow requests and per-request performance.
         
-        # Log authorization failures
-        elif response.status_code == 403:
-            self.logger.warning(
-                "Authorization failure",
+        Args:
+            method: Request method
+            path: Request path
+            status_code: Response status code
+            processing_time: Request duration in seconds
+        """
+        # Log slow requests
+        if processing_time > self.slow_request_threshold:
+            self.performance_logger.warning(
+                f"Slow request detected: {method} {path}",
                 extra={
-                    'path': request.url.path,
-                    'ip_address': self._get_client_ip(request),
-                    'user_agent': request.headers.get('user-agent'),
-                    'status_code': response.status_code
+                    'method': method,
+                    'path': path,
+                    'processing_time_seconds': processing_time,
+                    'threshold_seconds': self.slow_request_threshold,
+                    'status_code': status_code
                 }
             )
         
-        return response
+        # Log performance metrics for all requests
+        self.performance_logger.debug(
+            f"Request performance: {method} {path}",
+            extra={
+                'method': method,
+                'path': path,
+                'processing_time_ms': processing_time * 1000,
+                'status_code': status_code
+            }
+        )
     
-    def _get_client_ip(self, request: Request) -> Optional[str]:
-        """Get client IP address from request headers."""
-        forwarded_for = request.headers.get('x-forwarded-for')
-        if forwarded_for:
-            return forwarded_for.split(',')[0].strip()
-        
-        real_ip = request.headers.get('x-real-ip')
-        if real_ip:
-            return real_ip
+    def _extract_user_id(self, headers: RawHeaders) -> Optional[str]:
+        """
+        Extract user ID from JWT token in Authorization header.
         
-        return request.client.host if request.client else None
-
-
-class PerformanceLoggingMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware for performance monitoring and logging.
-    
-    This middleware tracks:
-    - Request processing times
-    - Slow requests
-    - Resource usage patterns
-    - API endpoint performance
-    """
-    
-    def __init__(self, app, slow_request_threshold: float = 1.0, logger_name: str = "app.performance"):
-        super().__init__(app)
-        self.logger = get_context_logger(logger_name)
-        self.slow_request_threshold = slow_request_threshold  # seconds
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> StarletteResponse:
-        """Process request with performance monitoring."""
-        start_time = time.time()
+        Args:
+            headers: Raw request headers
         
+        Returns:
+            User ID if found, None otherwise
+        """
         try:
-            response = await call_next(request)
-            
-            # Calculate processing time
-            processing_time = time.time() - start_time
-            
-            # Log slow requests
-            if processing_time > self.slow_request_threshold:
-                self.logger.warning(
-                    f"Slow request detected: {request.method} {request.url.path}",
-                    extra={
-                        'method': request.method,
-                        'path': request.url.path,
-                        'processing_time_seconds': round(processing_time, 3),
-                        'threshold_seconds': self.slow_request_threshold,
-                        'status_code': response.status_code
-                    }
-                )
-            
-            # Log performance metrics for all requests
-            self.logger.debug(
-                f"Request performance: {request.method} {request.url.path}",
-                extra={
-                    'method': request.method,
-                    'path': request.url.path,
-                    'processing_time_ms': round(processing_time * 1000, 2),
-                    'status_code': response.status_code
-                }
-            )
+            auth_header = _header(headers, b'authorization')
+            if not auth_header:
+                return None
             
-            return response
+            scheme, sep, token = auth_header.partition(' ')
+            if not sep or scheme != 'Bearer' or not token:
+                return None
             
+            # Cached tokens skip JWT verification; expiry is rechecked here
+            subject, expires_at = _decode_token_subject(token)
+            if expires_at is not None and expires_at < time.time():
+                return None
+            return subject
+        
         except Exception as e:
-            processing_time = time.time() - start_time
-            
-            self.logger.error(
-                f"Request error: {request.method} {request.url.path}",
-                extra={
-                    'method': request.method,
-                    'path': request.url.path,
-                    'processing_time_seconds': round(processing_time, 3),
-                    'error_type': type(e).__name__,
-                    'error_message': str(e)
-                },
-                exc_info=True
+            self.logger.debug(
+                "Failed to extract user ID from token",
+                extra={'error': str(e)}
             )
-            
-            raise
\ No newline at end of file
+            return None
+    
+    def _get_client_ip(self, request: Request, headers: RawHeaders) -> Optional[str]:
+        """
+        Get client IP address from request headers.
+        
+        Args:
+            request: Incoming request
+            headers: Raw request headers
+        
+        Returns:
+            Client IP address
+        """
+        # Check for forwarded headers first (for proxy/load balancer scenarios)
+        forwarded_for = headers.get(b'x-forwarded-for')
+        if forwarded_for:
+            # Take the first IP in the chain
+            return forwarded_for.partition(b',')[0].strip().decode('latin-1')
+        
+        real_ip = headers.get(b'x-real-ip')
+        if real_ip:
+            return real_ip.decode('latin-1')
+        
+        # Fall back to direct client IP
+        return request.client.host if request.client else None
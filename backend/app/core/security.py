@@ -1,19 +1,58 @@
 from datetime import datetime, timedelta
 from typing import Any, Union, Optional
-from jose import jwt, JWTError
+import jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
-from cryptography.fernet import Fernet
+import anyio
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+import base64
+import os
 import secrets
 
 from app.core.config import settings
 
+# JWT signing key and accepted algorithms, prepared once at import
+_SECRET_BYTES = settings.SECRET_KEY.encode()
+_ALGORITHMS = [settings.ALGORITHM]
+
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    deprecated="auto"
+)
+
+# AES-GCM key and nonce sizes in bytes
+KEY_SIZE = 32
+NONCE_SIZE = 12
+
+
+def _load_encryption_key() -> bytes:
+    """Load the API key encryption key from settings.
+    
+    The key must be identical across workers and restarts, otherwise stored
+    API keys cannot be decrypted. When ENCRYPTION_KEY is not provisioned the
+    key is derived from SECRET_KEY.
+    """
+    if settings.ENCRYPTION_KEY:
+        key = base64.urlsafe_b64decode(settings.ENCRYPTION_KEY.encode())
+        if len(key) != KEY_SIZE:
+            raise ValueError(f"ENCRYPTION_KEY must decode to {KEY_SIZE} bytes")
+        return key
+    
+    return HKDF(
+        algorithm=hashes.SHA256(),
+        length=KEY_SIZE,
+        salt=None,
+        info=b"trading212-api-key-encryption",
+    ).derive(_SECRET_BYTES)
 
-# Encryption key for API keys (should be stored securely in production)
-ENCRYPTION_KEY = Fernet.generate_key()
-cipher_suite = Fernet(ENCRYPTION_KEY)
+
+# Encryption key for API keys (provision ENCRYPTION_KEY in production)
+ENCRYPTION_KEY = _load_encryption_key()
+cipher_suite = AESGCM(ENCRYPTION_KEY)
 
 
 def create_access_token(
@@ -28,7 +67,7 @@ def create_access_token(
         )
     
     to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_BYTES, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
@@ -36,7 +75,7 @@ def create_refresh_token(subject: Union[str, Any]) -> str:
     """Create JWT refresh token with longer expiration"""
     expire = datetime.utcnow() + timedelta(days=7)  # 7 days for refresh token
     to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _SECRET_BYTES, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
@@ -44,13 +83,13 @@ def verify_token(token: str) -> Optional[str]:
     """Verify JWT token and return subject"""
     try:
         payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            token, _SECRET_BYTES, algorithms=_ALGORITHMS
         )
         token_data = payload.get("sub")
         if token_data is None:
             return None
         return token_data
-    except JWTError:
+    except jwt.InvalidTokenError:
         return None
 
 
@@ -58,10 +97,10 @@ def decode_access_token(token: str) -> Optional[dict]:
     """Decode JWT token and return payload"""
     try:
         payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            token, _SECRET_BYTES, algorithms=_ALGORITHMS
         )
         return payload
-    except JWTError:
+    except jwt.InvalidTokenError:
         return None
 
 
@@ -69,7 +108,7 @@ def verify_refresh_token(token: str) -> Optional[str]:
     """Verify refresh token and return subject"""
     try:
         payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+            token, _SECRET_BYTES, algorithms=_ALGORITHMS
         )
         token_type = payload.get("type")
         if token_type != "refresh":
@@ -78,18 +117,23 @@ def verify_refresh_token(token: str) -> Optional[str]:
         if token_data is None:
             return None
         return token_data
-    except JWTError:
+    except jwt.InvalidTokenError:
         return None
 
 
 def encrypt_api_key(api_key: str) -> str:
     """Encrypt Trading 212 API key for secure storage"""
-    return cipher_suite.encrypt(api_key.encode()).decode()
+    # Token layout is nonce || ciphertext+tag, base64-encoded
+    nonce = os.urandom(NONCE_SIZE)
+    ciphertext = cipher_suite.encrypt(nonce, api_key.encode(), None)
+    return base64.urlsafe_b64encode(nonce + ciphertext).decode()
 
 
 def decrypt_api_key(encrypted_key: str) -> str:
     """Decrypt Trading 212 API key"""
-    return cipher_suite.decrypt(encrypted_key.encode()).decode()
+    token = base64.urlsafe_b64decode(encrypted_key.encode())
+    nonce, ciphertext = token[:NONCE_SIZE], token[NONCE_SIZE:]
+    return cipher_suite.decrypt(nonce, ciphertext, None).decode()
 
 
 def generate_session_id() -> str:
@@ -104,4 +148,14 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     """Hash password"""
-    return pwd_context.hash(password)
\ No newline at end of file
+    return pwd_context.hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify password against hash in a worker thread to keep the event loop free"""
+    return await anyio.to_thread.run_sync(pwd_context.verify, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash password in a worker thread to keep the event loop free"""
+    return await anyio.to_thread.run_sync(pwd_context.hash, password)
\ No newline at end of file
@@ -0,0 +1,36 @@
+"""
+Cached wall-clock helpers.
+
+Bulk construction of models (e.g. ingesting dividend or price rows) calls
+the timestamp default factory once per instance. Sharing one reading per
+millisecond keeps those defaults cheap without changing their precision in
+any meaningful way.
+"""
+
+import time
+from datetime import datetime
+from typing import Tuple
+
+
+# How long a cached reading is reused, in seconds
+TICK_SECONDS = 0.001
+
+# (monotonic time of the reading, naive UTC datetime); replaced atomically
+_tick: Tuple[float, datetime] = (float("-inf"), datetime.min)
+
+
+def utcnow_cached() -> datetime:
+    """
+    Return the current naive UTC time, reusing a reading up to a millisecond old.
+    
+    Returns:
+        Naive UTC datetime, as ``datetime.utcnow()`` would
+    """
+    global _tick
+    
+    now = time.monotonic()
+    read_at, value = _tick
+    if now - read_at >= TICK_SECONDS:
+        value = datetime.utcnow()
+        _tick = (now, value)
+    return value
@@ -5,9 +5,10 @@ SQLAlchemy database models for the Trading 212 Portfolio Dashboard.
 from datetime import datetime, date
 from decimal import Decimal
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Date, Numeric, Boolean, 
-    Text, ForeignKey, Enum as SQLEnum, JSON
+    Column, Integer, SmallInteger, String, DateTime, Date, Numeric, Boolean, 
+    Text, ForeignKey, JSON, Index, UniqueConstraint
 )
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -15,29 +16,64 @@ import enum
 from .base import Base
 
 
-class AssetTypeEnum(enum.Enum):
+# Monetary amounts are read back as floats; they are summed and serialized
+# far more often than they need exact decimal arithmetic
+Money = Numeric(precision=15, scale=2, asdecimal=False)
+
+# Timestamps are stored as timestamptz on PostgreSQL
+Timestamp = DateTime(timezone=True)
+
+
+class AssetTypeEnum(enum.IntEnum):
     """Asset type enumeration for database."""
-    STOCK = "STOCK"
-    ETF = "ETF"
-    CRYPTO = "CRYPTO"
-    BOND = "BOND"
-    COMMODITY = "COMMODITY"
-    CASH = "CASH"
+    STOCK = 1
+    ETF = 2
+    CRYPTO = 3
+    BOND = 4
+    COMMODITY = 5
+    CASH = 6
 
 
-class RiskCategoryEnum(enum.Enum):
+class RiskCategoryEnum(enum.IntEnum):
     """Risk category enumeration for database."""
-    LOW = "LOW"
-    MEDIUM = "MEDIUM"
-    HIGH = "HIGH"
-    VERY_HIGH = "VERY_HIGH"
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+    VERY_HIGH = 4
 
 
-class DividendTypeEnum(enum.Enum):
+class DividendTypeEnum(enum.IntEnum):
     """Dividend type enumeration for database."""
-    CASH = "CASH"
-    STOCK = "STOCK"
-    REINVESTED = "REINVESTED"
+    CASH = 1
+    STOCK = 2
+    REINVESTED = 3
+    ORDINARY = 4
+    SPECIAL = 5
+    QUALIFIED = 6
+    UNQUALIFIED = 7
+
+
+class IntEnumType(TypeDecorator):
+    """Store an IntEnum as a SMALLINT and load it back as the enum member."""
+    impl = SmallInteger
+    cache_ok = True
+    
+    def __init__(self, enum_class, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.enum_class = enum_class
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            # Accept member names so string-valued API enums still bind
+            value = self.enum_class[value]
+        return int(self.enum_class(value))
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self.enum_class(value)
 
 
 class PortfolioTable(Base):
@@ -51,17 +87,17 @@ class PortfolioTable(Base):
     benchmark_symbol = Column(String, nullable=True)
     
     # Metrics (stored as JSON for flexibility)
-    total_value = Column(Numeric(precision=15, scale=2), nullable=False, default=0)
-    total_invested = Column(Numeric(precision=15, scale=2), nullable=False, default=0)
-    cash_balance = Column(Numeric(precision=15, scale=2), nullable=False, default=0)
-    total_return = Column(Numeric(precision=15, scale=2), nullable=False, default=0)
+    total_value = Column(Money, nullable=False, default=0)
+    total_invested = Column(Money, nullable=False, default=0)
+    cash_balance = Column(Money, nullable=False, default=0)
+    total_return = Column(Money, nullable=False, default=0)
     total_return_pct = Column(Numeric(precision=8, scale=4), nullable=False, default=0)
     annualized_return = Column(Numeric(precision=8, scale=4), nullable=True)
     
     # Dividend metrics
-    total_dividends = Column(Numeric(precision=15, scale=2), nullable=False, default=0)
+    total_dividends = Column(Money, nullable=False, default=0)
     dividend_yield = Column(Numeric(precision=8, scale=4), nullable=False, default=0)
-    annual_dividend_projection = Column(Numeric(precision=15, scale=2), nullable=False, default=0)
+    annual_dividend_projection = Column(Money, nullable=False, default=0)
     
     # Allocation data (stored as JSON)
     sector_allocation = Column(JSON, nullable=True)
@@ -73,13 +109,13 @@ class PortfolioTable(Base):
     sharpe_ratio = Column(Numeric(precision=8, scale=4), nullable=True)
     max_drawdown = Column(Numeric(precision=8, scale=4), nullable=True)
     beta = Column(Numeric(precision=8, scale=4), nullable=True)
-    risk_category = Column(SQLEnum(RiskCategoryEnum), nullable=True)
+    risk_category = Column(IntEnumType(RiskCategoryEnum), nullable=True)
     risk_score = Column(Numeric(precision=5, scale=2), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, nullable=False, default=func.now())
-    last_updated = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
-    last_sync = Column(DateTime, nullable=True)
+    created_at = Column(Timestamp, nullable=False, server_default=func.now())
+    last_updated = Column(Timestamp, nullable=False, server_default=func.now(), onupdate=func.now())
+    last_sync = Column(Timestamp, nullable=True)
     
     # Relationships
     pies = relationship("PieTable", back_populates="portfolio", cascade="all, delete-orphan")
@@ -108,10 +144,10 @@ class PieTable(Base):
     target_allocation = Column(Numeric(precision=5, scale=2), nullable=True)
     
     # Metrics
-    total_value = Column(Numeric(precision=15, scale=2), nullable=False, default=0)
-    invested_amount = Column(Numeric(precision=15, scale=2), nullable=False, default=0)
-    cash_balance = Column(Numeric(precision=15, scale=2), nullable=False, default=0)
-    total_return = Column(Numeric(precision=15, scale=2), nullable=False, default=0)
+    total_value = Column(Money, nullable=False, default=0)
+    invested_amount = Column(Money, nullable=False, default=0)
+    cash_balance = Column(Money, nullable=False, default=0)
+    total_return = Column(Money, nullable=False, default=0)
     total_return_pct = Column(Numeric(precision=8, scale=4), nullable=False, default=0)
     annualized_return = Column(Numeric(precision=8, scale=4), nullable=True)
     time_weighted_return = Column(Numeric(precision=8, scale=4), nullable=True)
@@ -121,22 +157,22 @@ class PieTable(Base):
     portfolio_weight = Column(Numeric(precision=5, scale=2), nullable=False, default=0)
     
     # Dividend metrics
-    total_dividends = Column(Numeric(precision=15, scale=2), nullable=False, default=0)
+    total_dividends = Column(Money, nullable=False, default=0)
     dividend_yield = Column(Numeric(precision=8, scale=4), nullable=False, default=0)
-    monthly_dividend_avg = Column(Numeric(precision=15, scale=2), nullable=False, default=0)
+    monthly_dividend_avg = Column(Money, nullable=False, default=0)
     
     # Risk metrics
     volatility = Column(Numeric(precision=8, scale=4), nullable=True)
     sharpe_ratio = Column(Numeric(precision=8, scale=4), nullable=True)
     max_drawdown = Column(Numeric(precision=8, scale=4), nullable=True)
     beta = Column(Numeric(precision=8, scale=4), nullable=True)
-    risk_category = Column(SQLEnum(RiskCategoryEnum), nullable=True)
+    risk_category = Column(IntEnumType(RiskCategoryEnum), nullable=True)
     risk_score = Column(Numeric(precision=5, scale=2), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, nullable=False)
-    last_rebalanced = Column(DateTime, nullable=True)
-    last_updated = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
+    created_at = Column(Timestamp, nullable=False)
+    last_rebalanced = Column(Timestamp, nullable=True)
+    last_updated = Column(Timestamp, nullable=False, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     portfolio = relationship("PortfolioTable", back_populates="pies")
@@ -167,8 +203,8 @@ class PositionTable(Base):
     quantity = Column(Numeric(precision=15, scale=6), nullable=False)
     average_price = Column(Numeric(precision=15, scale=6), nullable=False)
     current_price = Column(Numeric(precision=15, scale=6), nullable=False)
-    market_value = Column(Numeric(precision=15, scale=2), nullable=False)
-    unrealized_pnl = Column(Numeric(precision=15, scale=2), nullable=False)
+    market_value = Column(Money, nullable=False)
+    unrealized_pnl = Column(Money, nullable=False)
     unrealized_pnl_pct = Column(Numeric(precision=8, scale=4), nullable=False)
     
     # Classification
@@ -176,10 +212,10 @@ class PositionTable(Base):
     industry = Column(String, nullable=True)
     country = Column(String, nullable=True)
     currency = Column(String, nullable=False, default="USD")
-    asset_type = Column(SQLEnum(AssetTypeEnum), nullable=False)
+    asset_type = Column(IntEnumType(AssetTypeEnum), nullable=False)
     
     # Timestamps
-    last_updated = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
+    last_updated = Column(Timestamp, nullable=False, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     portfolio = relationship("PortfolioTable", 
@@ -203,9 +239,9 @@ class DividendTable(Base):
     security_name = Column(String, nullable=False)
     
     # Dividend details
-    dividend_type = Column(SQLEnum(DividendTypeEnum), nullable=False)
+    dividend_type = Column(IntEnumType(DividendTypeEnum), nullable=False)
     amount_per_share = Column(Numeric(precision=15, scale=6), nullable=False)
-    total_amount = Column(Numeric(precision=15, scale=2), nullable=False)
+    total_amount = Column(Money, nullable=False)
     shares_held = Column(Numeric(precision=15, scale=6), nullable=False)
     
     # Dates
@@ -214,14 +250,14 @@ class DividendTable(Base):
     payment_date = Column(Date, nullable=False)
     
     # Tax information
-    gross_amount = Column(Numeric(precision=15, scale=2), nullable=False)
-    tax_withheld = Column(Numeric(precision=15, scale=2), nullable=False, default=0)
-    net_amount = Column(Numeric(precision=15, scale=2), nullable=False)
+    gross_amount = Column(Money, nullable=False)
+    tax_withheld = Column(Money, nullable=False, default=0)
+    net_amount = Column(Money, nullable=False)
     
     # Currency
     currency = Column(String, nullable=False, default="USD")
     exchange_rate = Column(Numeric(precision=15, scale=6), nullable=True)
-    base_currency_amount = Column(Numeric(precision=15, scale=2), nullable=True)
+    base_currency_amount = Column(Money, nullable=True)
     
     # Reinvestment
     is_reinvested = Column(Boolean, nullable=False, default=False)
@@ -229,7 +265,13 @@ class DividendTable(Base):
     reinvestment_price = Column(Numeric(precision=15, scale=6), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, nullable=False, default=func.now())
+    created_at = Column(Timestamp, nullable=False, server_default=func.now())
+    
+    # Dividend history is read by portfolio or symbol over a payment date range
+    __table_args__ = (
+        Index("ix_div_portfolio_paydate", "portfolio_id", "payment_date"),
+        Index("ix_div_symbol_paydate", "symbol", "payment_date"),
+    )
     
     # Relationships
     portfolio = relationship("PortfolioTable", back_populates="dividends")
@@ -255,10 +297,12 @@ class HistoricalDataTable(Base):
     # Metadata
     currency = Column(String, nullable=False, default="USD")
     data_source = Column(String, nullable=True)
-    created_at = Column(DateTime, nullable=False, default=func.now())
+    created_at = Column(Timestamp, nullable=False, server_default=func.now())
     
-    # Unique constraint on symbol and date
+    # Unique constraint on symbol and date; its index also serves
+    # symbol + date range lookups
     __table_args__ = (
+        UniqueConstraint("symbol", "price_date", name="uq_hist_symbol_date"),
         {"sqlite_autoincrement": True},
     )
 
@@ -278,18 +322,24 @@ class PerformanceSnapshotTable(Base):
     period_end = Column(Date, nullable=False)
     
     # Performance metrics
-    start_value = Column(Numeric(precision=15, scale=2), nullable=False)
-    end_value = Column(Numeric(precision=15, scale=2), nullable=False)
-    total_return = Column(Numeric(precision=15, scale=2), nullable=False)
+    start_value = Column(Money, nullable=False)
+    end_value = Column(Money, nullable=False)
+    total_return = Column(Money, nullable=False)
     total_return_pct = Column(Numeric(precision=8, scale=4), nullable=False)
     
     # Cash flows
-    dividends_received = Column(Numeric(precision=15, scale=2), nullable=False, default=0)
-    contributions = Column(Numeric(precision=15, scale=2), nullable=False, default=0)
-    withdrawals = Column(Numeric(precision=15, scale=2), nullable=False, default=0)
+    dividends_received = Column(Money, nullable=False, default=0)
+    contributions = Column(Money, nullable=False, default=0)
+    withdrawals = Column(Money, nullable=False, default=0)
     
     # Timestamps
-    created_at = Column(DateTime, nullable=False, default=func.now())
+    created_at = Column(Timestamp, nullable=False, server_default=func.now())
+    
+    # Entity + date range lookups
+    __table_args__ = (
+        Index("ix_psnap_portfolio_date", "portfolio_id", "snapshot_date"),
+        Index("ix_psnap_pie_date", "pie_id", "snapshot_date"),
+    )
     
     # Relationships
     portfolio = relationship("PortfolioTable", 
@@ -1,10 +1,19 @@
 """
 Database session configuration.
+
+Engines keep an LRU cache of compiled SQL keyed on statement structure.
+Queries should pass changing values as bound parameters, e.g.
+``select(PortfolioTable).where(PortfolioTable.id == bindparam("id"))``
+executed with ``{"id": portfolio_id}``, so repeated calls hit the cache
+instead of compiling a new statement.
 """
 
 import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
 from .base import Base
 
 # Database URL from environment variable or default to SQLite
@@ -12,13 +21,27 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./portfolio_dashboard.db")
 
 # Create engine
 if DATABASE_URL.startswith("sqlite"):
+    # An in-memory database only exists on its connection, so share one;
+    # file databases keep SQLAlchemy's default QueuePool
+    in_memory = DATABASE_URL in ("sqlite://", "sqlite:///:memory:")
     engine = create_engine(
         DATABASE_URL, 
         connect_args={"check_same_thread": False},
+        poolclass=StaticPool if in_memory else None,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
         echo=False  # Set to True for SQL debugging
     )
 else:
-    engine = create_engine(DATABASE_URL, echo=False)
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,  # Drop stale connections before use
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        echo=False
+    )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -1,14 +1,24 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+import orjson
 import uvicorn
 
 from app.core.config import settings
 from app.core.logging import setup_logging, get_context_logger
-from app.core.middleware import LoggingMiddleware, SecurityLoggingMiddleware, PerformanceLoggingMiddleware
+from app.core.middleware import FastPathMiddleware, ObservabilityMiddleware
 from app.core.metrics import initialize_metrics_collector
 from app.api.v1.api import api_router
+from app.services.benchmark_service import BenchmarkService
+
+# uvloop ships with uvicorn[standard] everywhere except Windows
+try:
+    import uvloop  # noqa: F401
+    UVICORN_LOOP = "uvloop"
+except ImportError:
+    UVICORN_LOOP = "asyncio"
 
 # Initialize logging
 setup_logging(
@@ -26,14 +36,28 @@ logger = get_context_logger(__name__)
 # Initialize metrics collector
 metrics_collector = initialize_metrics_collector()
 
+OPENAPI_URL = f"{settings.API_V1_STR}/openapi.json"
+
 # Create FastAPI application
 app = FastAPI(
     title="Trading 212 Portfolio Dashboard API",
     description="API for Trading 212 portfolio analysis and visualization",
     version="1.0.0",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    openapi_url=OPENAPI_URL,
+    default_response_class=ORJSONResponse,
 )
 
+# Static bodies for the root and health endpoints
+ROOT_RESPONSE = {
+    "message": "Trading 212 Portfolio Dashboard API",
+    "version": "1.0.0",
+    "status": "healthy"
+}
+HEALTH_RESPONSE = {
+    "status": "healthy",
+    "environment": settings.ENVIRONMENT
+}
+
 # Log application startup
 logger.info(
     "Starting Trading 212 Portfolio Dashboard API",
@@ -64,38 +88,72 @@ app.add_middleware(
     allowed_hosts=settings.ALLOWED_HOSTS,
 )
 
+# Compress large JSON responses; added before the observability middleware so
+# it sits inside it and the logged response size is the compressed size
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Add custom middleware for logging and monitoring
-app.add_middleware(LoggingMiddleware)
-app.add_middleware(SecurityLoggingMiddleware)
-app.add_middleware(PerformanceLoggingMiddleware, slow_request_threshold=2.0)
+app.add_middleware(ObservabilityMiddleware, slow_request_threshold=2.0)
+
+# Answer probe requests before any other middleware runs; added last so it is outermost
+app.add_middleware(
+    FastPathMiddleware,
+    responses={
+        "/": orjson.dumps(ROOT_RESPONSE),
+        "/health": orjson.dumps(HEALTH_RESPONSE),
+    }
+)
 
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+# Serve the OpenAPI schema as pre-serialized bytes instead of re-encoding the
+# schema dict on every request; the default route is swapped for the cached one
+app.router.routes = [
+    route for route in app.router.routes
+    if getattr(route, "path", None) != OPENAPI_URL
+]
+
+
+def get_openapi_bytes() -> bytes:
+    """Return the OpenAPI schema serialized once and cached on app state"""
+    schema_bytes = getattr(app.state, "openapi_bytes", None)
+    if schema_bytes is None:
+        schema_bytes = app.state.openapi_bytes = orjson.dumps(app.openapi())
+    return schema_bytes
+
+
+@app.get(OPENAPI_URL, include_in_schema=False)
+async def openapi_schema() -> Response:
+    """Cached OpenAPI schema"""
+    return Response(content=get_openapi_bytes(), media_type="application/json")
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Build the OpenAPI schema up front so the first request does not pay for it"""
+    get_openapi_bytes()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush pending metric points and close pooled clients before the process exits"""
+    await metrics_collector.close()
+    await BenchmarkService.close_shared_session()
+
 
 @app.get("/")
 async def root():
     """Root endpoint for health check"""
     logger.debug("Root endpoint accessed")
-    return JSONResponse(
-        content={
-            "message": "Trading 212 Portfolio Dashboard API",
-            "version": "1.0.0",
-            "status": "healthy"
-        }
-    )
+    return ROOT_RESPONSE
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     logger.debug("Health check endpoint accessed")
-    return JSONResponse(
-        content={
-            "status": "healthy",
-            "environment": settings.ENVIRONMENT
-        }
-    )
+    return HEALTH_RESPONSE
 
 
 if __name__ == "__main__":
@@ -104,4 +162,6 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8001,
         reload=True if settings.ENVIRONMENT == "development" else False,
+        loop=UVICORN_LOOP,
+        http="httptools",
     )
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+Domain models for portfolios, pies, positions and market data.
+
+Enums are imported eagerly. Pydantic models are resolved lazily on first
+attribute access (PEP 562), so importing ``app.models`` does not build every
+model schema up front.
+"""
+
+import importlib
+from typing import Any
+
+from .enums import AssetType, DividendType, RiskCategory, TransactionType
+
+# Lazily exported model name -> defining submodule
+_LAZY_MODELS = {
+    "BenchmarkAnalysis": ".benchmark",
+    "BenchmarkComparison": ".benchmark",
+    "BenchmarkData": ".benchmark",
+    "BenchmarkDataPoint": ".benchmark",
+    "BenchmarkInfo": ".benchmark",
+    "CustomBenchmark": ".benchmark",
+    "Dividend": ".dividend",
+    "HistoricalData": ".historical",
+    "HistoricalSeries": ".historical",
+    "PerformanceSnapshot": ".historical",
+    "PricePoint": ".historical",
+    "Pie": ".pie",
+    "PieMetrics": ".pie",
+    "Portfolio": ".portfolio",
+    "PortfolioMetrics": ".portfolio",
+    "Position": ".position",
+    "RiskMetrics": ".risk",
+}
+
+__all__ = [
+    "AssetType",
+    "DividendType",
+    "RiskCategory",
+    "TransactionType",
+    *_LAZY_MODELS,
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Import a model's submodule on first access and cache the attribute."""
+    module_name = _LAZY_MODELS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,20 @@
+"""
+Shared base for models carrying monetary amounts.
+"""
+
+from pydantic import BaseModel, ConfigDict
+from .money import DECIMAL_JSON_ENCODERS
+
+
+class BaseFinModel(BaseModel):
+    """
+    Base model with the configuration shared by financial models.
+    
+    Decimals serialize as JSON numbers and assignments are not re-validated.
+    Subclasses extend ``model_config`` with their own options (e.g. ``frozen``),
+    which Pydantic merges with this one.
+    """
+    
+    model_config = ConfigDict(
+        json_encoders=DECIMAL_JSON_ENCODERS
+    )
@@ -1,7 +1,19 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from datetime import datetime
 from decimal import Decimal
+import numpy as np
+from .base import BaseFinModel
+
+
+# Annualization inputs shared with the per-entity comparison in BenchmarkService
+TRADING_DAYS_PER_YEAR = 252
+DAILY_RISK_FREE_RATE = 0.02 / TRADING_DAYS_PER_YEAR
+
+
+def _to_decimal(value: float) -> Optional[Decimal]:
+    """Convert a computed metric to Decimal, mapping NaN to None."""
+    return None if np.isnan(value) else Decimal(str(value))
 
 
 class BenchmarkInfo(BaseModel):
@@ -15,12 +27,13 @@ class BenchmarkInfo(BaseModel):
 class BenchmarkDataPoint(BaseModel):
     """Single data point for benchmark historical data"""
     date: datetime = Field(..., description="Date of the data point")
-    price: Decimal = Field(..., ge=0, description="Price at this date")
-    return_pct: Optional[Decimal] = Field(None, description="Return percentage from previous period")
+    # Floats: series are parsed and analysed as float64; Decimal inputs are accepted
+    price: float = Field(..., ge=0, description="Price at this date")
+    return_pct: Optional[float] = Field(None, description="Return percentage from previous period")
     volume: Optional[int] = Field(None, description="Trading volume")
 
 
-class BenchmarkData(BaseModel):
+class BenchmarkData(BaseFinModel):
     """Historical data for a benchmark index"""
     symbol: str = Field(..., description="Benchmark symbol")
     name: str = Field(..., description="Benchmark name")
@@ -35,15 +48,9 @@ class BenchmarkData(BaseModel):
     volatility: Optional[Decimal] = Field(None, description="Volatility (standard deviation)")
     max_drawdown: Optional[Decimal] = Field(None, description="Maximum drawdown")
     sharpe_ratio: Optional[Decimal] = Field(None, description="Sharpe ratio")
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-            Decimal: lambda v: float(v)
-        }
 
 
-class BenchmarkComparison(BaseModel):
+class BenchmarkComparison(BaseFinModel):
     """Comparison between portfolio/pie and benchmark"""
     entity_type: str = Field(..., description="Type of entity being compared (portfolio or pie)")
     entity_id: str = Field(..., description="ID of the entity")
@@ -76,14 +83,10 @@ class BenchmarkComparison(BaseModel):
     outperforming: bool = Field(..., description="Whether entity is outperforming benchmark")
     outperformance_amount: Decimal = Field(..., description="Amount of outperformance")
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-            Decimal: lambda v: float(v)
-        }
+    model_config = ConfigDict(frozen=True)
 
 
-class CustomBenchmark(BaseModel):
+class CustomBenchmark(BaseFinModel):
     """Custom benchmark composed of multiple indices"""
     id: str = Field(..., description="Unique custom benchmark ID")
     name: str = Field(..., description="Custom benchmark name")
@@ -95,15 +98,9 @@ class CustomBenchmark(BaseModel):
     created_by: str = Field(..., description="User ID who created the benchmark")
     created_at: datetime = Field(..., description="Creation timestamp")
     last_updated: datetime = Field(..., description="Last update timestamp")
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-            Decimal: lambda v: float(v)
-        }
 
 
-class BenchmarkAnalysis(BaseModel):
+class BenchmarkAnalysis(BaseFinModel):
     """Comprehensive benchmark analysis results"""
     analysis_type: str = Field(..., description="Type of analysis performed")
     period: str = Field(..., description="Analysis period")
@@ -114,8 +111,95 @@ class BenchmarkAnalysis(BaseModel):
     
     summary_stats: Dict[str, Any] = Field(default_factory=dict, description="Summary statistics")
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-            Decimal: lambda v: float(v)
-        }
\ No newline at end of file
+    @staticmethod
+    def compute_batch(
+        entity_returns: np.ndarray,
+        benchmark_returns: np.ndarray,
+        entities: Sequence[Tuple[str, str, str]],
+        benchmark: BenchmarkData
+    ) -> List[BenchmarkComparison]:
+        """
+        Compare many entities to one benchmark in a single vectorized pass.
+        
+        Metrics match BenchmarkService.calculate_benchmark_comparison, but are
+        computed for all entities at once from one covariance matrix instead
+        of one entity at a time.
+        
+        Args:
+            entity_returns: Daily returns, shape (entities, days), aligned to
+                the benchmark returns
+            benchmark_returns: Benchmark daily returns, shape (days,)
+            entities: (entity type, entity ID, entity name) per row
+            benchmark: Benchmark the returns were taken from
+            
+        Returns:
+            One BenchmarkComparison per entity, in input order
+        """
+        returns = np.atleast_2d(np.asarray(entity_returns, dtype=float))
+        bench = np.asarray(benchmark_returns, dtype=float)
+        if returns.shape != (len(entities), bench.size):
+            raise ValueError("entity_returns must have shape (len(entities), len(benchmark_returns))")
+        
+        # Total returns
+        entity_return_pct = (np.prod(1 + returns, axis=1) - 1) * 100
+        benchmark_return_pct = (np.prod(1 + bench) - 1) * 100
+        
+        # Covariance of every entity with the benchmark from one (P + 1, T) matrix
+        cov = np.cov(np.vstack([returns, bench]))
+        bench_cov = cov[-1, :-1]
+        bench_var = bench.var()
+        beta = bench_cov / bench_var if bench_var > 0 else np.zeros(len(entities))
+        
+        alpha_daily = returns.mean(axis=1) - (
+            DAILY_RISK_FREE_RATE + beta * (bench.mean() - DAILY_RISK_FREE_RATE)
+        )
+        alpha = alpha_daily * TRADING_DAYS_PER_YEAR * 100
+        
+        tracking_error = (returns - bench).std(axis=1, ddof=1) * np.sqrt(TRADING_DAYS_PER_YEAR) * 100
+        
+        with np.errstate(divide="ignore", invalid="ignore"):
+            std = np.sqrt(np.diag(cov))
+            correlation = np.nan_to_num(bench_cov / (std[:-1] * std[-1]))
+            information_ratio = np.where(tracking_error > 0, alpha / tracking_error, 0.0)
+            
+            # Capture ratios use the same benchmark up/down days for every entity
+            up_periods = bench > 0
+            down_periods = bench < 0
+            up_capture = (
+                returns[:, up_periods].mean(axis=1) / bench[up_periods].mean() * 100
+                if up_periods.any() else np.zeros(len(entities))
+            )
+            down_capture = (
+                returns[:, down_periods].mean(axis=1) / bench[down_periods].mean() * 100
+                if down_periods.any() else np.zeros(len(entities))
+            )
+        
+        correlation = np.clip(correlation, -1.0, 1.0)
+        outperformance = entity_return_pct - benchmark_return_pct
+        
+        # Values are computed here, so field validation is skipped
+        return [
+            BenchmarkComparison.model_construct(
+                entity_type=entity_type,
+                entity_id=entity_id,
+                entity_name=entity_name,
+                benchmark_symbol=benchmark.symbol,
+                benchmark_name=benchmark.name,
+                period=benchmark.period,
+                start_date=benchmark.start_date,
+                end_date=benchmark.end_date,
+                entity_return_pct=Decimal(str(entity_return_pct[i])),
+                benchmark_return_pct=Decimal(str(benchmark_return_pct)),
+                alpha=Decimal(str(alpha[i])),
+                beta=Decimal(str(beta[i])),
+                tracking_error=Decimal(str(tracking_error[i])),
+                correlation=Decimal(str(correlation[i])),
+                r_squared=Decimal(str(correlation[i] ** 2)),
+                information_ratio=_to_decimal(information_ratio[i]),
+                up_capture=_to_decimal(up_capture[i]),
+                down_capture=_to_decimal(down_capture[i]),
+                outperforming=bool(outperformance[i] > 0),
+                outperformance_amount=Decimal(str(outperformance[i]))
+            )
+            for i, (entity_type, entity_id, entity_name) in enumerate(entities)
+        ]
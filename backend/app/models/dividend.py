@@ -5,11 +5,13 @@ Dividend models for tracking dividend payments and income.
 from datetime import datetime, date
 from decimal import Decimal
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import ConfigDict, Field
+from app.core.time import utcnow_cached
 from .enums import DividendType
+from .base import BaseFinModel
 
 
-class Dividend(BaseModel):
+class Dividend(BaseFinModel):
     """Represents a dividend payment."""
     
     # Basic identification
@@ -48,13 +50,6 @@ class Dividend(BaseModel):
     pie_id: Optional[str] = Field(None, description="Pie identifier if dividend from pie holding")
     
     # Metadata
-    created_at: datetime = Field(default_factory=datetime.utcnow, description="Record creation timestamp")
-    
-    class Config:
-        """Pydantic configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-            date: lambda v: v.isoformat(),
-            Decimal: lambda v: float(v)
-        }
-        validate_assignment = True
\ No newline at end of file
+    created_at: datetime = Field(default_factory=utcnow_cached, description="Record creation timestamp")
+    
+    model_config = ConfigDict(frozen=True)
\ No newline at end of file
@@ -4,11 +4,14 @@ Historical data models for price history and performance tracking.
 
 from datetime import datetime, date
 from decimal import Decimal
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import Any, Iterable, List, Optional, Tuple
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
+from app.core.time import utcnow_cached
+from .base import BaseFinModel
 
 
-class PricePoint(BaseModel):
+class PricePoint(BaseFinModel):
     """Single price data point."""
     
     price_date: date = Field(..., description="Date of the price point")
@@ -19,15 +22,17 @@ class PricePoint(BaseModel):
     volume: Optional[int] = Field(None, ge=0, description="Trading volume")
     adjusted_close: Optional[Decimal] = Field(None, gt=0, description="Adjusted closing price")
     
-    class Config:
-        """Pydantic configuration."""
-        json_encoders = {
-            date: lambda v: v.isoformat(),
-            Decimal: lambda v: float(v)
-        }
+    model_config = ConfigDict(frozen=True)
 
 
-class HistoricalData(BaseModel):
+# Column order of trusted price rows, matching HistoricalDataTable
+PRICE_ROW_FIELDS = (
+    "price_date", "open_price", "high_price", "low_price",
+    "close_price", "volume", "adjusted_close"
+)
+
+
+class HistoricalData(BaseFinModel):
     """Historical price and performance data for a security or portfolio."""
     
     # Basic identification
@@ -45,7 +50,7 @@ class HistoricalData(BaseModel):
     
     # Data source
     data_source: Optional[str] = Field(None, description="Source of the historical data")
-    last_updated: datetime = Field(default_factory=datetime.utcnow, description="Last update timestamp")
+    last_updated: datetime = Field(default_factory=utcnow_cached, description="Last update timestamp")
     
     @property
     def data_points_count(self) -> int:
@@ -66,17 +71,123 @@ class HistoricalData(BaseModel):
             return self.price_history[0].close_price
         return None
     
-    class Config:
-        """Pydantic configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-            date: lambda v: v.isoformat(),
-            Decimal: lambda v: float(v)
-        }
-        validate_assignment = True
+    @classmethod
+    def build_trusted(
+        cls,
+        symbol: str,
+        rows: Iterable[Tuple[Any, ...]],
+        **fields: Any
+    ) -> "HistoricalData":
+        """
+        Build historical data from trusted rows without running validation.
+        
+        Only use this for data we produced ourselves, such as rows read back
+        from the historical_data table. Rows must be ordered by date, hold
+        values in PRICE_ROW_FIELDS order, and already satisfy PricePoint's
+        constraints (positive prices, non-negative volume). External input
+        must go through the validating constructor instead.
+        
+        Args:
+            symbol: Symbol or identifier
+            rows: Price tuples in PRICE_ROW_FIELDS order
+            **fields: Any other HistoricalData fields (name, currency, ...)
+            
+        Returns:
+            HistoricalData instance
+        """
+        construct = PricePoint.model_construct
+        price_history = [construct(**dict(zip(PRICE_ROW_FIELDS, row))) for row in rows]
+        if price_history:
+            fields.setdefault("start_date", price_history[0].price_date)
+            fields.setdefault("end_date", price_history[-1].price_date)
+        return cls.model_construct(symbol=symbol, price_history=price_history, **fields)
+    
+    def to_series(self) -> "HistoricalSeries":
+        """Columnar view of the price history for vectorized analytics."""
+        return HistoricalSeries.from_pricepoints(self.symbol, self.price_history)
+
+
+class HistoricalSeries(BaseModel):
+    """
+    Columnar price history with one NumPy array per field.
+    
+    Analytics consume whole columns, so keeping prices in contiguous arrays
+    avoids validating and walking one PricePoint model per row. Missing
+    optional prices and volumes are stored as NaN.
+    """
+    
+    symbol: str = Field(..., description="Symbol or identifier")
+    dates: np.ndarray = Field(..., description="Price dates as datetime64[D]")
+    open: np.ndarray = Field(..., description="Opening prices")
+    high: np.ndarray = Field(..., description="High prices")
+    low: np.ndarray = Field(..., description="Low prices")
+    close: np.ndarray = Field(..., description="Closing prices")
+    volume: np.ndarray = Field(..., description="Trading volumes")
+    adjusted_close: np.ndarray = Field(..., description="Adjusted closing prices")
+    
+    @classmethod
+    def from_pricepoints(cls, symbol: str, price_points: List[PricePoint]) -> "HistoricalSeries":
+        """Build a columnar series from validated price points."""
+        def column(attr: str) -> np.ndarray:
+            return np.array(
+                [np.nan if (value := getattr(point, attr)) is None else float(value) for point in price_points],
+                dtype=np.float64
+            )
+        
+        return cls(
+            symbol=symbol,
+            dates=np.array([point.price_date for point in price_points], dtype="datetime64[D]"),
+            open=column("open_price"),
+            high=column("high_price"),
+            low=column("low_price"),
+            close=column("close_price"),
+            volume=column("volume"),
+            adjusted_close=column("adjusted_close")
+        )
+    
+    def to_pricepoints(self) -> List[PricePoint]:
+        """Expand the series back into PricePoint models for API responses."""
+        # Values come from validated price points, so validation is skipped
+        construct = PricePoint.model_construct
+        
+        def optional(value: float) -> Optional[Decimal]:
+            return None if np.isnan(value) else Decimal(str(value))
+        
+        return [
+            construct(
+                price_date=price_date,
+                open_price=optional(open_price),
+                high_price=optional(high_price),
+                low_price=optional(low_price),
+                close_price=Decimal(str(close_price)),
+                volume=None if np.isnan(volume) else int(volume),
+                adjusted_close=optional(adjusted_close)
+            )
+            for price_date, open_price, high_price, low_price, close_price, volume, adjusted_close in zip(
+                self.dates.astype(object), self.open.tolist(), self.high.tolist(), self.low.tolist(),
+                self.close.tolist(), self.volume.tolist(), self.adjusted_close.tolist()
+            )
+        ]
+    
+    @property
+    def data_points_count(self) -> int:
+        """Number of data points in the series."""
+        return len(self.close)
+    
+    @property
+    def latest_price(self) -> Optional[float]:
+        """Most recent closing price."""
+        return float(self.close[-1]) if len(self.close) else None
+    
+    @property
+    def earliest_price(self) -> Optional[float]:
+        """Earliest closing price."""
+        return float(self.close[0]) if len(self.close) else None
+    
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
-class PerformanceSnapshot(BaseModel):
+class PerformanceSnapshot(BaseFinModel):
     """Performance snapshot for a specific time period."""
     
     # Identification
@@ -100,13 +211,6 @@ class PerformanceSnapshot(BaseModel):
     withdrawals: Decimal = Field(default=Decimal('0'), ge=0, description="Withdrawals during period")
     
     # Metadata
-    created_at: datetime = Field(default_factory=datetime.utcnow, description="Snapshot creation timestamp")
-    
-    class Config:
-        """Pydantic configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-            date: lambda v: v.isoformat(),
-            Decimal: lambda v: float(v)
-        }
-        validate_assignment = True
\ No newline at end of file
+    created_at: datetime = Field(default_factory=utcnow_cached, description="Snapshot creation timestamp")
+    
+    model_config = ConfigDict(frozen=True)
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+Integer minor-unit helpers for monetary amounts.
+
+Amounts are represented as int micro-units (millionths of the currency unit)
+where many values are aggregated, so sums stay exact without building a new
+Decimal for every addition.
+"""
+
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import Annotated, Union
+from pydantic import Field
+
+
+# Micro-units per whole currency unit
+MICROS_PER_UNIT = 1_000_000
+
+MoneyMicros = Annotated[int, Field(description="Amount in millionths of the currency unit")]
+
+
+def to_micros(amount: Union[Decimal, int, float, str]) -> int:
+    """Convert an amount to integer micro-units, rounding half to even."""
+    if not isinstance(amount, Decimal):
+        amount = Decimal(str(amount))
+    return int(amount.scaleb(6).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+
+def from_micros(micros: int) -> Decimal:
+    """Convert integer micro-units back to a Decimal amount."""
+    return Decimal(micros).scaleb(-6)
+
+
+def decimal_to_float(value: Decimal) -> float:
+    """Serialize a Decimal amount as a JSON number."""
+    return float(value)
+
+
+# Shared model json_encoders; dates and datetimes serialize natively
+DECIMAL_JSON_ENCODERS = {Decimal: decimal_to_float}
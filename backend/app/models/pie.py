@@ -4,13 +4,17 @@ Pie models for Trading 212 pie investments.
 
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional, Dict
-from pydantic import BaseModel, Field, validator
+from typing import Any, List, Optional, Dict, Tuple
+from pydantic import Field, PrivateAttr, field_validator
+from app.core.time import utcnow_cached
 from .position import Position
 from .risk import RiskMetrics
+from .base import BaseFinModel
+from .position_batch import PositionBatch, top_positions
+from .versioning import content_revision, versioned_cache
 
 
-class PieMetrics(BaseModel):
+class PieMetrics(BaseFinModel):
     """Performance and risk metrics for a pie."""
     
     # Value metrics
@@ -51,17 +55,9 @@ class PieMetrics(BaseModel):
     
     # Holdings
     top_holdings: List[str] = Field(default_factory=list, description="Top holdings symbols")
-    
-    class Config:
-        """Pydantic configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-            Decimal: lambda v: float(v)
-        }
-        validate_assignment = True
 
 
-class Pie(BaseModel):
+class Pie(BaseFinModel):
     """Represents a Trading 212 pie investment."""
     
     # Basic identification
@@ -82,29 +78,75 @@ class Pie(BaseModel):
     # Metadata
     created_at: datetime = Field(..., description="Pie creation date")
     last_rebalanced: Optional[datetime] = Field(None, description="Last rebalancing date")
-    last_updated: datetime = Field(default_factory=datetime.utcnow, description="Last update timestamp")
+    last_updated: datetime = Field(default_factory=utcnow_cached, description="Last update timestamp")
+    
+    # Holdings revision and derived-property cache
+    _rev: int = PrivateAttr(default=0)
+    _cache: Dict[str, Tuple[Any, Any]] = PrivateAttr(default_factory=dict)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == 'positions':
+            self._rev += 1
+    
+    def _cache_key(self) -> Tuple[int, int, int]:
+        """Key for derived holdings; the list identity and length also catch in-place appends and removals."""
+        return self._rev, id(self.positions), len(self.positions)
     
-    @validator('positions')
+    @field_validator('positions')
+    @classmethod
     def validate_positions(cls, v):
         """Ensure positions list is valid."""
         if not isinstance(v, list):
             raise ValueError("Positions must be a list")
         return v
     
+    def invalidate_cache(self) -> None:
+        """Recompute derived holdings on next access, e.g. after in-place price updates."""
+        self._rev += 1
+    
+    def add_position(self, position: Position) -> None:
+        """
+        Add a position and invalidate derived holdings.
+        
+        Args:
+            position: Position to add
+        """
+        self.positions.append(position)
+        self._rev += 1
+    
+    def remove_position(self, symbol: str) -> Optional[Position]:
+        """
+        Remove the position for a symbol and invalidate derived holdings.
+        
+        Args:
+            symbol: Symbol of the position to remove
+            
+        Returns:
+            The removed position, or None if the pie does not hold the symbol
+        """
+        for index, position in enumerate(self.positions):
+            if position.symbol == symbol:
+                self._rev += 1
+                return self.positions.pop(index)
+        return None
+    
     @property
     def position_count(self) -> int:
         """Number of positions in the pie."""
         return len(self.positions)
     
-    @property
+    @versioned_cache
     def top_holdings(self) -> List[Position]:
         """Top 10 holdings by market value."""
-        return sorted(self.positions, key=lambda p: p.market_value, reverse=True)[:10]
-    
-    class Config:
-        """Pydantic configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-            Decimal: lambda v: float(v)
-        }
-        validate_assignment = True
\ No newline at end of file
+        return top_positions(self.positions, 10)
+    
+    @versioned_cache
+    def data_revision(self) -> int:
+        """Content hash of the holdings, equal across re-fetches of unchanged data."""
+        return content_revision(self.positions)
+    
+    @versioned_cache
+    def position_batch(self) -> PositionBatch:
+        """Columnar view of the positions for vectorized analytics."""
+        return PositionBatch.from_positions(self.positions)
\ No newline at end of file
@@ -4,14 +4,19 @@ Portfolio models for the main portfolio container.
 
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional, Dict
-from pydantic import BaseModel, Field, validator
+from itertools import chain
+from typing import Any, Iterator, List, Optional, Dict, Tuple
+from pydantic import Field, PrivateAttr, field_validator
+from app.core.time import utcnow_cached
 from .pie import Pie
 from .position import Position
 from .risk import RiskMetrics
+from .base import BaseFinModel
+from .position_batch import top_positions
+from .versioning import content_revision, versioned_cache
 
 
-class PortfolioMetrics(BaseModel):
+class PortfolioMetrics(BaseFinModel):
     """Comprehensive metrics for the entire portfolio."""
     
     # Value metrics
@@ -49,17 +54,9 @@ class PortfolioMetrics(BaseModel):
     
     # Risk metrics
     risk_metrics: Optional[RiskMetrics] = Field(None, description="Portfolio risk analysis")
-    
-    class Config:
-        """Pydantic configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-            Decimal: lambda v: float(v)
-        }
-        validate_assignment = True
 
 
-class Portfolio(BaseModel):
+class Portfolio(BaseFinModel):
     """Main portfolio model containing all pies and individual positions."""
     
     # Basic identification
@@ -79,53 +76,189 @@ class Portfolio(BaseModel):
     benchmark_symbol: Optional[str] = Field(None, description="Benchmark symbol for comparison")
     
     # Metadata
-    created_at: datetime = Field(default_factory=datetime.utcnow, description="Portfolio creation date")
-    last_updated: datetime = Field(default_factory=datetime.utcnow, description="Last update timestamp")
+    created_at: datetime = Field(default_factory=utcnow_cached, description="Portfolio creation date")
+    last_updated: datetime = Field(default_factory=utcnow_cached, description="Last update timestamp")
     last_sync: Optional[datetime] = Field(None, description="Last sync with Trading 212")
     
-    @validator('pies')
+    # Holdings revision and derived-property cache
+    _rev: int = PrivateAttr(default=0)
+    _cache: Dict[str, Tuple[Any, Any]] = PrivateAttr(default_factory=dict)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in ('pies', 'individual_positions'):
+            self._rev += 1
+    
+    def _cache_key(self) -> Tuple[Any, ...]:
+        """Key for derived holdings, including each pie's own holdings key."""
+        return (
+            self._rev,
+            id(self.individual_positions),
+            len(self.individual_positions),
+            tuple(pie._cache_key() for pie in self.pies)
+        )
+    
+    @field_validator('pies')
+    @classmethod
     def validate_pies(cls, v):
         """Ensure pies list is valid."""
         if not isinstance(v, list):
             raise ValueError("Pies must be a list")
         return v
     
-    @validator('individual_positions')
+    @field_validator('individual_positions')
+    @classmethod
     def validate_individual_positions(cls, v):
         """Ensure individual positions list is valid."""
         if not isinstance(v, list):
             raise ValueError("Individual positions must be a list")
         return v
     
-    @property
+    def invalidate_cache(self) -> None:
+        """Recompute derived holdings here and in every pie, e.g. after in-place price updates."""
+        for pie in self.pies:
+            pie.invalidate_cache()
+        self._rev += 1
+    
+    def add_pie(self, pie: Pie) -> None:
+        """
+        Add a pie and invalidate derived holdings.
+        
+        Args:
+            pie: Pie to add
+        """
+        self.pies.append(pie)
+        self._rev += 1
+    
+    def remove_pie(self, pie_id: str) -> Optional[Pie]:
+        """
+        Remove a pie and invalidate derived holdings.
+        
+        Args:
+            pie_id: Identifier of the pie to remove
+            
+        Returns:
+            The removed pie, or None if no pie has that identifier
+        """
+        for index, pie in enumerate(self.pies):
+            if pie.id == pie_id:
+                self._rev += 1
+                return self.pies.pop(index)
+        return None
+    
+    def add_individual_position(self, position: Position) -> None:
+        """
+        Add a position held outside any pie and invalidate derived holdings.
+        
+        Args:
+            position: Position to add
+        """
+        self.individual_positions.append(position)
+        self._rev += 1
+    
+    def remove_individual_position(self, symbol: str) -> Optional[Position]:
+        """
+        Remove an individual position and invalidate derived holdings.
+        
+        Args:
+            symbol: Symbol of the position to remove
+            
+        Returns:
+            The removed position, or None if no individual position has that symbol
+        """
+        for index, position in enumerate(self.individual_positions):
+            if position.symbol == symbol:
+                self._rev += 1
+                return self.individual_positions.pop(index)
+        return None
+    
+    @versioned_cache
     def total_positions(self) -> int:
         """Total number of positions across all pies and individual holdings."""
         pie_positions = sum(len(pie.positions) for pie in self.pies)
         return pie_positions + len(self.individual_positions)
     
-    @property
+    def iter_positions(self) -> Iterator[Position]:
+        """
+        Iterate over pie and individual positions without building a list.
+        
+        Use for single-pass reads; ``all_positions`` is the cached list for
+        callers that need random access or several passes.
+        
+        Returns:
+            Iterator over every position, pies first
+        """
+        return chain(
+            chain.from_iterable(pie.positions for pie in self.pies),
+            self.individual_positions
+        )
+    
+    @versioned_cache
     def all_positions(self) -> List[Position]:
         """All positions from pies and individual holdings combined."""
-        all_pos = []
-        for pie in self.pies:
-            all_pos.extend(pie.positions)
-        all_pos.extend(self.individual_positions)
-        return all_pos
+        return list(self.iter_positions())
     
-    @property
+    @versioned_cache
+    def symbol_index(self) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Locations of each symbol's positions as ``(pie_index, position_index)``.
+        
+        Individual positions use a pie index of -1. A symbol held in several
+        pies maps to every location, pies first.
+        """
+        index: Dict[str, List[Tuple[int, int]]] = {}
+        for pie_index, pie in enumerate(self.pies):
+            for position_index, position in enumerate(pie.positions):
+                index.setdefault(position.symbol, []).append((pie_index, position_index))
+        for position_index, position in enumerate(self.individual_positions):
+            index.setdefault(position.symbol, []).append((-1, position_index))
+        return index
+    
+    def find_positions(self, symbol: str) -> List[Position]:
+        """
+        Look up every position holding a symbol without scanning the holdings.
+        
+        Args:
+            symbol: Symbol to look up
+        
+        Returns:
+            Positions for the symbol, pies first; empty if it is not held
+        """
+        return [
+            self.individual_positions[position_index] if pie_index < 0
+            else self.pies[pie_index].positions[position_index]
+            for pie_index, position_index in self.symbol_index.get(symbol, ())
+        ]
+    
+    def find_position(self, symbol: str) -> Optional[Position]:
+        """
+        Look up the first position holding a symbol.
+        
+        Args:
+            symbol: Symbol to look up
+        
+        Returns:
+            First position for the symbol, or None if it is not held
+        """
+        locations = self.symbol_index.get(symbol)
+        if not locations:
+            return None
+        pie_index, position_index = locations[0]
+        if pie_index < 0:
+            return self.individual_positions[position_index]
+        return self.pies[pie_index].positions[position_index]
+    
+    @versioned_cache
     def top_holdings(self) -> List[Position]:
         """Top 10 holdings across entire portfolio by market value."""
-        return sorted(self.all_positions, key=lambda p: p.market_value, reverse=True)[:10]
+        return top_positions(self.all_positions, 10)
+    
+    @versioned_cache
+    def data_revision(self) -> int:
+        """Content hash of the holdings, equal across re-fetches of unchanged data."""
+        return content_revision(self.all_positions)
     
     @property
     def pie_count(self) -> int:
         """Number of pies in the portfolio."""
-        return len(self.pies)
-    
-    class Config:
-        """Pydantic configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-            Decimal: lambda v: float(v)
-        }
-        validate_assignment = True
\ No newline at end of file
+        return len(self.pies)
\ No newline at end of file
@@ -4,12 +4,16 @@ Position model for individual holdings within portfolios and pies.
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
-from pydantic import BaseModel, Field, validator
+from typing import Any, Optional, Sequence
+import orjson
+from pydantic import Field, model_validator
+from app.core.time import utcnow_cached
 from .enums import AssetType
+from .base import BaseFinModel
+from .money import decimal_to_float
 
 
-class Position(BaseModel):
+class Position(BaseFinModel):
     """Represents a single position/holding in a portfolio or pie."""
     
     symbol: str = Field(..., description="Stock/ETF symbol (e.g., AAPL, SPY)")
@@ -29,33 +33,76 @@ class Position(BaseModel):
     asset_type: AssetType = Field(..., description="Type of asset")
     
     # Metadata
-    last_updated: datetime = Field(default_factory=datetime.utcnow, description="Last update timestamp")
-    
-    @validator('market_value', always=True)
-    def calculate_market_value(cls, v, values):
-        """Calculate market value from quantity and current price."""
-        if 'quantity' in values and 'current_price' in values:
-            return values['quantity'] * values['current_price']
-        return v
-    
-    @validator('unrealized_pnl', always=True)
-    def calculate_unrealized_pnl(cls, v, values):
-        """Calculate unrealized P&L."""
-        if all(key in values for key in ['quantity', 'current_price', 'average_price']):
-            return values['quantity'] * (values['current_price'] - values['average_price'])
-        return v
-    
-    @validator('unrealized_pnl_pct', always=True)
-    def calculate_unrealized_pnl_pct(cls, v, values):
-        """Calculate unrealized P&L percentage."""
-        if 'current_price' in values and 'average_price' in values and values['average_price'] > 0:
-            return ((values['current_price'] - values['average_price']) / values['average_price']) * 100
-        return v
-    
-    class Config:
-        """Pydantic configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-            Decimal: lambda v: float(v)
+    last_updated: datetime = Field(default_factory=utcnow_cached, description="Last update timestamp")
+    
+    @classmethod
+    def construct_trusted(cls, **fields: Any) -> 'Position':
+        """
+        Build a position from already validated fields, skipping field validation.
+        
+        Market value and unrealized P&L are derived exactly as on validation.
+        
+        Args:
+            **fields: Values for every required field, with Decimal amounts
+            
+        Returns:
+            Position instance
+        """
+        position = cls.model_construct(**fields)
+        position._derive(position.current_price)
+        return position
+    
+    @model_validator(mode='after')
+    def derive_values(self) -> 'Position':
+        """Calculate market value and unrealized P&L once all fields are parsed."""
+        self._derive(self.current_price)
+        return self
+    
+    def _derive(self, current_price: Decimal) -> None:
+        """Write current price and the values derived from it in one update."""
+        quantity = self.quantity
+        average_price = self.average_price
+        price_change = current_price - average_price
+        
+        derived = {
+            'current_price': current_price,
+            'market_value': quantity * current_price,
+            'unrealized_pnl': quantity * price_change
         }
-        validate_assignment = True
\ No newline at end of file
+        # A zero cost basis keeps the supplied percentage
+        if average_price > 0:
+            derived['unrealized_pnl_pct'] = price_change / average_price * 100
+        
+        # Fields are plain instance attributes; bypass per-field __setattr__
+        self.__dict__.update(derived)
+    
+    def update_price(self, new_price: Decimal) -> None:
+        """
+        Refresh the current price and recompute the derived values together.
+        
+        Pies and portfolios cache derived holdings such as top holdings, so
+        call their ``invalidate_cache()`` after price updates.
+        
+        Args:
+            new_price: New market price per share
+        """
+        if new_price < 0:
+            raise ValueError("current_price must be greater than or equal to 0")
+        self._derive(new_price)
+
+
+def dump_positions_json(positions: Sequence[Position]) -> bytes:
+    """
+    Serialize positions to JSON bytes in one orjson call.
+    
+    Produces the same document as returning ``List[Position]`` through a
+    response model, without re-validating every position on the way out.
+    Decimals are encoded as numbers, as with the model JSON encoders.
+    
+    Args:
+        positions: Positions to serialize
+        
+    Returns:
+        JSON array of positions
+    """
+    return orjson.dumps([pos.model_dump() for pos in positions], default=decimal_to_float)
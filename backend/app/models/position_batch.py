@@ -0,0 +1,249 @@
+"""
+Columnar position batches for vectorized portfolio math.
+
+Position models keep Decimal amounts for API ingress and egress. Portfolio
+level analytics only need float precision, so positions are transposed once
+into a struct of NumPy arrays and every derived column is computed in a
+single vector operation instead of one Decimal operation per position.
+"""
+
+import math
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .position import Position
+from .vocab import CATEGORIES
+
+
+def top_k_indices(values: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k largest values, largest first, in O(n) plus O(k log k).
+    
+    Ties keep their original order, matching a stable ``sorted(..., reverse=True)``.
+    
+    Args:
+        values: Values to rank
+        k: Number of indices to return
+        
+    Returns:
+        Integer index array of length min(k, len(values))
+    """
+    n = values.size
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.intp)
+    if k >= n:
+        return np.argsort(-values, kind="stable")
+    
+    # Partition around the k-th largest value, then fill ties in index order
+    threshold = np.partition(values, n - k)[n - k]
+    above = np.flatnonzero(values > threshold)
+    ties = np.flatnonzero(values == threshold)[:k - above.size]
+    chosen = np.concatenate((above, ties))
+    return chosen[np.argsort(-values[chosen], kind="stable")]
+
+
+def sum_by_group(values: np.ndarray, labels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sum values per label with a single bincount.
+    
+    Args:
+        values: Values to sum
+        labels: Group label per value
+        
+    Returns:
+        Tuple of (group labels in first-seen order, sum per group)
+    """
+    if values.size == 0:
+        return np.empty(0, dtype=object), np.empty(0, dtype=np.float64)
+    
+    groups, first_seen, group_ids = np.unique(labels, return_index=True, return_inverse=True)
+    sums = np.bincount(group_ids, weights=values, minlength=groups.size)
+    order = np.argsort(first_seen)
+    return groups[order], sums[order]
+
+
+def top_positions(positions: List[Position], k: int) -> List[Position]:
+    """
+    The k positions with the largest market value, largest first.
+    
+    Args:
+        positions: Positions to rank
+        k: Number of positions to return
+        
+    Returns:
+        Up to k positions
+    """
+    market_value = np.fromiter(
+        (float(pos.market_value) for pos in positions),
+        dtype=np.float64,
+        count=len(positions)
+    )
+    return [positions[i] for i in top_k_indices(market_value, k)]
+
+
+@dataclass(slots=True)
+class AllocationBreakdown:
+    """Category labels with parallel percentage weights, largest first."""
+    labels: List[str] = field(default_factory=list)
+    weights: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    
+    @classmethod
+    def from_groups(cls, labels: List[str], weights: np.ndarray) -> "AllocationBreakdown":
+        """
+        Order grouped weights from largest to smallest; ties keep their input order.
+        
+        Args:
+            labels: Category label per group
+            weights: Weight per group
+            
+        Returns:
+            AllocationBreakdown sorted by weight descending
+        """
+        order = np.argsort(-weights, kind="stable")
+        return cls(labels=[labels[i] for i in order.tolist()], weights=weights[order])
+    
+    def __len__(self) -> int:
+        return len(self.labels)
+    
+    def to_dict(self) -> Dict[str, Decimal]:
+        """Allocation as an ordered mapping of label to Decimal weight."""
+        return {label: Decimal(str(weight)) for label, weight in zip(self.labels, self.weights.tolist())}
+
+
+@dataclass(slots=True)
+class PositionBatch:
+    """
+    Struct-of-arrays view over a list of positions.
+    
+    Categorical labels are stored as int32 IDs interned in ``CATEGORIES``.
+    """
+    symbol: np.ndarray
+    quantity: np.ndarray
+    average_price: np.ndarray
+    current_price: np.ndarray
+    sector_id: np.ndarray
+    industry_id: np.ndarray
+    country_id: np.ndarray
+    asset_type_id: np.ndarray
+    currency_id: np.ndarray
+    
+    @classmethod
+    def from_positions(cls, positions: List[Position]) -> "PositionBatch":
+        """
+        Transpose positions into float64, int32 ID and symbol columns.
+        
+        Args:
+            positions: Positions to batch
+        
+        Returns:
+            PositionBatch with one row per position
+        """
+        def floats(attr: str) -> np.ndarray:
+            return np.fromiter(
+                (float(getattr(pos, attr)) for pos in positions),
+                dtype=np.float64,
+                count=len(positions)
+            )
+        
+        def ids(values) -> np.ndarray:
+            return CATEGORIES.encode(values, count=len(positions))
+        
+        def classification(attr: str) -> np.ndarray:
+            # Missing classifications are grouped as "Unknown", as in the allocations
+            return ids(getattr(pos, attr) or "Unknown" for pos in positions)
+        
+        symbol = np.empty(len(positions), dtype=object)
+        symbol[:] = [pos.symbol for pos in positions]
+        
+        return cls(
+            symbol=symbol,
+            quantity=floats("quantity"),
+            average_price=floats("average_price"),
+            current_price=floats("current_price"),
+            sector_id=classification("sector"),
+            industry_id=classification("industry"),
+            country_id=classification("country"),
+            asset_type_id=ids(pos.asset_type.value for pos in positions),
+            currency_id=ids(pos.currency for pos in positions)
+        )
+    
+    def __len__(self) -> int:
+        return len(self.symbol)
+    
+    @property
+    def sector(self) -> List[str]:
+        """Sector name per position."""
+        return CATEGORIES.decode(self.sector_id)
+    
+    @property
+    def industry(self) -> List[str]:
+        """Industry name per position."""
+        return CATEGORIES.decode(self.industry_id)
+    
+    @property
+    def country(self) -> List[str]:
+        """Country name per position."""
+        return CATEGORIES.decode(self.country_id)
+    
+    @property
+    def asset_type(self) -> List[str]:
+        """Asset type value per position."""
+        return CATEGORIES.decode(self.asset_type_id)
+    
+    @property
+    def currency(self) -> List[str]:
+        """Currency code per position."""
+        return CATEGORIES.decode(self.currency_id)
+    
+    def breakdown(self, values: np.ndarray, ids: np.ndarray) -> AllocationBreakdown:
+        """
+        Sum values per category into a breakdown ordered largest first.
+        
+        Args:
+            values: Value per position
+            ids: One of the batch's ``*_id`` columns
+            
+        Returns:
+            AllocationBreakdown of the per-category sums
+        """
+        groups, sums = sum_by_group(values, ids)
+        return AllocationBreakdown.from_groups(CATEGORIES.decode(groups), sums)
+    
+    @property
+    def market_value(self) -> np.ndarray:
+        """Market value per position (quantity * current price)."""
+        return self.quantity * self.current_price
+    
+    @property
+    def cost_basis(self) -> np.ndarray:
+        """Invested amount per position (quantity * average price)."""
+        return self.quantity * self.average_price
+    
+    @property
+    def unrealized_pnl(self) -> np.ndarray:
+        """Unrealized profit/loss per position."""
+        return self.quantity * (self.current_price - self.average_price)
+    
+    @property
+    def unrealized_pnl_pct(self) -> np.ndarray:
+        """Unrealized P&L percentage per position; 0 where the average price is 0."""
+        average_price = self.average_price
+        safe_price = np.where(average_price > 0, average_price, 1.0)
+        return np.where(average_price > 0, (self.current_price - average_price) / safe_price * 100, 0.0)
+    
+    @property
+    def total_value(self) -> float:
+        """Total market value of the batch, summed with error compensation."""
+        return math.fsum(self.market_value)
+    
+    @property
+    def weights(self) -> np.ndarray:
+        """Portfolio weight of each position; all zeros if the batch has no value."""
+        market_value = self.market_value
+        total_value = math.fsum(market_value)
+        if total_value <= 0:
+            return np.zeros_like(market_value)
+        return market_value / total_value
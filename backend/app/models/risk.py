@@ -4,11 +4,12 @@ Risk metrics models for portfolio and pie risk analysis.
 
 from decimal import Decimal
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import Field
 from .enums import RiskCategory
+from .base import BaseFinModel
 
 
-class RiskMetrics(BaseModel):
+class RiskMetrics(BaseFinModel):
     """Risk metrics for portfolios and pies."""
     
     # Volatility metrics
@@ -38,11 +39,4 @@ class RiskMetrics(BaseModel):
     
     # Risk categorization
     risk_category: RiskCategory = Field(..., description="Overall risk category")
-    risk_score: Decimal = Field(..., ge=0, le=100, description="Risk score (0-100)")
-    
-    class Config:
-        """Pydantic configuration."""
-        json_encoders = {
-            Decimal: lambda v: float(v)
-        }
-        validate_assignment = True
\ No newline at end of file
+    risk_score: Decimal = Field(..., ge=0, le=100, description="Risk score (0-100)")
\ No newline at end of file
@@ -0,0 +1,61 @@
+"""
+Revision-keyed caching for derived model properties.
+
+Portfolio and pie properties such as ``all_positions`` or ``top_holdings``
+walk every position on each access. Models using ``versioned_cache`` keep a
+revision counter that is bumped whenever a holdings field is assigned, and a
+derived value is reused for as long as the model's cache key is unchanged.
+Changes the key cannot observe, such as position price updates, are
+signalled with the model's ``invalidate_cache()``.
+"""
+
+from functools import wraps
+from typing import Any, Callable, Hashable, Iterable
+
+
+def versioned_cache(method: Callable[[Any], Any]) -> property:
+    """
+    Turn a method into a property cached against ``self._cache_key()``.
+    
+    The decorated model must define a ``_cache`` dict private attribute and a
+    ``_cache_key()`` method returning a hashable key that changes whenever
+    the inputs of the property change.
+    
+    Args:
+        method: Zero-argument method computing the derived value
+        
+    Returns:
+        Read-only property returning the cached value
+    """
+    name = method.__name__
+    
+    @wraps(method)
+    def getter(self) -> Any:
+        key: Hashable = self._cache_key()
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        value = method(self)
+        self._cache[name] = (key, value)
+        return value
+    
+    return property(getter)
+
+
+def content_revision(positions: Iterable[Any]) -> int:
+    """
+    Hash the holdings state of positions, equal across re-fetches of unchanged data.
+    
+    Args:
+        positions: Positions to fingerprint, in order
+        
+    Returns:
+        Hash of each position's identity, amounts and classification
+    """
+    return hash(tuple(
+        (
+            pos.symbol, pos.quantity, pos.average_price, pos.current_price,
+            pos.sector, pos.industry, pos.country, pos.asset_type, pos.currency
+        )
+        for pos in positions
+    ))
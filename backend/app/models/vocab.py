@@ -0,0 +1,88 @@
+"""
+Interned integer IDs for categorical position labels.
+
+Sector, industry, country, asset type and currency labels repeat across
+thousands of positions. Position batches store them as int32 IDs from a
+shared vocabulary so grouping runs on integer arrays, and names are only
+looked up again for the handful of groups in a finished allocation.
+"""
+
+import threading
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+
+class Vocabulary:
+    """Append-only mapping between label names and dense int32 IDs."""
+    
+    def __init__(self):
+        """Initialize an empty vocabulary."""
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._names)
+    
+    def get_id(self, name: str) -> int:
+        """
+        Return the ID for a name, assigning the next free ID on first use.
+        
+        Args:
+            name: Label to intern
+        
+        Returns:
+            Dense integer ID
+        """
+        label_id = self._ids.get(name)
+        if label_id is None:
+            with self._lock:
+                label_id = self._ids.get(name)
+                if label_id is None:
+                    label_id = len(self._names)
+                    self._names.append(name)
+                    self._ids[name] = label_id
+        return label_id
+    
+    def name(self, label_id: int) -> str:
+        """
+        Return the name for an ID.
+        
+        Args:
+            label_id: ID returned by ``get_id``
+        
+        Returns:
+            Interned label name
+        """
+        return self._names[label_id]
+    
+    def encode(self, names: Iterable[str], count: int = -1) -> np.ndarray:
+        """
+        Encode names into an int32 ID array.
+        
+        Args:
+            names: Labels to encode
+            count: Number of labels, if known
+        
+        Returns:
+            int32 array of IDs
+        """
+        return np.fromiter((self.get_id(name) for name in names), dtype=np.int32, count=count)
+    
+    def decode(self, ids: np.ndarray) -> List[str]:
+        """
+        Decode an ID array back into names.
+        
+        Args:
+            ids: IDs returned by ``get_id`` or ``encode``
+        
+        Returns:
+            Label names in the same order
+        """
+        names = self._names
+        return [names[label_id] for label_id in ids.tolist()]
+
+
+# Shared by every position batch so IDs are comparable across batches
+CATEGORIES = Vocabulary()
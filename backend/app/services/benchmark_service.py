@@ -12,17 +12,25 @@ from datetime import datetime, timedelta, date
 from typing import Dict, List, Optional, Any, Tuple
 from decimal import Decimal
 import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 
 import httpx
+import ijson
+import orjson
+import ormsgpack
 import redis.asyncio as redis
+from redis.commands.core import AsyncScript
 import pandas as pd
 import numpy as np
+import zstandard
 from pydantic import BaseModel, ValidationError
 
 from app.core.config import settings
 from app.models.benchmark import (
     BenchmarkInfo, BenchmarkData, BenchmarkDataPoint, BenchmarkComparison,
-    CustomBenchmark, BenchmarkAnalysis
+    CustomBenchmark, BenchmarkAnalysis, TRADING_DAYS_PER_YEAR
 )
 from app.models.portfolio import Portfolio
 from app.models.pie import Pie
@@ -41,6 +49,202 @@ class BenchmarkAPIError(Exception):
         super().__init__(self.message)
 
 
+# Prefix of cache keys holding zstd-compressed msgpack values; bump when the format changes
+CACHE_FORMAT_PREFIX = "v2:"
+
+# Keys scanned and unlinked per round trip when clearing the cache
+CACHE_CLEAR_BATCH_SIZE = 500
+
+_zstd_compressor = zstandard.ZstdCompressor(level=3)
+_zstd_decompressor = zstandard.ZstdDecompressor()
+
+
+def _msgpack_default(value: Any) -> Any:
+    """Serialize types msgpack has no encoding for; Decimals keep their exact digits."""
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not msgpack serializable: {type(value).__name__}")
+
+
+def _pack_cache_value(data: Any) -> bytes:
+    """
+    Encode a cache value as zstd-compressed msgpack.
+    
+    Pydantic models are serialized natively by ormsgpack, producing the same
+    bytes as their field dict without the Python-level ``model_dump`` walk.
+    """
+    return _zstd_compressor.compress(
+        ormsgpack.packb(data, option=ormsgpack.OPT_SERIALIZE_PYDANTIC, default=_msgpack_default)
+    )
+
+
+def _unpack_cache_value(raw: bytes) -> Any:
+    """Decode a cache value written by ``_pack_cache_value``."""
+    return ormsgpack.unpackb(_zstd_decompressor.decompress(raw))
+
+
+# In-process cache in front of Redis for hot benchmark series
+BENCHMARK_L1_CACHE_SIZE = 256
+BENCHMARK_L1_TTL = 60  # seconds
+
+
+class _BenchmarkL1Cache:
+    """LRU of BenchmarkData keyed by cache key, with a per-entry expiry."""
+    
+    def __init__(self, maxsize: int):
+        """Initialize an empty cache holding at most ``maxsize`` entries."""
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, BenchmarkData]]" = OrderedDict()
+    
+    def get(self, key: str) -> Optional[BenchmarkData]:
+        """Return a fresh cached value, marking it most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expiry, value = entry
+        if expiry <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def put(self, key: str, value: BenchmarkData, ttl: float) -> None:
+        """Store a value for ``ttl`` seconds, evicting the least recently used beyond the limit."""
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+    
+    def invalidate(self, prefix: str = "") -> None:
+        """Drop every entry whose key starts with ``prefix``."""
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+
+# Shared by all service instances, which are created per request
+_benchmark_l1_cache = _BenchmarkL1Cache(BENCHMARK_L1_CACHE_SIZE)
+
+# Fetches in progress keyed by (cache key, use_cache), joined by concurrent callers
+_inflight_fetches: Dict[Tuple[str, bool], "asyncio.Task[Optional[BenchmarkData]]"] = {}
+
+
+
+def _finish_inflight_fetch(flight_key: Tuple[str, bool], task: "asyncio.Task[Optional[BenchmarkData]]") -> None:
+    """Forget a finished shared fetch; its result stays with the callers awaiting it."""
+    if _inflight_fetches.get(flight_key) is task:
+        del _inflight_fetches[flight_key]
+    # Mark retrieved so a fetch whose callers were all cancelled does not log a warning
+    if not task.cancelled():
+        task.exception()
+
+
+# Token bucket shared by all workers through Redis.
+# KEYS: bucket key; ARGV: capacity, refill per second, cost, now in ms.
+# Returns 1 and takes the tokens if enough are available, else 0.
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill_per_sec = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local last_ts = tonumber(state[2])
+if tokens == nil or last_ts == nil then
+    tokens = capacity
+    last_ts = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - last_ts) / 1000 * refill_per_sec)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / refill_per_sec * 1000) + 1000)
+return allowed
+"""
+
+
+# Per-row fields kept while streaming an Alpha Vantage time series
+_ALPHA_VANTAGE_ROW_FIELDS = frozenset({"4. close", "close", "6. volume", "volume"})
+
+# Top-level Alpha Vantage keys that carry an error or throttling message
+_ALPHA_VANTAGE_MESSAGE_KEYS = frozenset({"Error Message", "Note"})
+
+
+class _AsyncByteReader:
+    """Async file-like view over an async iterator of byte chunks, as ijson expects."""
+    
+    def __init__(self, chunks) -> None:
+        self._chunks = chunks.__aiter__()
+    
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes with read(0) to detect bytes vs text
+        if size == 0:
+            return b""
+        # Short reads are fine for ijson; only b"" means end of stream
+        async for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
+
+
+async def _parse_alpha_vantage_stream(chunks, time_series_key: str) -> Dict[str, Any]:
+    """
+    Incrementally parse an Alpha Vantage response body.
+    
+    Only the error/note messages and the close and volume of each time series
+    row are kept, so the full document is never held in memory.
+    
+    Args:
+        chunks: Async iterator of raw response bytes
+        time_series_key: Top-level key of the requested time series
+        
+    Returns:
+        Trimmed response in the Alpha Vantage layout
+    """
+    data: Dict[str, Any] = {}
+    rows: Dict[str, Dict[str, Any]] = {}
+    row: Dict[str, Any] = {}
+    row_prefix = None
+    
+    async for prefix, event, value in ijson.parse_async(_AsyncByteReader(chunks)):
+        if event == "map_key":
+            if prefix == "":
+                if value == time_series_key:
+                    data[value] = rows
+            elif prefix == time_series_key:
+                row = rows[value] = {}
+                row_prefix = f"{time_series_key}.{value}."
+        elif event in ("string", "number"):
+            if row_prefix is not None and prefix.startswith(row_prefix):
+                name = prefix[len(row_prefix):]
+                if name in _ALPHA_VANTAGE_ROW_FIELDS:
+                    row[name] = value
+            elif prefix in _ALPHA_VANTAGE_MESSAGE_KEYS:
+                data[prefix] = value
+    
+    return data
+
+
+@dataclass(slots=True)
+class _BenchmarkColumns:
+    """Price series of one benchmark as parallel columns in date order."""
+    dates: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    returns: np.ndarray = field(init=False)
+    
+    def __post_init__(self) -> None:
+        # Simple daily returns; NaN where the previous close is not positive
+        with np.errstate(divide="ignore", invalid="ignore"):
+            previous = self.close[:-1]
+            self.returns = np.where(previous > 0, np.diff(self.close) / previous, np.nan)
+
+
 class BenchmarkService:
     """
     Service for fetching and managing benchmark data.
@@ -101,13 +305,60 @@ class BenchmarkService:
         )
     }
     
+    # Lowercased searchable fields per benchmark; NUL-separated so a query
+    # cannot match across the end of one field and the start of the next
+    _SEARCH_INDEX = {
+        symbol: "\0".join((info.symbol, info.name, info.description, info.category)).lower()
+        for symbol, info in SUPPORTED_BENCHMARKS.items()
+    }
+    
+    # Yahoo Finance lookback per period; unknown periods fall back to "max"
+    _PERIOD_LOOKBACK = {
+        "1d": timedelta(days=1),
+        "5d": timedelta(days=5),
+        "1mo": timedelta(days=30),
+        "3mo": timedelta(days=90),
+        "6mo": timedelta(days=180),
+        "1y": timedelta(days=365),
+        "2y": timedelta(days=730),
+        "5y": timedelta(days=1825),
+        "max": timedelta(days=3650)  # 10 years
+    }
+    
+    # Token bucket (capacity, refill per second) per provider
+    RATE_LIMIT_BUCKETS = {
+        "alpha_vantage": (5, 5 / 60),  # 5 calls per minute
+        "yahoo_finance": (100, 100.0)
+    }
+    
+    # Fixed window of the per-process fallback limit, in monotonic nanoseconds
+    LOCAL_RATE_LIMIT_WINDOW_NS = {
+        "alpha_vantage": 60_000_000_000,  # 5 calls per minute
+        "yahoo_finance": 1_000_000_000  # More lenient
+    }
+    
+    # Concurrent requests allowed per provider, shared by every instance
+    PROVIDER_CONCURRENCY = {
+        "alpha_vantage": 1,
+        "yahoo_finance": 8
+    }
+    _provider_semaphores = {
+        provider: asyncio.Semaphore(limit) for provider, limit in PROVIDER_CONCURRENCY.items()
+    }
+    
+    # HTTP client shared by every instance so connections are reused across requests
+    _shared_session: Optional[httpx.AsyncClient] = None
+    _shared_session_lock = asyncio.Lock()
+    
     def __init__(self, alpha_vantage_api_key: Optional[str] = None):
         self.alpha_vantage_api_key = alpha_vantage_api_key
         self.session: Optional[httpx.AsyncClient] = None
         self.redis_client: Optional[redis.Redis] = None
+        self._rate_limit_script: Optional[AsyncScript] = None
+        # Per-process fallback when Redis is unavailable
         self._rate_limits = {
-            "alpha_vantage": {"requests": 0, "reset_time": datetime.utcnow()},
-            "yahoo_finance": {"requests": 0, "reset_time": datetime.utcnow()}
+            "alpha_vantage": {"requests": 0, "reset_ns": time.monotonic_ns()},
+            "yahoo_finance": {"requests": 0, "reset_ns": time.monotonic_ns()}
         }
     
     async def __aenter__(self):
@@ -119,30 +370,53 @@ class BenchmarkService:
         """Async context manager exit."""
         await self._close_session()
     
+    @classmethod
+    async def _get_shared_session(cls) -> httpx.AsyncClient:
+        """
+        Get the shared HTTP client, creating it on first use.
+        
+        Returns:
+            Pooled HTTP/2 client for market data APIs
+        """
+        async with cls._shared_session_lock:
+            if cls._shared_session is None or cls._shared_session.is_closed:
+                cls._shared_session = httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                    timeout=httpx.Timeout(30.0),
+                    headers={
+                        "User-Agent": "Trading212-Portfolio-Dashboard/1.0",
+                        "Accept": "application/json"
+                    }
+                )
+            return cls._shared_session
+    
+    @classmethod
+    async def close_shared_session(cls):
+        """Close the shared HTTP client; called on application shutdown."""
+        async with cls._shared_session_lock:
+            if cls._shared_session is not None:
+                await cls._shared_session.aclose()
+                cls._shared_session = None
+    
     async def _init_session(self):
         """Initialize HTTP session and Redis connection."""
-        # Initialize HTTP client
-        self.session = httpx.AsyncClient(
-            timeout=httpx.Timeout(30.0),
-            headers={
-                "User-Agent": "Trading212-Portfolio-Dashboard/1.0",
-                "Accept": "application/json"
-            }
-        )
+        # Reuse the pooled HTTP client
+        self.session = await self._get_shared_session()
         
         # Initialize Redis connection
         try:
             self.redis_client = redis.from_url(settings.REDIS_URL)
             await self.redis_client.ping()
+            self._rate_limit_script = self.redis_client.register_script(_TOKEN_BUCKET_SCRIPT)
             logger.info("Redis connection established for benchmark service")
         except Exception as e:
             logger.warning(f"Redis connection failed: {e}")
             self.redis_client = None
+            self._rate_limit_script = None
     
     async def _close_session(self):
-        """Close HTTP session and Redis connection."""
-        if self.session:
-            await self.session.aclose()
+        """Close the Redis connection; the shared HTTP client stays open."""
         if self.redis_client:
             await self.redis_client.close()
     
@@ -159,6 +433,10 @@ class BenchmarkService:
         """
         Check if we're within rate limits for a provider.
         
+        With Redis available, a request is admitted by atomically taking a
+        token from the provider's bucket, so the limit holds across workers.
+        Otherwise a per-process counter is used.
+        
         Args:
             provider: API provider name
             
@@ -168,24 +446,27 @@ class BenchmarkService:
         if provider not in self._rate_limits:
             return True
         
+        if self._rate_limit_script is not None:
+            capacity, refill_per_sec = self.RATE_LIMIT_BUCKETS[provider]
+            try:
+                allowed = await self._rate_limit_script(
+                    keys=[f"rate_limit:benchmark:{provider}"],
+                    args=[capacity, refill_per_sec, 1, int(time.time() * 1000)]
+                )
+                return bool(allowed)
+            except Exception as e:
+                logger.warning(f"Shared rate limit check failed, using local limit: {e}")
+        
         rate_info = self._rate_limits[provider]
-        now = datetime.utcnow()
+        now = time.monotonic_ns()
         
-        # Reset counters if enough time has passed
-        if now >= rate_info["reset_time"]:
+        # Reset counters once the window has passed
+        if now >= rate_info["reset_ns"]:
             rate_info["requests"] = 0
-            if provider == "alpha_vantage":
-                rate_info["reset_time"] = now + timedelta(minutes=1)  # 5 calls per minute
-            elif provider == "yahoo_finance":
-                rate_info["reset_time"] = now + timedelta(seconds=1)  # More lenient
+            rate_info["reset_ns"] = now + self.LOCAL_RATE_LIMIT_WINDOW_NS[provider]
         
         # Check limits
-        if provider == "alpha_vantage" and rate_info["requests"] >= 5:
-            return False
-        elif provider == "yahoo_finance" and rate_info["requests"] >= 100:
-            return False
-        
-        return True
+        return rate_info["requests"] < self.RATE_LIMIT_BUCKETS[provider][0]
     
     async def _increment_rate_limit(self, provider: str):
         """Increment rate limit counter for a provider."""
@@ -206,21 +487,44 @@ class BenchmarkService:
             return None
         
         try:
-            cached_data = await self.redis_client.get(cache_key)
+            cached_data = await self.redis_client.get(f"{CACHE_FORMAT_PREFIX}{cache_key}")
             if cached_data:
-                return json.loads(cached_data)
+                return _unpack_cache_value(cached_data)
         except Exception as e:
             logger.warning(f"Cache read error: {e}")
         
         return None
     
-    async def _set_cached_data(self, cache_key: str, data: Dict[str, Any], ttl: int = 3600):
+    async def _get_cached_many(self, cache_keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get several entries from Redis cache in one round trip.
+        
+        Args:
+            cache_keys: Cache keys
+            
+        Returns:
+            Cached data per key, None where not found
+        """
+        if not self.redis_client or not cache_keys:
+            return [None] * len(cache_keys)
+        
+        try:
+            cached_values = await self.redis_client.mget(
+                [f"{CACHE_FORMAT_PREFIX}{cache_key}" for cache_key in cache_keys]
+            )
+            return [_unpack_cache_value(value) if value else None for value in cached_values]
+        except Exception as e:
+            logger.warning(f"Cache read error: {e}")
+        
+        return [None] * len(cache_keys)
+    
+    async def _set_cached_data(self, cache_key: str, data: Any, ttl: int = 3600):
         """
         Store data in Redis cache.
         
         Args:
             cache_key: Cache key
-            data: Data to cache
+            data: Data to cache; a dict or a pydantic model
             ttl: Time to live in seconds
         """
         if not self.redis_client:
@@ -228,13 +532,28 @@ class BenchmarkService:
         
         try:
             await self.redis_client.setex(
-                cache_key,
+                f"{CACHE_FORMAT_PREFIX}{cache_key}",
                 ttl,
-                json.dumps(data, default=str)
+                _pack_cache_value(data)
             )
         except Exception as e:
             logger.warning(f"Cache write error: {e}")
     
+    @staticmethod
+    def _alpha_vantage_series(period: str) -> Tuple[str, Optional[str], str]:
+        """
+        Alpha Vantage request for a period.
+        
+        Args:
+            period: Time period
+            
+        Returns:
+            Tuple of (API function, intraday interval or None, time series key)
+        """
+        if period in ("1d", "5d"):
+            return "TIME_SERIES_INTRADAY", "60min", "Time Series (60min)"
+        return "TIME_SERIES_DAILY_ADJUSTED", None, "Time Series (Daily)"
+    
     async def _fetch_alpha_vantage_data(
         self, 
         symbol: str, 
@@ -259,13 +578,7 @@ class BenchmarkService:
             return None
         
         try:
-            # Map period to Alpha Vantage function
-            if period in ["1d", "5d"]:
-                function = "TIME_SERIES_INTRADAY"
-                interval = "60min"
-            else:
-                function = "TIME_SERIES_DAILY_ADJUSTED"
-                interval = None
+            function, interval, time_series_key = self._alpha_vantage_series(period)
             
             params = {
                 "function": function,
@@ -277,30 +590,31 @@ class BenchmarkService:
             if interval:
                 params["interval"] = interval
             
-            response = await self.session.get(
+            # Stream the body; a full daily history is several MB of JSON
+            async with self._provider_semaphores["alpha_vantage"], self.session.stream(
+                "GET",
                 "https://www.alphavantage.co/query",
                 params=params
-            )
-            
-            await self._increment_rate_limit("alpha_vantage")
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Check for API errors
-                if "Error Message" in data:
-                    logger.error(f"Alpha Vantage error: {data['Error Message']}")
-                    return None
+            ) as response:
+                await self._increment_rate_limit("alpha_vantage")
                 
-                if "Note" in data:
-                    logger.warning(f"Alpha Vantage note: {data['Note']}")
+                if response.status_code != 200:
+                    logger.error(f"Alpha Vantage API error: {response.status_code}")
                     return None
                 
-                return data
-            else:
-                logger.error(f"Alpha Vantage API error: {response.status_code}")
+                data = await _parse_alpha_vantage_stream(response.aiter_bytes(), time_series_key)
+            
+            # Check for API errors
+            if "Error Message" in data:
+                logger.error(f"Alpha Vantage error: {data['Error Message']}")
                 return None
-                
+            
+            if "Note" in data:
+                logger.warning(f"Alpha Vantage note: {data['Note']}")
+                return None
+            
+            return data
+        
         except Exception as e:
             logger.error(f"Alpha Vantage request failed: {e}")
             return None
@@ -327,24 +641,7 @@ class BenchmarkService:
         try:
             # Calculate date range
             end_date = datetime.utcnow()
-            if period == "1d":
-                start_date = end_date - timedelta(days=1)
-            elif period == "5d":
-                start_date = end_date - timedelta(days=5)
-            elif period == "1mo":
-                start_date = end_date - timedelta(days=30)
-            elif period == "3mo":
-                start_date = end_date - timedelta(days=90)
-            elif period == "6mo":
-                start_date = end_date - timedelta(days=180)
-            elif period == "1y":
-                start_date = end_date - timedelta(days=365)
-            elif period == "2y":
-                start_date = end_date - timedelta(days=730)
-            elif period == "5y":
-                start_date = end_date - timedelta(days=1825)
-            else:  # max
-                start_date = end_date - timedelta(days=3650)  # 10 years
+            start_date = end_date - self._PERIOD_LOOKBACK.get(period, self._PERIOD_LOOKBACK["max"])
             
             # Convert to Unix timestamps
             start_timestamp = int(start_date.timestamp())
@@ -360,11 +657,13 @@ class BenchmarkService:
                 "events": "div,splits"
             }
             
-            response = await self.session.get(url, params=params)
+            async with self._provider_semaphores["yahoo_finance"]:
+                response = await self.session.get(url, params=params)
             await self._increment_rate_limit("yahoo_finance")
             
             if response.status_code == 200:
-                data = response.json()
+                # Chart payloads are large; parse the raw body with orjson
+                data = orjson.loads(response.content)
                 
                 # Check for errors
                 if "chart" not in data or not data["chart"]["result"]:
@@ -380,6 +679,120 @@ class BenchmarkService:
             logger.error(f"Yahoo Finance request failed: {e}")
             return None
     
+    @staticmethod
+    def _compute_stats(prices: np.ndarray, days: int) -> Tuple[float, float, float, float, float]:
+        """
+        Summary statistics of a price series in one vectorized pass.
+        
+        Args:
+            prices: Closing prices in date order
+            days: Calendar days between the first and last price
+        
+        Returns:
+            Total return %, annualized return %, annualized volatility %,
+            maximum drawdown % and Sharpe ratio
+        """
+        if prices.size < 2:
+            return 0.0, 0.0, 0.0, 0.0, 0.0
+        if not (prices > 0).all():
+            raise ValueError("Prices must be positive to compute returns")
+        
+        first, last = float(prices[0]), float(prices[-1])
+        total_return_pct = (last - first) / first * 100
+        
+        if days > 0:
+            years = days / 365.25
+            annualized_return_pct = ((last / first) ** (1 / years) - 1) * 100
+        else:
+            annualized_return_pct = total_return_pct
+        
+        # Daily returns standard deviation, annualized
+        returns = np.diff(prices) / prices[:-1]
+        volatility = float(returns.std() * np.sqrt(TRADING_DAYS_PER_YEAR) * 100)
+        
+        # Largest fall from the running peak
+        peaks = np.maximum.accumulate(prices)
+        max_drawdown_pct = float(((peaks - prices) / peaks).max()) * 100
+        
+        # Sharpe ratio assuming a 2% risk-free rate
+        risk_free_rate = 2.0
+        if volatility > 0:
+            sharpe_ratio = (annualized_return_pct - risk_free_rate) / volatility
+        else:
+            sharpe_ratio = 0.0
+        
+        return total_return_pct, annualized_return_pct, volatility, max_drawdown_pct, sharpe_ratio
+    
+    def _finalize(
+        self,
+        columns: _BenchmarkColumns,
+        symbol: str,
+        period: str
+    ) -> Optional[BenchmarkData]:
+        """
+        Build BenchmarkData from parsed price columns.
+        
+        Args:
+            columns: Parsed price series in date order
+            symbol: Benchmark symbol
+            period: Time period
+            
+        Returns:
+            BenchmarkData model or None if there are no data points
+        """
+        if not columns.close.size:
+            logger.error("No valid data points found")
+            return None
+        
+        dates = pd.DatetimeIndex(columns.dates).to_pydatetime()
+        days = int((columns.dates[-1] - columns.dates[0]) // np.timedelta64(1, "D"))
+        
+        # Calculate summary statistics
+        (
+            total_return_pct, annualized_return_pct, volatility,
+            max_drawdown_pct, sharpe_ratio
+        ) = self._compute_stats(columns.close, days)
+        
+        # First point has no previous price to return from
+        returns_pct: List[Optional[float]] = [None]
+        returns_pct.extend(
+            None if np.isnan(value) else value
+            for value in (columns.returns * 100).tolist()
+        )
+        volumes = [
+            None if np.isnan(value) else int(value)
+            for value in columns.volume.tolist()
+        ]
+        data_points = [
+            BenchmarkDataPoint(
+                date=date_obj,
+                price=price,
+                return_pct=return_pct,
+                volume=volume
+            )
+            for date_obj, price, return_pct, volume in zip(
+                dates, columns.close.tolist(), returns_pct, volumes
+            )
+        ]
+        
+        # Get benchmark info
+        benchmark_info = self.SUPPORTED_BENCHMARKS.get(symbol)
+        benchmark_name = benchmark_info.name if benchmark_info else symbol
+        
+        return BenchmarkData(
+            symbol=symbol,
+            name=benchmark_name,
+            period=period,
+            start_date=dates[0],
+            end_date=dates[-1],
+            data_points=data_points,
+            total_return_pct=Decimal(repr(total_return_pct)),
+            annualized_return_pct=Decimal(repr(annualized_return_pct)),
+            volatility=Decimal(repr(volatility)),
+            max_drawdown=Decimal(repr(max_drawdown_pct)),
+            sharpe_ratio=Decimal(repr(sharpe_ratio))
+        )
+    
     def _transform_alpha_vantage_data(
         self, 
         raw_data: Dict[str, Any], 
@@ -398,111 +811,39 @@ class BenchmarkService:
             BenchmarkData model or None if transformation failed
         """
         try:
-            # Find the time series data
-            time_series_key = None
-            for key in raw_data.keys():
-                if "Time Series" in key:
-                    time_series_key = key
-                    break
-            
-            if not time_series_key:
+            # The series key follows from the request made for this period
+            time_series = raw_data.get(self._alpha_vantage_series(period)[2])
+            if time_series is None:
                 logger.error("No time series data found in Alpha Vantage response")
                 return None
             
-            time_series = raw_data[time_series_key]
-            
-            # Transform data points
-            data_points = []
-            prices = []
-            dates = []
-            
-            for date_str, values in sorted(time_series.items()):
-                try:
-                    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                    close_price = Decimal(str(values.get("4. close", values.get("close", 0))))
-                    volume = int(values.get("6. volume", values.get("volume", 0)))
-                    
-                    data_points.append(BenchmarkDataPoint(
-                        date=date_obj,
-                        price=close_price,
-                        volume=volume
-                    ))
-                    
-                    prices.append(float(close_price))
-                    dates.append(date_obj)
-                    
-                except (ValueError, KeyError) as e:
-                    logger.warning(f"Skipping invalid data point: {e}")
-                    continue
-            
-            if not data_points:
-                logger.error("No valid data points found")
-                return None
-            
-            # Calculate returns for each data point
-            for i in range(1, len(data_points)):
-                prev_price = data_points[i-1].price
-                curr_price = data_points[i].price
-                if prev_price > 0:
-                    return_pct = (curr_price - prev_price) / prev_price * 100
-                    data_points[i].return_pct = return_pct
-            
-            # Calculate summary statistics
-            if len(prices) > 1:
-                total_return_pct = (prices[-1] - prices[0]) / prices[0] * 100
-                
-                # Calculate annualized return
-                days = (dates[-1] - dates[0]).days
-                if days > 0:
-                    years = days / 365.25
-                    annualized_return_pct = ((prices[-1] / prices[0]) ** (1/years) - 1) * 100
-                else:
-                    annualized_return_pct = total_return_pct
-                
-                # Calculate volatility (daily returns standard deviation)
-                returns = [(prices[i] - prices[i-1]) / prices[i-1] for i in range(1, len(prices))]
-                volatility = np.std(returns) * np.sqrt(252) * 100  # Annualized
-                
-                # Calculate maximum drawdown
-                peak = prices[0]
-                max_drawdown = 0
-                for price in prices:
-                    if price > peak:
-                        peak = price
-                    drawdown = (peak - price) / peak
-                    if drawdown > max_drawdown:
-                        max_drawdown = drawdown
-                max_drawdown_pct = max_drawdown * 100
-                
-                # Calculate Sharpe ratio (assuming 2% risk-free rate)
-                risk_free_rate = 2.0
-                if volatility > 0:
-                    sharpe_ratio = (annualized_return_pct - risk_free_rate) / volatility
-                else:
-                    sharpe_ratio = 0
-            else:
-                total_return_pct = 0
-                annualized_return_pct = 0
-                volatility = 0
-                max_drawdown_pct = 0
-                sharpe_ratio = 0
-            
-            # Get benchmark info
-            benchmark_info = self.SUPPORTED_BENCHMARKS.get(symbol)
-            benchmark_name = benchmark_info.name if benchmark_info else symbol
-            
-            return BenchmarkData(
-                symbol=symbol,
-                name=benchmark_name,
-                period=period,
-                start_date=dates[0] if dates else datetime.utcnow(),
-                end_date=dates[-1] if dates else datetime.utcnow(),
-                data_points=data_points,
-                total_return_pct=Decimal(str(total_return_pct)),
-                annualized_return_pct=Decimal(str(annualized_return_pct)),
-                volatility=Decimal(str(volatility)),
-                max_drawdown=Decimal(str(max_drawdown_pct)),
-                sharpe_ratio=Decimal(str(sharpe_ratio))
+            # Parse every row at once; unparseable values become NaT/NaN
+            rows = list(time_series.values())
+            dates = pd.to_datetime(
+                list(time_series.keys()), format="%Y-%m-%d", errors="coerce", cache=True
+            ).to_numpy(dtype="datetime64[ns]")
+            closes = pd.to_numeric(
+                [values.get("4. close", values.get("close", 0)) for values in rows], errors="coerce"
+            ).astype(np.float64)
+            volumes = pd.to_numeric(
+                [values.get("6. volume", values.get("volume", 0)) for values in rows], errors="coerce"
+            ).astype(np.float64)
+            
+            valid = ~(np.isnat(dates) | np.isnan(closes) | np.isnan(volumes))
+            if not valid.all():
+                logger.warning(f"Skipping {int((~valid).sum())} invalid data points")
+            
+            # Date order; the response is keyed newest first
+            order = np.argsort(dates[valid], kind="stable")
+            
+            return self._finalize(
+                _BenchmarkColumns(
+                    dates=dates[valid][order],
+                    close=closes[valid][order],
+                    volume=volumes[valid][order]
+                ),
+                symbol,
+                period
             )
             
         except Exception as e:
@@ -529,109 +870,50 @@ class BenchmarkService:
         try:
             chart_data = raw_data["chart"]["result"][0]
             
-            # Extract timestamps and prices
+            # Extract timestamps and prices; missing values become NaN
             timestamps = chart_data["timestamp"]
             indicators = chart_data["indicators"]["quote"][0]
-            closes = indicators["close"]
-            volumes = indicators.get("volume", [None] * len(closes))
-            
-            # Transform data points
-            data_points = []
-            prices = []
-            dates = []
-            
-            for i, (timestamp, close, volume) in enumerate(zip(timestamps, closes, volumes)):
-                if close is None:
-                    continue
-                
-                try:
-                    date_obj = datetime.fromtimestamp(timestamp)
-                    close_price = Decimal(str(close))
-                    vol = int(volume) if volume is not None else None
-                    
-                    data_points.append(BenchmarkDataPoint(
-                        date=date_obj,
-                        price=close_price,
-                        volume=vol
-                    ))
-                    
-                    prices.append(float(close_price))
-                    dates.append(date_obj)
-                    
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"Skipping invalid data point: {e}")
-                    continue
-            
-            if not data_points:
-                logger.error("No valid data points found")
-                return None
-            
-            # Calculate returns for each data point
-            for i in range(1, len(data_points)):
-                prev_price = data_points[i-1].price
-                curr_price = data_points[i].price
-                if prev_price > 0:
-                    return_pct = (curr_price - prev_price) / prev_price * 100
-                    data_points[i].return_pct = return_pct
-            
-            # Calculate summary statistics (same logic as Alpha Vantage)
-            if len(prices) > 1:
-                total_return_pct = (prices[-1] - prices[0]) / prices[0] * 100
-                
-                days = (dates[-1] - dates[0]).days
-                if days > 0:
-                    years = days / 365.25
-                    annualized_return_pct = ((prices[-1] / prices[0]) ** (1/years) - 1) * 100
-                else:
-                    annualized_return_pct = total_return_pct
-                
-                returns = [(prices[i] - prices[i-1]) / prices[i-1] for i in range(1, len(prices))]
-                volatility = np.std(returns) * np.sqrt(252) * 100
-                
-                peak = prices[0]
-                max_drawdown = 0
-                for price in prices:
-                    if price > peak:
-                        peak = price
-                    drawdown = (peak - price) / peak
-                    if drawdown > max_drawdown:
-                        max_drawdown = drawdown
-                max_drawdown_pct = max_drawdown * 100
-                
-                risk_free_rate = 2.0
-                if volatility > 0:
-                    sharpe_ratio = (annualized_return_pct - risk_free_rate) / volatility
-                else:
-                    sharpe_ratio = 0
-            else:
-                total_return_pct = 0
-                annualized_return_pct = 0
-                volatility = 0
-                max_drawdown_pct = 0
-                sharpe_ratio = 0
-            
-            # Get benchmark info
-            benchmark_info = self.SUPPORTED_BENCHMARKS.get(symbol)
-            benchmark_name = benchmark_info.name if benchmark_info else symbol
-            
-            return BenchmarkData(
-                symbol=symbol,
-                name=benchmark_name,
-                period=period,
-                start_date=dates[0] if dates else datetime.utcnow(),
-                end_date=dates[-1] if dates else datetime.utcnow(),
-                data_points=data_points,
-                total_return_pct=Decimal(str(total_return_pct)),
-                annualized_return_pct=Decimal(str(annualized_return_pct)),
-                volatility=Decimal(str(volatility)),
-                max_drawdown=Decimal(str(max_drawdown_pct)),
-                sharpe_ratio=Decimal(str(sharpe_ratio))
+            raw_closes = indicators["close"]
+            raw_volumes = indicators.get("volume") or [None] * len(raw_closes)
+            count = min(len(timestamps), len(raw_closes), len(raw_volumes))
+            closes = np.array(raw_closes[:count], dtype=np.float64)
+            volumes = np.array(raw_volumes[:count], dtype=np.float64)
+            
+            # Rows without a closing price are skipped
+            valid = ~np.isnan(closes)
+            
+            return self._finalize(
+                _BenchmarkColumns(
+                    dates=np.array(timestamps[:count], dtype="datetime64[s]")[valid].astype("datetime64[ns]"),
+                    close=closes[valid],
+                    volume=volumes[valid]
+                ),
+                symbol,
+                period
             )
             
         except Exception as e:
             logger.error(f"Failed to transform Yahoo Finance data: {e}")
             return None
     
+    async def _cache_benchmark_data(self, cache_key: str, benchmark_data: BenchmarkData, period: str):
+        """
+        Store fetched benchmark data in Redis and the in-process cache.
+        
+        Args:
+            cache_key: Cache key
+            benchmark_data: Data to cache
+            period: Time period, which sets the TTL
+        """
+        cache_ttl = 3600  # 1 hour for daily data
+        if period in ["1d", "5d"]:
+            cache_ttl = 300  # 5 minutes for short-term data
+        elif period in ["1y", "2y", "5y", "max"]:
+            cache_ttl = 7200  # 2 hours for long-term data
+        
+        await self._set_cached_data(cache_key, benchmark_data, cache_ttl)
+        _benchmark_l1_cache.put(cache_key, benchmark_data, min(cache_ttl, BENCHMARK_L1_TTL))
+    
     async def fetch_benchmark_data(
         self, 
         symbol: str, 
@@ -649,13 +931,51 @@ class BenchmarkService:
         Returns:
             BenchmarkData model or None if failed
         """
-        # Check cache first
         cache_key = f"benchmark:{symbol}:{period}"
+        
+        # Concurrent identical requests share one fetch. It runs in its own task
+        # so cancelling any caller, including the one that started it, leaves
+        # the fetch running for the others.
+        flight_key = (cache_key, use_cache)
+        task = _inflight_fetches.get(flight_key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_benchmark_data(symbol, period, use_cache, cache_key))
+            _inflight_fetches[flight_key] = task
+            task.add_done_callback(lambda done: _finish_inflight_fetch(flight_key, done))
+        
+        return await asyncio.shield(task)
+    
+    async def _fetch_benchmark_data(
+        self,
+        symbol: str,
+        period: str,
+        use_cache: bool,
+        cache_key: str
+    ) -> Optional[BenchmarkData]:
+        """
+        Fetch benchmark data from the caches or APIs; see ``fetch_benchmark_data``.
+        
+        Args:
+            symbol: Benchmark symbol
+            period: Time period
+            use_cache: Whether to use cached data
+            cache_key: Cache key for the symbol and period
+            
+        Returns:
+            BenchmarkData model or None if failed
+        """
+        # Check the in-process cache, then Redis
         if use_cache:
+            benchmark_data = _benchmark_l1_cache.get(cache_key)
+            if benchmark_data is not None:
+                return benchmark_data
+            
             cached_data = await self._get_cached_data(cache_key)
             if cached_data:
                 try:
-                    return BenchmarkData(**cached_data)
+                    benchmark_data = BenchmarkData(**cached_data)
+                    _benchmark_l1_cache.put(cache_key, benchmark_data, BENCHMARK_L1_TTL)
+                    return benchmark_data
                 except ValidationError as e:
                     logger.warning(f"Invalid cached data: {e}")
         
@@ -676,13 +996,7 @@ class BenchmarkService:
         
         # Cache successful result
         if benchmark_data and use_cache:
-            cache_ttl = 3600  # 1 hour for daily data
-            if period in ["1d", "5d"]:
-                cache_ttl = 300  # 5 minutes for short-term data
-            elif period in ["1y", "2y", "5y", "max"]:
-                cache_ttl = 7200  # 2 hours for long-term data
-            
-            await self._set_cached_data(cache_key, benchmark_data.dict(), cache_ttl)
+            await self._cache_benchmark_data(cache_key, benchmark_data, period)
         
         if benchmark_data:
             logger.info(f"Successfully fetched benchmark data for {symbol} ({period})")
@@ -708,22 +1022,47 @@ class BenchmarkService:
         Returns:
             Dictionary mapping symbols to BenchmarkData
         """
+        benchmark_data = {}
+        cache_keys = {symbol: f"benchmark:{symbol}:{period}" for symbol in symbols}
+        missing = list(cache_keys)
+        
+        if use_cache:
+            # In-process hits first, then one MGET for the rest
+            for symbol in missing:
+                cached = _benchmark_l1_cache.get(cache_keys[symbol])
+                if cached is not None:
+                    benchmark_data[symbol] = cached
+            missing = [symbol for symbol in missing if symbol not in benchmark_data]
+            
+            cached_values = await self._get_cached_many([cache_keys[symbol] for symbol in missing])
+            for symbol, cached_data in zip(missing, cached_values):
+                if not cached_data:
+                    continue
+                try:
+                    benchmark_data[symbol] = BenchmarkData(**cached_data)
+                    _benchmark_l1_cache.put(cache_keys[symbol], benchmark_data[symbol], BENCHMARK_L1_TTL)
+                except ValidationError as e:
+                    logger.warning(f"Invalid cached data: {e}")
+            missing = [symbol for symbol in missing if symbol not in benchmark_data]
+        
+        # Cache was already checked above; only misses go to the APIs
         tasks = [
-            self.fetch_benchmark_data(symbol, period, use_cache)
-            for symbol in symbols
+            self.fetch_benchmark_data(symbol, period, use_cache=False)
+            for symbol in missing
         ]
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        benchmark_data = {}
-        for symbol, result in zip(symbols, results):
-            if isinstance(result, Exception):
+        for symbol, result in zip(missing, results):
+            if isinstance(result, BaseException):
                 logger.error(f"Failed to fetch {symbol}: {result}")
                 benchmark_data[symbol] = None
             else:
                 benchmark_data[symbol] = result
+                if result and use_cache:
+                    await self._cache_benchmark_data(cache_keys[symbol], result, period)
         
-        return benchmark_data
+        return {symbol: benchmark_data.get(symbol) for symbol in symbols}
     
     async def get_benchmark_info(self, symbol: str) -> Optional[BenchmarkInfo]:
         """
@@ -748,16 +1087,11 @@ class BenchmarkService:
             List of matching BenchmarkInfo objects
         """
         query_lower = query.lower()
-        matches = []
-        
-        for benchmark in self.SUPPORTED_BENCHMARKS.values():
-            if (query_lower in benchmark.symbol.lower() or 
-                query_lower in benchmark.name.lower() or 
-                query_lower in benchmark.description.lower() or
-                query_lower in benchmark.category.lower()):
-                matches.append(benchmark)
-        
-        return matches
+        return [
+            self.SUPPORTED_BENCHMARKS[symbol]
+            for symbol, search_text in self._SEARCH_INDEX.items()
+            if query_lower in search_text
+        ]
     
     async def clear_benchmark_cache(self, symbol: Optional[str] = None):
         """
@@ -766,21 +1100,34 @@ class BenchmarkService:
         Args:
             symbol: Specific symbol to clear, or None to clear all
         """
+        _benchmark_l1_cache.invalidate(f"benchmark:{symbol}:" if symbol else "benchmark:")
+        
         if not self.redis_client:
             return
         
         try:
             if symbol:
                 # Clear specific symbol
-                pattern = f"benchmark:{symbol}:*"
+                pattern = f"{CACHE_FORMAT_PREFIX}benchmark:{symbol}:*"
             else:
                 # Clear all benchmark data
-                pattern = "benchmark:*"
-            
-            keys = await self.redis_client.keys(pattern)
-            if keys:
-                await self.redis_client.delete(*keys)
-                logger.info(f"Cleared {len(keys)} benchmark cache entries")
+                pattern = f"{CACHE_FORMAT_PREFIX}benchmark:*"
+            
+            # SCAN and UNLINK in batches so the clear never blocks Redis
+            cleared = 0
+            batch = []
+            async for key in self.redis_client.scan_iter(match=pattern, count=CACHE_CLEAR_BATCH_SIZE):
+                batch.append(key)
+                if len(batch) >= CACHE_CLEAR_BATCH_SIZE:
+                    await self.redis_client.unlink(*batch)
+                    cleared += len(batch)
+                    batch = []
+            if batch:
+                await self.redis_client.unlink(*batch)
+                cleared += len(batch)
+            
+            if cleared:
+                logger.info(f"Cleared {cleared} benchmark cache entries")
         except Exception as e:
             logger.error(f"Failed to clear benchmark cache: {e}")
     
@@ -1108,6 +1455,82 @@ class BenchmarkService:
             entity_name=pie.name
         )
     
+    async def compare_pies_to_benchmark(
+        self,
+        pies: List[Pie],
+        benchmark_symbol: str,
+        period: str = "1y"
+    ) -> List[BenchmarkComparison]:
+        """
+        Compare several pies to a benchmark in vectorized passes.
+        
+        Each pie is aligned with the benchmark on its own, by calendar day;
+        pies with the same overlapping dates are compared together. Pies
+        without enough overlap, or whose comparison fails, are skipped.
+        
+        Args:
+            pies: Pie objects
+            benchmark_symbol: Benchmark symbol (e.g., SPY)
+            period: Time period for comparison
+            
+        Returns:
+            BenchmarkComparison per comparable pie, in input order
+        """
+        if not pies:
+            return []
+        
+        # Fetch benchmark data once for every pie
+        benchmark_data = await self.fetch_benchmark_data(benchmark_symbol, period)
+        if not benchmark_data:
+            raise BenchmarkAPIError(f"Failed to fetch benchmark data for {benchmark_symbol}")
+        
+        benchmark_returns = self._daily_returns(self._calculate_returns_series(benchmark_data.data_points))
+        
+        # Group pies by the dates they share with the benchmark
+        groups: Dict[bytes, Tuple[pd.DatetimeIndex, List[Tuple[int, Pie, np.ndarray]]]] = {}
+        for position, pie in enumerate(pies):
+            pie_returns = self._daily_returns(self._calculate_pie_returns_series(pie, period))
+            common_dates = pie_returns.index.intersection(benchmark_returns.index)
+            if len(common_dates) < 10:  # Need at least 10 data points
+                logger.warning(f"Insufficient overlapping data to compare pie {pie.id}")
+                continue
+            groups.setdefault(common_dates.asi8.tobytes(), (common_dates, []))[1].append(
+                (position, pie, pie_returns.loc[common_dates].to_numpy(dtype=float))
+            )
+        
+        comparisons: Dict[int, BenchmarkComparison] = {}
+        for common_dates, members in groups.values():
+            benchmark_values = benchmark_returns.loc[common_dates].to_numpy(dtype=float)
+            try:
+                batch = BenchmarkAnalysis.compute_batch(
+                    entity_returns=np.vstack([values for _, _, values in members]),
+                    benchmark_returns=benchmark_values,
+                    entities=[("pie", pie.id, pie.name) for _, pie, _ in members],
+                    benchmark=benchmark_data
+                )
+                comparisons.update(zip((position for position, _, _ in members), batch))
+            except Exception as e:
+                # One bad pie must not drop the rest; compare them one by one
+                logger.warning(f"Batch pie comparison failed, comparing individually: {e}")
+                for position, pie, values in members:
+                    try:
+                        comparisons[position] = BenchmarkAnalysis.compute_batch(
+                            entity_returns=values,
+                            benchmark_returns=benchmark_values,
+                            entities=[("pie", pie.id, pie.name)],
+                            benchmark=benchmark_data
+                        )[0]
+                    except Exception as e:
+                        logger.warning(f"Failed to compare pie {pie.id}: {e}")
+        
+        return [comparisons[position] for position in sorted(comparisons)]
+    
+    @staticmethod
+    def _daily_returns(returns: pd.Series) -> pd.Series:
+        """Key a returns series by calendar day so series built at different times align."""
+        daily = returns.set_axis(pd.DatetimeIndex(returns.index).normalize())
+        return daily[~daily.index.duplicated(keep="last")]
+    
     async def compare_multiple_entities_to_benchmark(
         self,
         portfolio: Portfolio,
@@ -1136,14 +1559,12 @@ class BenchmarkService:
             # Compare pies if requested
             pie_comparisons = []
             if include_pies:
-                for pie in portfolio.pies:
-                    try:
-                        pie_comparison = await self.compare_pie_to_benchmark(
-                            pie, benchmark_symbol, period
-                        )
-                        pie_comparisons.append(pie_comparison)
-                    except Exception as e:
-                        logger.warning(f"Failed to compare pie {pie.name}: {e}")
+                try:
+                    pie_comparisons = await self.compare_pies_to_benchmark(
+                        portfolio.pies, benchmark_symbol, period
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to compare pies: {e}")
             
             # Calculate summary statistics
             summary_stats = {
@@ -1206,12 +1627,7 @@ class BenchmarkService:
         bond_weight = 0
         reit_weight = 0
         
-        all_positions = []
-        for pie in portfolio.pies:
-            all_positions.extend(pie.positions)
-        all_positions.extend(portfolio.individual_positions)
-        
-        for position in all_positions:
+        for position in portfolio.iter_positions():
             weight = float(position.market_value) / total_value
             
             # Simplified sector/region classification
@@ -1370,7 +1786,7 @@ class BenchmarkService:
             
             # Cache the custom benchmark
             cache_key = f"custom_benchmark:{custom_benchmark.id}"
-            await self._set_cached_data(cache_key, custom_benchmark.dict(), ttl=86400)  # 24 hours
+            await self._set_cached_data(cache_key, custom_benchmark, ttl=86400)  # 24 hours
             
             logger.info(f"Created custom benchmark: {name}")
             return custom_benchmark
@@ -1425,12 +1841,12 @@ class BenchmarkService:
             # Calculate weighted returns for each date
             custom_data_points = []
             for date in all_dates:
-                weighted_price = Decimal('0')
-                total_weight = Decimal('0')
+                weighted_price = 0.0
+                total_weight = 0.0
                 
                 for component in custom_benchmark.components:
                     symbol = component['symbol']
-                    weight = Decimal(str(component['weight'])) / 100  # Convert percentage to decimal
+                    weight = float(component['weight']) / 100  # Convert percentage to fraction
                     
                     if symbol in component_data:
                         # Find price for this date
@@ -1456,43 +1872,15 @@ class BenchmarkService:
                     custom_data_points[i].return_pct = return_pct
             
             # Calculate summary statistics
-            if len(custom_data_points) > 1:
-                prices = [float(point.price) for point in custom_data_points]
-                total_return_pct = (prices[-1] - prices[0]) / prices[0] * 100
-                
-                days = (all_dates[-1] - all_dates[0]).days
-                if days > 0:
-                    years = days / 365.25
-                    annualized_return_pct = ((prices[-1] / prices[0]) ** (1/years) - 1) * 100
-                else:
-                    annualized_return_pct = total_return_pct
-                
-                returns = [(prices[i] - prices[i-1]) / prices[i-1] for i in range(1, len(prices))]
-                volatility = np.std(returns) * np.sqrt(252) * 100
-                
-                # Calculate maximum drawdown
-                peak = prices[0]
-                max_drawdown = 0
-                for price in prices:
-                    if price > peak:
-                        peak = price
-                    drawdown = (peak - price) / peak
-                    if drawdown > max_drawdown:
-                        max_drawdown = drawdown
-                max_drawdown_pct = max_drawdown * 100
-                
-                # Calculate Sharpe ratio
-                risk_free_rate = 2.0
-                if volatility > 0:
-                    sharpe_ratio = (annualized_return_pct - risk_free_rate) / volatility
-                else:
-                    sharpe_ratio = 0
-            else:
-                total_return_pct = 0
-                annualized_return_pct = 0
-                volatility = 0
-                max_drawdown_pct = 0
-                sharpe_ratio = 0
+            prices = np.fromiter(
+                (point.price for point in custom_data_points),
+                dtype=np.float64,
+                count=len(custom_data_points)
+            )
+            (
+                total_return_pct, annualized_return_pct, volatility,
+                max_drawdown_pct, sharpe_ratio
+            ) = self._compute_stats(prices, (all_dates[-1] - all_dates[0]).days)
             
             return BenchmarkData(
                 symbol=custom_benchmark.id,
@@ -1501,11 +1889,11 @@ class BenchmarkService:
                 start_date=all_dates[0] if all_dates else datetime.utcnow(),
                 end_date=all_dates[-1] if all_dates else datetime.utcnow(),
                 data_points=custom_data_points,
-                total_return_pct=Decimal(str(total_return_pct)),
-                annualized_return_pct=Decimal(str(annualized_return_pct)),
-                volatility=Decimal(str(volatility)),
-                max_drawdown=Decimal(str(max_drawdown_pct)),
-                sharpe_ratio=Decimal(str(sharpe_ratio))
+                total_return_pct=Decimal(repr(total_return_pct)),
+                annualized_return_pct=Decimal(repr(annualized_return_pct)),
+                volatility=Decimal(repr(volatility)),
+                max_drawdown=Decimal(repr(max_drawdown_pct)),
+                sharpe_ratio=Decimal(repr(sharpe_ratio))
             )
             
         except Exception as e:
@@ -2,20 +2,99 @@
 Financial calculations service for portfolio and pie metrics.
 """
 
+import math
+import threading
 import pandas as pd
 import numpy as np
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import List, Dict, Optional, Tuple, Any
 from app.models.portfolio import Portfolio, PortfolioMetrics
 from app.models.pie import Pie, PieMetrics
 from app.models.position import Position
+from app.models.position_batch import AllocationBreakdown, PositionBatch, sum_by_group, top_k_indices, top_positions
 from app.models.historical import HistoricalData, PricePoint
+from app.models.money import from_micros, to_micros
 from app.models.risk import RiskMetrics, RiskCategory
 from app.models.benchmark import BenchmarkComparison
 from app.models.dividend import Dividend
 
 
+# Entries kept per metrics cache before the least recently used is evicted
+METRICS_CACHE_SIZE = 128
+
+
+class _MetricsCache:
+    """Thread-safe LRU of derived metrics keyed by (owner id, ...) tuples."""
+    
+    def __init__(self, maxsize: int):
+        """Initialize an empty cache holding at most ``maxsize`` entries."""
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[Any, ...], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Tuple[Any, ...]) -> Optional[Any]:
+        """Return the cached value for a key, marking it most recently used."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+    
+    def put(self, key: Tuple[Any, ...], value: Any) -> None:
+        """Store a value, evicting the least recently used entries beyond the limit."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, owner_id: str) -> None:
+        """Drop every entry whose key starts with ``owner_id``."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == owner_id]:
+                del self._entries[key]
+
+
+# Position-derived metrics shared by all service instances, keyed by
+# (portfolio or pie id, holdings data revision, ...)
+_portfolio_metrics_cache = _MetricsCache(METRICS_CACHE_SIZE)
+_pie_metrics_cache = _MetricsCache(METRICS_CACHE_SIZE)
+
+
+@dataclass(slots=True)
+class PortfolioAggregates:
+    """Position-level aggregates produced by one pass over a position batch."""
+    total_positions: int = 0
+    sector_allocation: AllocationBreakdown = field(default_factory=AllocationBreakdown)
+    industry_allocation: AllocationBreakdown = field(default_factory=AllocationBreakdown)
+    country_allocation: AllocationBreakdown = field(default_factory=AllocationBreakdown)
+    asset_type_allocation: AllocationBreakdown = field(default_factory=AllocationBreakdown)
+    diversification_score: Decimal = Decimal('0')
+    concentration_risk: Decimal = Decimal('0')
+    top_10_weight: Decimal = Decimal('0')
+    
+    def allocations(self) -> Dict[str, Dict[str, Decimal]]:
+        """Allocation fields shared by PortfolioMetrics and PieMetrics, largest first."""
+        return {
+            'sector_allocation': self.sector_allocation.to_dict(),
+            'industry_allocation': self.industry_allocation.to_dict(),
+            'country_allocation': self.country_allocation.to_dict(),
+            'asset_type_allocation': self.asset_type_allocation.to_dict()
+        }
+    
+    def metrics_fields(self) -> Dict[str, Any]:
+        """Allocation and diversification fields of PortfolioMetrics."""
+        return {
+            **self.allocations(),
+            'diversification_score': self.diversification_score,
+            'concentration_risk': self.concentration_risk,
+            'top_10_weight': self.top_10_weight
+        }
+
+
 class CalculationsService:
     """Service for financial calculations and metrics."""
     
@@ -51,14 +130,8 @@ class CalculationsService:
         # Dividend calculations
         dividend_metrics = self._calculate_dividend_metrics(dividends, total_value) if dividends else {}
         
-        # Allocation calculations
-        sector_allocation = self._calculate_sector_allocation(positions)
-        industry_allocation = self._calculate_industry_allocation(positions)
-        country_allocation = self._calculate_country_allocation(positions)
-        asset_type_allocation = self._calculate_asset_type_allocation(positions)
-        
-        # Diversification calculations
-        diversification_score, concentration_risk, top_10_weight = self._calculate_diversification_metrics(positions)
+        # Allocation and diversification calculations over one position batch
+        aggregates = self.compute_portfolio_aggregates(PositionBatch.from_positions(positions))
         
         # Risk calculations (if historical data available)
         risk_metrics = None
@@ -88,16 +161,110 @@ class CalculationsService:
             reinvestment_rate=dividend_metrics.get('reinvestment_rate', Decimal('0')),
             trailing_12m_dividends=dividend_metrics.get('trailing_12m_dividends', Decimal('0')),
             dividend_growth_rate=dividend_metrics.get('dividend_growth_rate', Decimal('0')),
-            sector_allocation=sector_allocation,
-            industry_allocation=industry_allocation,
-            country_allocation=country_allocation,
-            asset_type_allocation=asset_type_allocation,
-            diversification_score=diversification_score,
-            concentration_risk=concentration_risk,
-            top_10_weight=top_10_weight,
+            **aggregates.metrics_fields(),
             risk_metrics=risk_metrics
         )
     
+    def get_portfolio_metrics(self, portfolio: Portfolio) -> PortfolioMetrics:
+        """
+        Position-derived metrics for a portfolio, reused while its holdings are unchanged.
+        
+        The returned metrics are shared between callers and must be treated
+        as read-only.
+        
+        Args:
+            portfolio: Portfolio to calculate metrics for
+            
+        Returns:
+            PortfolioMetrics calculated from the portfolio's positions
+        """
+        key = (portfolio.id, portfolio.data_revision)
+        metrics = _portfolio_metrics_cache.get(key)
+        if metrics is None:
+            metrics = self.calculate_portfolio_metrics(portfolio.all_positions)
+            _portfolio_metrics_cache.put(key, metrics)
+        return metrics
+    
+    @staticmethod
+    def invalidate_metrics(portfolio_id: str) -> None:
+        """
+        Drop cached metrics for a portfolio, e.g. after a sync.
+        
+        Args:
+            portfolio_id: Portfolio identifier
+        """
+        _portfolio_metrics_cache.invalidate(portfolio_id)
+    
+    def get_pie_metrics(self, pie: Pie, portfolio_total_value: Decimal) -> PieMetrics:
+        """
+        Position-derived metrics for a pie, reused while its holdings are unchanged.
+        
+        Unchanged pies are skipped on a portfolio refresh. The returned
+        metrics are shared between callers and must be treated as read-only.
+        
+        Args:
+            pie: Pie to calculate metrics for
+            portfolio_total_value: Total portfolio value for weight and contribution
+            
+        Returns:
+            PieMetrics calculated from the pie's positions
+        """
+        key = (pie.id, pie.data_revision, portfolio_total_value)
+        metrics = _pie_metrics_cache.get(key)
+        if metrics is None:
+            metrics = self.calculate_pie_metrics(pie, portfolio_total_value)
+            _pie_metrics_cache.put(key, metrics)
+        return metrics
+    
+    @staticmethod
+    def invalidate_pie_metrics(pie_id: str) -> None:
+        """
+        Drop cached metrics for a pie, e.g. after a rebalance.
+        
+        Args:
+            pie_id: Pie identifier
+        """
+        _pie_metrics_cache.invalidate(pie_id)
+    
+    def compute_portfolio_aggregates(self, batch: PositionBatch) -> PortfolioAggregates:
+        """
+        Compute allocations, concentration and top 10 weight in one pass.
+        
+        Market values and weights are derived once from the batch and shared by
+        every grouping, instead of each metric re-walking the position list.
+        
+        Args:
+            batch: Columnar view of the positions
+            
+        Returns:
+            PortfolioAggregates with allocation percentages and diversification metrics
+        """
+        market_value = batch.market_value
+        total_value = math.fsum(market_value)
+        if len(batch) == 0 or total_value == 0:
+            return PortfolioAggregates(total_positions=len(batch))
+        
+        percentages = market_value / total_value * 100
+        
+        # Herfindahl-Hirschman Index, clamped against float rounding
+        weights = market_value / total_value
+        hhi = min(float(np.dot(weights, weights)), 1.0)
+        if len(batch) <= 10:
+            top_10 = 1.0
+        else:
+            top_10 = min(math.fsum(market_value[top_k_indices(market_value, 10)]) / total_value, 1.0)
+        
+        return PortfolioAggregates(
+            total_positions=len(batch),
+            sector_allocation=batch.breakdown(percentages, batch.sector_id),
+            industry_allocation=batch.breakdown(percentages, batch.industry_id),
+            country_allocation=batch.breakdown(percentages, batch.country_id),
+            asset_type_allocation=batch.breakdown(percentages, batch.asset_type_id),
+            diversification_score=Decimal(str((1 - hhi) * 100)),
+            concentration_risk=Decimal(str(hhi * 100)),
+            top_10_weight=Decimal(str(top_10 * 100))
+        )
+    
     def _calculate_sector_allocation(self, positions: List[Position]) -> Dict[str, Decimal]:
         """Calculate allocation by sector."""
         total_value = sum(pos.market_value for pos in positions)
@@ -169,31 +336,8 @@ class CalculationsService:
         Returns:
             Tuple of (diversification_score, concentration_risk, top_10_weight)
         """
-        if not positions:
-            return Decimal('0'), Decimal('0'), Decimal('0')
-        
-        total_value = sum(pos.market_value for pos in positions)
-        if total_value == 0:
-            return Decimal('0'), Decimal('0'), Decimal('0')
-        
-        # Calculate weights
-        weights = [pos.market_value / total_value for pos in positions]
-        
-        # Herfindahl-Hirschman Index for concentration
-        hhi = sum(w ** 2 for w in weights)
-        
-        # Diversification score (inverse of concentration, scaled 0-100)
-        diversification_score = Decimal(str((1 - hhi) * 100))
-        
-        # Concentration risk (HHI scaled 0-100)
-        concentration_risk = Decimal(str(hhi * 100))
-        
-        # Top 10 holdings weight
-        sorted_positions = sorted(positions, key=lambda p: p.market_value, reverse=True)
-        top_10_value = sum(pos.market_value for pos in sorted_positions[:10])
-        top_10_weight = (top_10_value / total_value * 100) if total_value > 0 else Decimal('0')
-        
-        return diversification_score, concentration_risk, top_10_weight
+        aggregates = self.compute_portfolio_aggregates(PositionBatch.from_positions(positions))
+        return aggregates.diversification_score, aggregates.concentration_risk, aggregates.top_10_weight
     
     def _calculate_dividend_metrics(self, dividends: List[Dividend], total_value: Decimal) -> Dict[str, Decimal]:
         """Calculate comprehensive dividend-related metrics."""
@@ -210,12 +354,28 @@ class CalculationsService:
                 'dividend_growth_rate': Decimal('0')
             }
         
-        # Total dividends received
-        total_dividends = sum(div.total_amount for div in dividends)
+        one_year_ago = (datetime.now() - timedelta(days=365)).date()
+        two_years_ago = (datetime.now() - timedelta(days=730)).date()
         
-        # Separate reinvested vs withdrawn dividends
-        reinvested_dividends = sum(div.total_amount for div in dividends if div.is_reinvested)
-        withdrawn_dividends = sum(div.total_amount for div in dividends if not div.is_reinvested)
+        # Accumulate totals in a single pass as exact integer micro-units
+        total_micros = reinvested_micros = trailing_micros = previous_micros = 0
+        has_recent = False
+        for div in dividends:
+            amount = to_micros(div.total_amount)
+            total_micros += amount
+            if div.is_reinvested:
+                reinvested_micros += amount
+            if div.payment_date:
+                if div.payment_date >= one_year_ago:
+                    trailing_micros += amount
+                    has_recent = True
+                elif div.payment_date >= two_years_ago:
+                    previous_micros += amount
+        
+        # Total dividends received, split into reinvested vs withdrawn
+        total_dividends = from_micros(total_micros)
+        reinvested_dividends = from_micros(reinvested_micros)
+        withdrawn_dividends = from_micros(total_micros - reinvested_micros)
         
         # Calculate reinvestment rate
         reinvestment_rate = (reinvested_dividends / total_dividends * 100) if total_dividends > 0 else Decimal('0')
@@ -223,25 +383,13 @@ class CalculationsService:
         # Current dividend yield based on total value
         dividend_yield = (total_dividends / total_value * 100) if total_value > 0 else Decimal('0')
         
-        # Calculate trailing 12 months metrics
-        one_year_ago = datetime.now() - timedelta(days=365)
-        recent_dividends = [
-            div for div in dividends 
-            if div.payment_date and div.payment_date >= one_year_ago.date()
-        ]
-        
-        trailing_12m_dividends = sum(div.total_amount for div in recent_dividends)
-        monthly_avg = trailing_12m_dividends / 12 if recent_dividends else Decimal('0')
+        # Trailing 12 months metrics
+        trailing_12m_dividends = from_micros(trailing_micros)
+        monthly_avg = trailing_12m_dividends / 12 if has_recent else Decimal('0')
         annual_projection = trailing_12m_dividends
         
-        # Calculate dividend growth rate (comparing last 12 months to previous 12 months)
-        two_years_ago = datetime.now() - timedelta(days=730)
-        previous_year_dividends = [
-            div for div in dividends 
-            if div.payment_date and two_years_ago.date() <= div.payment_date < one_year_ago.date()
-        ]
-        
-        previous_12m_total = sum(div.total_amount for div in previous_year_dividends)
+        # Dividend growth rate (comparing last 12 months to previous 12 months)
+        previous_12m_total = from_micros(previous_micros)
         dividend_growth_rate = Decimal('0')
         if previous_12m_total > 0 and trailing_12m_dividends > 0:
             dividend_growth_rate = ((trailing_12m_dividends - previous_12m_total) / previous_12m_total * 100)
@@ -893,10 +1041,8 @@ class CalculationsService:
         if not benchmark_data.price_history or len(benchmark_data.price_history) < 2:
             return pd.Series(dtype=float)
         
-        prices = [float(point.close_price) for point in benchmark_data.price_history]
-        dates = [point.price_date for point in benchmark_data.price_history]
-        
-        price_series = pd.Series(prices, index=dates)
+        series = benchmark_data.to_series()
+        price_series = pd.Series(series.close, index=series.dates.astype(object))
         returns = price_series.pct_change().dropna()
         
         return returns
@@ -1017,11 +1163,8 @@ class CalculationsService:
         
         dividend_metrics = self._calculate_dividend_metrics(pie_dividends, pie_value)
         
-        # Allocation calculations
-        sector_allocation = self._calculate_sector_allocation(pie.positions)
-        industry_allocation = self._calculate_industry_allocation(pie.positions)
-        country_allocation = self._calculate_country_allocation(pie.positions)
-        asset_type_allocation = self._calculate_asset_type_allocation(pie.positions)
+        # Allocation calculations over one position batch
+        aggregates = self.compute_portfolio_aggregates(pie.position_batch)
         
         # Advanced performance and risk calculations
         risk_metrics = None
@@ -1046,7 +1189,7 @@ class CalculationsService:
                     beta_vs_portfolio = self._calculate_enhanced_pie_beta(pie_returns, portfolio_returns)
         
         # Top holdings for pie
-        top_holdings = sorted(pie.positions, key=lambda p: p.market_value, reverse=True)[:5]
+        top_holdings = top_positions(pie.positions, 5)
         
         return PieMetrics(
             total_value=pie_value,
@@ -1066,10 +1209,7 @@ class CalculationsService:
             reinvestment_rate=dividend_metrics.get('reinvestment_rate', Decimal('0')),
             trailing_12m_dividends=dividend_metrics.get('trailing_12m_dividends', Decimal('0')),
             dividend_growth_rate=dividend_metrics.get('dividend_growth_rate', Decimal('0')),
-            sector_allocation=sector_allocation,
-            industry_allocation=industry_allocation,
-            country_allocation=country_allocation,
-            asset_type_allocation=asset_type_allocation,
+            **aggregates.allocations(),
             risk_metrics=risk_metrics,
             beta_vs_portfolio=beta_vs_portfolio,
             top_holdings=[pos.symbol for pos in top_holdings]
@@ -1393,9 +1533,12 @@ class CalculationsService:
             portfolio_returns = self._calculate_portfolio_returns(all_positions, historical_data)
         
         for pie in pies:
-            pie_metrics = self.calculate_pie_metrics(
-                pie, portfolio_total_value, historical_data, dividends, portfolio_returns
-            )
+            if historical_data is None and dividends is None:
+                pie_metrics = self.get_pie_metrics(pie, portfolio_total_value)
+            else:
+                pie_metrics = self.calculate_pie_metrics(
+                    pie, portfolio_total_value, historical_data, dividends, portfolio_returns
+                )
             
             comparison_metrics[pie.id] = {
                 'name': pie.name,
@@ -1693,12 +1836,14 @@ class CalculationsService:
                 'concentration_buckets': {}
             }
         
-        # Calculate weights and sort by value
-        sorted_positions = sorted(positions, key=lambda p: p.market_value, reverse=True)
+        # Only the top 20 holdings need ranking; the rest are summed unordered
+        sorted_positions = top_positions(positions, 20)
+        top_ids = {id(pos) for pos in sorted_positions}
         weights = [pos.market_value / total_value for pos in sorted_positions]
+        remaining_weights = [pos.market_value / total_value for pos in positions if id(pos) not in top_ids]
         
         # Herfindahl-Hirschman Index
-        hhi = sum(w ** 2 for w in weights)
+        hhi = sum(w ** 2 for w in weights) + sum(w ** 2 for w in remaining_weights)
         hhi_decimal = Decimal(str(hhi))
         
         # Concentration level
@@ -1711,7 +1856,7 @@ class CalculationsService:
         
         # Top holdings analysis
         top_holdings = []
-        for i, pos in enumerate(sorted_positions[:20]):  # Top 20
+        for i, pos in enumerate(sorted_positions):  # Top 20
             weight = pos.market_value / total_value * 100
             top_holdings.append({
                 'rank': i + 1,
@@ -1728,8 +1873,8 @@ class CalculationsService:
             'top_1': sum(weights[:1]) * 100 if len(weights) >= 1 else 0,
             'top_5': sum(weights[:5]) * 100 if len(weights) >= 5 else sum(weights) * 100,
             'top_10': sum(weights[:10]) * 100 if len(weights) >= 10 else sum(weights) * 100,
-            'top_20': sum(weights[:20]) * 100 if len(weights) >= 20 else sum(weights) * 100,
-            'remaining': sum(weights[20:]) * 100 if len(weights) > 20 else 0
+            'top_20': sum(weights) * 100,
+            'remaining': sum(remaining_weights) * 100 if remaining_weights else 0
         }
         
         return {
@@ -1770,41 +1915,19 @@ class CalculationsService:
                 'position_count_score': Decimal('0')
             }
         
-        # Sector diversification
-        sector_weights = {}
-        for pos in positions:
-            sector = pos.sector or "Unknown"
-            sector_weights[sector] = sector_weights.get(sector, Decimal('0')) + (pos.market_value / total_value)
+        # Group weights per dimension with one bincount each
+        batch = PositionBatch.from_positions(positions)
+        weights = batch.weights
         
-        sector_hhi = sum(w ** 2 for w in sector_weights.values())
-        sector_diversification = Decimal(str((1 - sector_hhi) * 100))
-        
-        # Industry diversification
-        industry_weights = {}
-        for pos in positions:
-            industry = pos.industry or "Unknown"
-            industry_weights[industry] = industry_weights.get(industry, Decimal('0')) + (pos.market_value / total_value)
-        
-        industry_hhi = sum(w ** 2 for w in industry_weights.values())
-        industry_diversification = Decimal(str((1 - industry_hhi) * 100))
-        
-        # Geographical diversification
-        country_weights = {}
-        for pos in positions:
-            country = pos.country or "Unknown"
-            country_weights[country] = country_weights.get(country, Decimal('0')) + (pos.market_value / total_value)
-        
-        geo_hhi = sum(w ** 2 for w in country_weights.values())
-        geographical_diversification = Decimal(str((1 - geo_hhi) * 100))
-        
-        # Asset type diversification
-        asset_type_weights = {}
-        for pos in positions:
-            asset_type = pos.asset_type.value
-            asset_type_weights[asset_type] = asset_type_weights.get(asset_type, Decimal('0')) + (pos.market_value / total_value)
+        def diversification(ids: np.ndarray) -> Decimal:
+            _, group_weights = sum_by_group(weights, ids)
+            hhi = min(float(np.dot(group_weights, group_weights)), 1.0)
+            return Decimal(str((1 - hhi) * 100))
         
-        asset_hhi = sum(w ** 2 for w in asset_type_weights.values())
-        asset_type_diversification = Decimal(str((1 - asset_hhi) * 100))
+        sector_diversification = diversification(batch.sector_id)
+        industry_diversification = diversification(batch.industry_id)
+        geographical_diversification = diversification(batch.country_id)
+        asset_type_diversification = diversification(batch.asset_type_id)
         
         # Position count score (more positions = better diversification, up to a point)
         position_count = len(positions)
@@ -1855,10 +1978,11 @@ class CalculationsService:
             return {'drift_detected': False, 'recommendations': []}
         
         # Calculate current allocations
-        current_sector = self._calculate_sector_allocation(current_positions)
-        current_industry = self._calculate_industry_allocation(current_positions)
-        current_country = self._calculate_country_allocation(current_positions)
-        current_asset_type = self._calculate_asset_type_allocation(current_positions)
+        aggregates = self.compute_portfolio_aggregates(PositionBatch.from_positions(current_positions))
+        current_sector = aggregates.sector_allocation.to_dict()
+        current_industry = aggregates.industry_allocation.to_dict()
+        current_country = aggregates.country_allocation.to_dict()
+        current_asset_type = aggregates.asset_type_allocation.to_dict()
         
         drift_analysis = {
             'drift_detected': False,
@@ -1989,11 +2113,12 @@ class CalculationsService:
             }
         
         # Calculate all allocation breakdowns
+        aggregates = self.compute_portfolio_aggregates(PositionBatch.from_positions(positions))
         allocations = {
-            'sector': self._calculate_sector_allocation(positions),
-            'industry': self._calculate_industry_allocation(positions),
-            'country': self._calculate_country_allocation(positions),
-            'asset_type': self._calculate_asset_type_allocation(positions)
+            'sector': aggregates.sector_allocation.to_dict(),
+            'industry': aggregates.industry_allocation.to_dict(),
+            'country': aggregates.country_allocation.to_dict(),
+            'asset_type': aggregates.asset_type_allocation.to_dict()
         }
         
         # Calculate diversification scores
@@ -2004,10 +2129,9 @@ class CalculationsService:
         
         # Get top holdings with enhanced details
         total_value = sum(pos.market_value for pos in positions)
-        sorted_positions = sorted(positions, key=lambda p: p.market_value, reverse=True)
         
         top_holdings = []
-        for i, pos in enumerate(sorted_positions[:20]):  # Top 20 holdings
+        for i, pos in enumerate(top_positions(positions, 20)):  # Top 20 holdings
             weight = (pos.market_value / total_value * 100) if total_value > 0 else Decimal('0')
             top_holdings.append({
                 'rank': i + 1,
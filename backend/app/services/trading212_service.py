@@ -13,19 +13,23 @@ from typing import Dict, List, Optional, Any
 from decimal import Decimal
 
 import httpx
+import numpy as np
 import redis.asyncio as redis
-from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from pydantic import BaseModel, ValidationError
 
 from app.core.config import settings
 from app.core.logging import get_context_logger
 from app.core.metrics import get_metrics_collector
+from app.core.security import cipher_suite, decrypt_api_key, encrypt_api_key
+from app.core.time import utcnow_cached
 from app.models.portfolio import Portfolio, PortfolioMetrics
 from app.models.pie import Pie, PieMetrics
 from app.models.position import Position
 from app.models.dividend import Dividend
 from app.models.historical import HistoricalData
 from app.models.enums import AssetType
+from app.services.calculations_service import CalculationsService
 
 
 logger = get_context_logger(__name__)
@@ -71,7 +75,7 @@ class Trading212Service:
         self.session: Optional[httpx.AsyncClient] = None
         self.api_key: Optional[str] = None
         self.redis_client: Optional[redis.Redis] = None
-        self.cipher_suite: Optional[Fernet] = None
+        self.cipher_suite: Optional[AESGCM] = None
         self.metrics = get_metrics_collector()
         
         # Rate limiting properties
@@ -97,9 +101,8 @@ class Trading212Service:
         """Initialize encryption for secure API key storage."""
         try:
             logger.debug("Initializing encryption for API key storage")
-            # Use a key derived from the secret key for encryption
-            key = Fernet.generate_key()  # In production, derive from settings.SECRET_KEY
-            self.cipher_suite = Fernet(key)
+            # Share the settings-pinned key so stored keys survive restarts
+            self.cipher_suite = cipher_suite
             logger.info("Encryption initialized successfully")
         except Exception as e:
             logger.error(
@@ -180,13 +183,13 @@ class Trading212Service:
         """Encrypt API key for secure storage."""
         if not self.cipher_suite:
             raise Trading212APIError("Encryption not initialized")
-        return self.cipher_suite.encrypt(api_key.encode()).decode()
+        return encrypt_api_key(api_key)
     
     def _decrypt_api_key(self, encrypted_key: str) -> str:
         """Decrypt API key from storage."""
         if not self.cipher_suite:
             raise Trading212APIError("Encryption not initialized")
-        return self.cipher_suite.decrypt(encrypted_key.encode()).decode()
+        return decrypt_api_key(encrypted_key)
     
     async def _load_rate_limit_cache(self):
         """Load cached rate limit information from Redis."""
@@ -882,12 +885,93 @@ class Trading212Service:
                 country=raw_position.get("country"),
                 currency=raw_position.get("currency", "USD"),
                 asset_type=self._map_asset_type(raw_position.get("type", "STOCK")),
-                last_updated=datetime.utcnow()
+                last_updated=utcnow_cached()
             )
         except (KeyError, ValueError, TypeError) as e:
             logger.error(f"Failed to transform position data: {e}")
             raise Trading212APIError(f"Invalid position data: {e}")
     
+    def _transform_positions(self, raw_positions: List[Dict[str, Any]]) -> List[Position]:
+        """
+        Transform a batch of Trading 212 positions, validating amounts column-wise.
+        
+        Quantities and prices are checked for all rows at once; rows that pass
+        are built without per-row model validation. Invalid rows are skipped,
+        as in the row-by-row path.
+        
+        Args:
+            raw_positions: Raw position data from Trading 212 API
+            
+        Returns:
+            List of Position model instances
+        """
+        # Rows that are not objects cannot be read column-wise; skip them alone
+        rows = []
+        for row in raw_positions:
+            if isinstance(row, dict):
+                rows.append(row)
+            else:
+                logger.warning(f"Skipping invalid position: {row!r}")
+        
+        try:
+            amounts = np.array(
+                [
+                    (row.get("quantity", 0), row.get("averagePrice", 0), row.get("currentPrice", 0))
+                    for row in rows
+                ],
+                dtype=np.float64
+            ).reshape(-1, 3)
+        except (TypeError, ValueError):
+            # Non-numeric amounts; fall back to validating each row
+            positions = []
+            for raw_pos in rows:
+                try:
+                    positions.append(self._transform_position_data(raw_pos))
+                except Exception as e:
+                    logger.warning(f"Skipping invalid position: {e}")
+            return positions
+        
+        valid = np.isfinite(amounts).all(axis=1) & (amounts >= 0).all(axis=1)
+        
+        positions = []
+        last_updated = utcnow_cached()
+        for raw_pos, is_valid in zip(rows, valid.tolist()):
+            symbol = raw_pos.get("ticker", "")
+            name = raw_pos.get("name", "")
+            currency = raw_pos.get("currency", "USD")
+            classification = (raw_pos.get("sector"), raw_pos.get("industry"), raw_pos.get("country"))
+            # construct_trusted skips validation, so reject what the Position
+            # string fields would: non-strings, and None where it is required
+            if (
+                not is_valid
+                or not isinstance(symbol, str)
+                or not isinstance(name, str)
+                or not isinstance(currency, str)
+                or not all(value is None or isinstance(value, str) for value in classification)
+            ):
+                logger.warning(f"Skipping invalid position: {symbol}")
+                continue
+            
+            try:
+                positions.append(Position.construct_trusted(
+                    symbol=symbol,
+                    name=name,
+                    quantity=Decimal(str(raw_pos.get("quantity", 0))),
+                    average_price=Decimal(str(raw_pos.get("averagePrice", 0))),
+                    current_price=Decimal(str(raw_pos.get("currentPrice", 0))),
+                    unrealized_pnl_pct=Decimal(str(raw_pos.get("pplPercent", 0))),
+                    sector=classification[0],
+                    industry=classification[1],
+                    country=classification[2],
+                    currency=currency,
+                    asset_type=self._map_asset_type(raw_pos.get("type", "STOCK")),
+                    last_updated=last_updated
+                ))
+            except Exception as e:
+                logger.warning(f"Skipping invalid position: {e}")
+        
+        return positions
+    
     def _map_asset_type(self, trading212_type: str) -> AssetType:
         """
         Map Trading 212 asset type to internal AssetType enum.
@@ -932,6 +1016,8 @@ class Trading212Service:
                 portfolio_contribution=Decimal('0')  # Will be calculated at portfolio level
             )
             
+            creation_time = raw_pie.get("creationTime")
+            
             return Pie(
                 id=raw_pie.get("id", ""),
                 name=raw_pie.get("name", ""),
@@ -939,8 +1025,8 @@ class Trading212Service:
                 positions=positions,
                 metrics=pie_metrics,
                 auto_invest=raw_pie.get("autoInvest", False),
-                created_at=datetime.fromisoformat(raw_pie.get("creationTime", datetime.utcnow().isoformat())),
-                last_updated=datetime.utcnow()
+                created_at=datetime.fromisoformat(creation_time) if creation_time is not None else utcnow_cached(),
+                last_updated=utcnow_cached()
             )
         except (KeyError, ValueError, TypeError) as e:
             logger.error(f"Failed to transform pie data: {e}")
@@ -970,13 +1056,7 @@ class Trading212Service:
             logger.debug("Fetched cash balance")
             
             # Transform positions data
-            all_positions = []
-            for raw_pos in positions_data:
-                try:
-                    position = self._transform_position_data(raw_pos)
-                    all_positions.append(position)
-                except Exception as e:
-                    logger.warning(f"Skipping invalid position: {e}")
+            all_positions = self._transform_positions(positions_data)
             
             # Group positions by pie
             pie_positions_map = {}
@@ -990,7 +1070,8 @@ class Trading212Service:
                     if pie_id:
                         # Get positions for this pie (this would need pie-specific API call)
                         # For now, we'll use a simplified approach
-                        pie_positions = [pos for pos in all_positions if pos.symbol in raw_pie.get("instruments", [])]
+                        instruments = set(raw_pie.get("instruments", []))
+                        pie_positions = [pos for pos in all_positions if pos.symbol in instruments]
                         pie = self._transform_pie_data(raw_pie, pie_positions)
                         pies.append(pie)
                         
@@ -1034,8 +1115,14 @@ class Trading212Service:
                 individual_positions=individual_positions,
                 metrics=portfolio_metrics,
                 base_currency=account_info.get("currencyCode", "USD"),
-                last_sync=datetime.utcnow(),
-                last_updated=datetime.utcnow()
+                last_sync=utcnow_cached(),
+                last_updated=utcnow_cached()
+            )
+            
+            # Full position-derived metrics, reused across fetches of unchanged
+            # holdings; copied so the shared cached instance is never mutated
+            portfolio.metrics = CalculationsService().get_portfolio_metrics(portfolio).model_copy(
+                update={"cash_balance": cash_balance}
             )
             
             logger.info(f"Successfully fetched portfolio with {len(pies)} pies and {len(individual_positions)} individual positions")
@@ -1065,8 +1152,39 @@ class Trading212Service:
             except Exception as e:
                 logger.warning(f"Failed to clear cache: {e}")
         
+        CalculationsService.invalidate_metrics(portfolio_id)
+        
         return await self.fetch_portfolio_data()
     
+    def apply_price_updates(self, portfolio: Portfolio, updates: Dict[str, Decimal]) -> int:
+        """
+        Apply latest prices to the positions of an already fetched portfolio.
+        
+        Positions are located through the portfolio's symbol index, so each
+        update is a dictionary lookup rather than a scan of every holding.
+        Symbols the portfolio does not hold are ignored.
+        
+        Args:
+            portfolio: Portfolio to update in place
+            updates: Mapping of symbol to new market price
+        
+        Returns:
+            Number of positions whose price was updated
+        """
+        updated = 0
+        for symbol, price in updates.items():
+            positions = portfolio.find_positions(symbol)
+            if not positions:
+                continue
+            new_price = price if isinstance(price, Decimal) else Decimal(str(price))
+            for position in positions:
+                position.update_price(new_price)
+            updated += len(positions)
+        
+        if updated:
+            portfolio.invalidate_cache()
+        return updated
+    
     async def get_historical_orders(
         self, 
         cursor: Optional[str] = None, 
@@ -1196,7 +1314,7 @@ class Trading212Service:
                 exchange_rate=exchange_rate,
                 base_currency_amount=base_currency_amount,
                 is_reinvested=is_reinvested,
-                created_at=datetime.utcnow()
+                created_at=utcnow_cached()
             )
         except (KeyError, ValueError, TypeError) as e:
             logger.error(f"Failed to transform dividend data: {e}")
@@ -1250,7 +1368,7 @@ class Trading212Service:
                 start_date=data_points[0]["date"] if data_points else datetime.utcnow(),
                 end_date=data_points[-1]["date"] if data_points else datetime.utcnow(),
                 frequency="daily",
-                created_at=datetime.utcnow()
+                created_at=utcnow_cached()
             )
         except (KeyError, ValueError, TypeError) as e:
             logger.error(f"Failed to transform historical data: {e}")
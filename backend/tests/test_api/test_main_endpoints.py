@@ -36,6 +36,14 @@ class TestMainEndpoints:
         data = response.json()
         assert data["status"] == "healthy"
         assert "environment" in data
+    
+    def test_health_check_bypasses_middleware(self, client):
+        """Test that probe requests are answered before the middleware stack."""
+        response = client.get("/health")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert "x-request-id" not in response.headers
 
     @patch('app.main.settings.ENVIRONMENT', 'development')
     def test_health_check_development_environment(self, client):
@@ -146,6 +154,17 @@ class TestApplicationConfiguration:
         assert "openapi" in data
         assert "info" in data
         assert data["info"]["title"] == "Trading 212 Portfolio Dashboard API"
+    
+    def test_openapi_json_served_from_cache(self, client):
+        """Test that the OpenAPI schema is serialized once and reused."""
+        first = client.get("/api/v1/openapi.json")
+        second = client.get("/api/v1/openapi.json")
+        
+        assert first.status_code == 200
+        assert first.headers["content-type"] == "application/json"
+        assert first.content == second.content
+        assert app.state.openapi_bytes == first.content
+        assert "/api/v1/openapi.json" not in first.json()["paths"]
 
     def test_docs_accessible(self, client):
         """Test that API docs are accessible."""
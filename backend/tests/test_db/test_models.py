@@ -5,6 +5,7 @@ Tests for SQLAlchemy database models.
 import pytest
 from datetime import datetime, date
 from decimal import Decimal
+from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 
 from app.db.models import (
@@ -12,6 +13,7 @@ from app.db.models import (
     HistoricalDataTable, PerformanceSnapshotTable,
     AssetTypeEnum, RiskCategoryEnum, DividendTypeEnum
 )
+from app.models.enums import DividendType
 
 
 class TestPortfolioTable:
@@ -285,6 +287,39 @@ class TestPositionTable:
         positions = test_db_session.query(PositionTable).all()
         asset_types = [pos.asset_type for pos in positions]
         assert len(set(asset_types)) == len(AssetTypeEnum)
+        assert all(isinstance(asset_type, AssetTypeEnum) for asset_type in asset_types)
+    
+    def test_position_asset_type_stored_as_integer(self, test_db_session):
+        """Test that asset type is persisted as its integer code."""
+        portfolio = PortfolioTable(
+            id="portfolio_123",
+            user_id="user_456"
+        )
+        test_db_session.add(portfolio)
+        test_db_session.commit()
+        
+        position = PositionTable(
+            portfolio_id="portfolio_123",
+            symbol="VWRL",
+            name="Vanguard FTSE All-World",
+            quantity=Decimal("10"),
+            average_price=Decimal("100"),
+            current_price=Decimal("110"),
+            market_value=Decimal("1100"),
+            unrealized_pnl=Decimal("100"),
+            unrealized_pnl_pct=Decimal("10"),
+            asset_type=AssetTypeEnum.ETF
+        )
+        test_db_session.add(position)
+        test_db_session.commit()
+        
+        raw_value = test_db_session.execute(
+            text("SELECT asset_type FROM positions WHERE symbol = 'VWRL'")
+        ).scalar_one()
+        assert raw_value == int(AssetTypeEnum.ETF)
+        
+        test_db_session.expire_all()
+        assert test_db_session.query(PositionTable).one().asset_type is AssetTypeEnum.ETF
 
 
 class TestDividendTable:
@@ -329,6 +364,43 @@ class TestDividendTable:
         assert retrieved.ex_dividend_date == date(2024, 1, 10)
         assert retrieved.is_reinvested is False  # Default value
     
+    def test_dividend_type_accepts_api_enum(self, test_db_session):
+        """Test that API dividend types bind to their integer codes."""
+        portfolio = PortfolioTable(
+            id="portfolio_123",
+            user_id="user_456"
+        )
+        test_db_session.add(portfolio)
+        test_db_session.commit()
+        
+        for dividend_type in DividendType:
+            dividend = DividendTable(
+                id=f"dividend_{dividend_type.value}",
+                portfolio_id="portfolio_123",
+                symbol="AAPL",
+                security_name="Apple Inc.",
+                dividend_type=dividend_type,
+                amount_per_share=Decimal("0.25"),
+                total_amount=Decimal("2.50"),
+                shares_held=Decimal("10"),
+                ex_dividend_date=date(2024, 1, 10),
+                payment_date=date(2024, 1, 25),
+                gross_amount=Decimal("2.50"),
+                net_amount=Decimal("2.50")
+            )
+            test_db_session.add(dividend)
+        test_db_session.commit()
+        test_db_session.expire_all()
+        
+        stored = {
+            dividend.id: dividend.dividend_type
+            for dividend in test_db_session.query(DividendTable).all()
+        }
+        assert stored == {
+            f"dividend_{dividend_type.value}": DividendTypeEnum[dividend_type.value]
+            for dividend_type in DividendType
+        }
+    
     def test_dividend_portfolio_relationship(self, test_db_session):
         """Test relationship between dividend and portfolio."""
         # Create portfolio
@@ -405,6 +477,18 @@ class TestHistoricalDataTable:
         with pytest.raises(IntegrityError):
             test_db_session.commit()
 
+    def test_historical_data_unique_symbol_date(self, test_db_session):
+        """Test that only one price record is allowed per symbol and date."""
+        for close_price in (Decimal("154.50"), Decimal("155.00")):
+            test_db_session.add(HistoricalDataTable(
+                symbol="AAPL",
+                price_date=date(2024, 1, 15),
+                close_price=close_price
+            ))
+        
+        with pytest.raises(IntegrityError):
+            test_db_session.commit()
+
 
 class TestPerformanceSnapshotTable:
     """Test PerformanceSnapshotTable database model."""
@@ -7,10 +7,28 @@ from datetime import datetime, date
 from decimal import Decimal
 from pydantic import ValidationError
 
-from app.models.benchmark import BenchmarkData, BenchmarkComparison
+from app.models.benchmark import BenchmarkData, BenchmarkComparison, BenchmarkDataPoint
 from app.models.historical import HistoricalData, PricePoint
 
 
+class TestBenchmarkDataPoint:
+    """Test BenchmarkDataPoint model validation."""
+    
+    def test_price_accepts_float_and_decimal(self):
+        """Test that prices are stored as floats whatever their input type."""
+        from_float = BenchmarkDataPoint(date=datetime(2024, 1, 15), price=101.5, return_pct=1.5)
+        from_decimal = BenchmarkDataPoint(date=datetime(2024, 1, 15), price=Decimal("101.5"))
+        
+        assert from_float.price == from_decimal.price == 101.5
+        assert isinstance(from_decimal.price, float)
+        assert from_float.return_pct == 1.5
+    
+    def test_negative_price_validation(self):
+        """Test that negative prices raise validation error."""
+        with pytest.raises(ValidationError):
+            BenchmarkDataPoint(date=datetime(2024, 1, 15), price=-1.0)
+
+
 class TestBenchmarkData:
     """Test BenchmarkData model validation and functionality."""
     
@@ -262,6 +262,15 @@ class TestDividend:
         assert str(json_data["payment_date"]) == "2024-01-25"
         assert isinstance(json_data["created_at"], datetime)
     
+    def test_dividend_is_immutable(self, sample_dividend_data):
+        """Test that dividends are frozen and usable as cache keys."""
+        dividend = Dividend(**sample_dividend_data)
+        
+        with pytest.raises(ValidationError):
+            dividend.total_amount = Decimal("5.00")
+        
+        assert hash(dividend) == hash(Dividend(**dividend.model_dump()))
+    
     def test_all_dividend_types(self):
         """Test that all dividend types work correctly."""
         for div_type in DividendType:
@@ -2,12 +2,15 @@
 Tests for Historical data models.
 """
 
+import numpy as np
 import pytest
 from datetime import datetime, date
 from decimal import Decimal
 from pydantic import ValidationError
 
-from app.models.historical import PricePoint, HistoricalData, PerformanceSnapshot
+from app.models.historical import (
+    PRICE_ROW_FIELDS, PricePoint, HistoricalData, HistoricalSeries, PerformanceSnapshot
+)
 
 
 class TestPricePoint:
@@ -118,6 +121,18 @@ class TestPricePoint:
         assert str(json_data["price_date"]) == "2024-01-15"
         assert json_data["close_price"] == 150.00
         assert json_data["volume"] == 1000000
+    
+    def test_price_point_is_immutable(self):
+        """Test that price points are frozen and hashable."""
+        price_point = PricePoint(
+            price_date=date(2024, 1, 15),
+            close_price=Decimal("150.00")
+        )
+        
+        with pytest.raises(ValidationError):
+            price_point.close_price = Decimal("151.00")
+        
+        assert {price_point, price_point.model_copy()} == {price_point}
 
 
 class TestHistoricalData:
@@ -262,6 +277,81 @@ class TestHistoricalData:
         assert str(json_data["end_date"]) == "2024-01-15"
         assert len(json_data["price_history"]) == 1
         assert isinstance(json_data["last_updated"], datetime)
+    
+    def test_build_trusted(self):
+        """Test building historical data from trusted rows without validation."""
+        rows = [
+            (date(2024, 1, 15), Decimal("149.00"), Decimal("151.00"), Decimal("148.50"),
+             Decimal("150.00"), 1000000, Decimal("150.00")),
+            (date(2024, 1, 16), None, None, None, Decimal("152.00"), None, None),
+        ]
+        
+        historical_data = HistoricalData.build_trusted("AAPL", rows, data_source="db")
+        validated = HistoricalData(
+            symbol="AAPL",
+            price_history=[
+                PricePoint(**dict(zip(PRICE_ROW_FIELDS, row))) for row in rows
+            ],
+            start_date=date(2024, 1, 15),
+            end_date=date(2024, 1, 16),
+            data_source="db",
+            last_updated=historical_data.last_updated
+        )
+        
+        assert historical_data == validated
+        assert historical_data.frequency == "daily"
+        assert historical_data.latest_price == Decimal("152.00")
+
+
+class TestHistoricalSeries:
+    """Test HistoricalSeries columnar model."""
+    
+    def test_from_pricepoints(self):
+        """Test building columns from price points."""
+        price_points = [
+            PricePoint(price_date=date(2024, 1, 15), close_price=Decimal("150.00"), volume=1000),
+            PricePoint(price_date=date(2024, 1, 16), close_price=Decimal("152.00")),
+            PricePoint(price_date=date(2024, 1, 17), close_price=Decimal("151.00"), open_price=Decimal("152.50"))
+        ]
+        
+        series = HistoricalSeries.from_pricepoints("AAPL", price_points)
+        
+        assert series.data_points_count == 3
+        assert series.close.tolist() == [150.0, 152.0, 151.0]
+        assert series.dates.astype(object).tolist() == [date(2024, 1, 15), date(2024, 1, 16), date(2024, 1, 17)]
+        assert np.isnan(series.volume[1])
+        assert np.isnan(series.open[0])
+        assert series.latest_price == 151.0
+        assert series.earliest_price == 150.0
+    
+    def test_round_trip_to_pricepoints(self):
+        """Test expanding a series back into price points."""
+        price_points = [
+            PricePoint(
+                price_date=date(2024, 1, 15),
+                open_price=Decimal("149.5"),
+                close_price=Decimal("150.25"),
+                volume=1000000,
+                adjusted_close=Decimal("150.25")
+            ),
+            PricePoint(price_date=date(2024, 1, 16), close_price=Decimal("152.0"))
+        ]
+        historical_data = HistoricalData(
+            symbol="AAPL",
+            price_history=price_points,
+            start_date=date(2024, 1, 15),
+            end_date=date(2024, 1, 16)
+        )
+        
+        assert historical_data.to_series().to_pricepoints() == price_points
+    
+    def test_empty_series_properties(self):
+        """Test properties with no price points."""
+        series = HistoricalSeries.from_pricepoints("AAPL", [])
+        
+        assert series.data_points_count == 0
+        assert series.latest_price is None
+        assert series.earliest_price is None
 
 
 class TestPerformanceSnapshot:
@@ -0,0 +1,58 @@
+"""
+Tests for monetary minor-unit helpers.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from app.models.historical import PerformanceSnapshot
+from app.models.money import MICROS_PER_UNIT, from_micros, to_micros
+
+
+class TestMoneyMicros:
+    """Test micro-unit conversions."""
+    
+    def test_to_micros(self):
+        """Test converting amounts to integer micro-units."""
+        assert to_micros(Decimal("1")) == MICROS_PER_UNIT
+        assert to_micros(Decimal("150.25")) == 150_250_000
+        assert to_micros(Decimal("0.0000005")) == 0  # Half rounds to even
+        assert to_micros(Decimal("0.0000015")) == 2
+        assert to_micros("12.34") == 12_340_000
+    
+    def test_round_trip(self):
+        """Test that amounts survive a round trip exactly."""
+        for amount in (Decimal("0"), Decimal("99.99"), Decimal("-3.5"), Decimal("1234.567891")):
+            assert from_micros(to_micros(amount)) == amount
+    
+    def test_sum_is_exact(self):
+        """Test that summing micro-units matches Decimal arithmetic."""
+        amounts = [Decimal("0.10"), Decimal("0.20"), Decimal("0.30")]
+        
+        assert from_micros(sum(to_micros(amount) for amount in amounts)) == sum(amounts)
+
+
+class TestDecimalJsonEncoders:
+    """Test the shared model JSON encoders."""
+    
+    def test_model_json_output(self):
+        """Test that decimals encode as numbers and dates natively as ISO strings."""
+        snapshot = PerformanceSnapshot(
+            entity_id="portfolio_123",
+            entity_type="portfolio",
+            snapshot_date=date(2024, 1, 31),
+            period_start=date(2024, 1, 1),
+            period_end=date(2024, 1, 31),
+            start_value=Decimal("1000.00"),
+            end_value=Decimal("1050.50"),
+            total_return=Decimal("50.50"),
+            total_return_pct=Decimal("5.05"),
+            created_at=datetime(2024, 1, 31, 12, 30)
+        )
+        
+        data = json.loads(snapshot.model_dump_json())
+        
+        assert data["end_value"] == 1050.5
+        assert data["snapshot_date"] == "2024-01-31"
+        assert data["created_at"] == "2024-01-31T12:30:00"
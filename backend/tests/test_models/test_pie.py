@@ -310,6 +310,33 @@ class TestPie:
         assert top_holdings[-1].symbol == "STOCK2"  # 10th highest (index 9)
         assert top_holdings[-1].market_value == Decimal("1260")  # 10.5 * 120
     
+    def test_position_batch_property(self, sample_position_data):
+        """Test that the pie shares its positions and caches their batch."""
+        positions = [Position(**{**sample_position_data, "symbol": symbol}) for symbol in ("AAPL", "MSFT")]
+        pie = Pie(
+            id="pie_123",
+            name="Tech Growth Pie",
+            positions=positions,
+            metrics=PieMetrics(
+                total_value=Decimal("10000.00"),
+                total_invested=Decimal("9500.00"),
+                total_return=Decimal("500.00"),
+                total_return_pct=Decimal("5.26"),
+                portfolio_weight=Decimal("25.5")
+            ),
+            created_at=datetime(2024, 1, 1, 12, 0, 0)
+        )
+        
+        # Position instances are not copied on validation
+        assert pie.positions[0] is positions[0]
+        
+        batch = pie.position_batch
+        assert pie.position_batch is batch
+        assert list(batch.symbol) == ["AAPL", "MSFT"]
+        
+        pie.positions = positions[:1]
+        assert list(pie.position_batch.symbol) == ["AAPL"]
+    
     def test_json_serialization(self):
         """Test JSON serialization of pie."""
         pie_metrics = PieMetrics(
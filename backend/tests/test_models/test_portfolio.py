@@ -322,6 +322,146 @@ class TestPortfolio:
         assert "AAPL" in symbols
         assert "MSFT" in symbols
     
+    def test_derived_holdings_cached_until_holdings_change(self, sample_position_data):
+        """Test that derived holdings are cached and invalidated on holdings changes."""
+        pie = Pie(
+            id="pie_123",
+            name="Tech Growth Pie",
+            positions=[Position(**{**sample_position_data, "symbol": "AAPL"})],
+            metrics=PieMetrics(
+                total_value=Decimal("10000.00"),
+                total_invested=Decimal("9500.00"),
+                total_return=Decimal("500.00"),
+                total_return_pct=Decimal("5.26"),
+                portfolio_weight=Decimal("20.0")
+            ),
+            created_at=datetime(2024, 1, 1, 12, 0, 0)
+        )
+        portfolio = Portfolio(
+            id="portfolio_123",
+            user_id="user_456",
+            pies=[pie],
+            individual_positions=[Position(**{**sample_position_data, "symbol": "MSFT"})],
+            metrics=PortfolioMetrics(
+                total_value=Decimal("50000.00"),
+                total_invested=Decimal("45000.00"),
+                total_return=Decimal("5000.00"),
+                total_return_pct=Decimal("11.11")
+            )
+        )
+        
+        all_positions = portfolio.all_positions
+        assert portfolio.all_positions is all_positions
+        
+        # In-place append to a pie
+        pie.positions.append(Position(**{**sample_position_data, "symbol": "GOOGL"}))
+        assert portfolio.total_positions == 3
+        assert [pos.symbol for pos in portfolio.all_positions] == ["AAPL", "GOOGL", "MSFT"]
+        assert [pos.symbol for pos in portfolio.iter_positions()] == ["AAPL", "GOOGL", "MSFT"]
+        
+        # Reassigning a pie's holdings
+        pie.positions = []
+        assert [pos.symbol for pos in portfolio.all_positions] == ["MSFT"]
+        
+        # Reassigning the portfolio's holdings
+        portfolio.individual_positions = []
+        assert portfolio.all_positions == []
+        assert portfolio.top_holdings == []
+    
+    def test_holdings_helpers_invalidate_cache(self, sample_position_data):
+        """Test that swapping holdings through the helpers refreshes derived holdings."""
+        pie = Pie(
+            id="pie_123",
+            name="Tech Growth Pie",
+            positions=[Position(**{**sample_position_data, "symbol": "AAPL"})],
+            metrics=PieMetrics(
+                total_value=Decimal("10000.00"),
+                total_invested=Decimal("9500.00"),
+                total_return=Decimal("500.00"),
+                total_return_pct=Decimal("5.26"),
+                portfolio_weight=Decimal("20.0")
+            ),
+            created_at=datetime(2024, 1, 1, 12, 0, 0)
+        )
+        portfolio = Portfolio(
+            id="portfolio_123",
+            user_id="user_456",
+            pies=[pie],
+            individual_positions=[Position(**{**sample_position_data, "symbol": "MSFT"})],
+            metrics=PortfolioMetrics(
+                total_value=Decimal("50000.00"),
+                total_invested=Decimal("45000.00"),
+                total_return=Decimal("5000.00"),
+                total_return_pct=Decimal("11.11")
+            )
+        )
+        assert [pos.symbol for pos in portfolio.all_positions] == ["AAPL", "MSFT"]
+        
+        # Same list and length after a swap; only the revision changes
+        assert pie.remove_position("AAPL").symbol == "AAPL"
+        pie.add_position(Position(**{**sample_position_data, "symbol": "GOOGL"}))
+        assert [pos.symbol for pos in pie.top_holdings] == ["GOOGL"]
+        
+        assert portfolio.remove_individual_position("MSFT").symbol == "MSFT"
+        portfolio.add_individual_position(Position(**{**sample_position_data, "symbol": "TSLA"}))
+        assert [pos.symbol for pos in portfolio.all_positions] == ["GOOGL", "TSLA"]
+        
+        assert portfolio.remove_pie("pie_123") is pie
+        assert portfolio.remove_pie("pie_123") is None
+        assert portfolio.total_positions == 1
+        
+        portfolio.add_pie(pie)
+        assert portfolio.total_positions == 2
+        
+        # Price updates are not visible to the cache key until invalidated
+        assert [pos.symbol for pos in portfolio.top_holdings] == ["GOOGL", "TSLA"]
+        pie.positions[0].update_price(Decimal("1"))
+        assert [pos.symbol for pos in portfolio.top_holdings] == ["GOOGL", "TSLA"]
+        portfolio.invalidate_cache()
+        assert [pos.symbol for pos in portfolio.top_holdings] == ["TSLA", "GOOGL"]
+    
+    def test_find_position_uses_symbol_index(self, sample_position_data):
+        """Test symbol lookups across pies and individual holdings."""
+        pie = Pie(
+            id="pie_123",
+            name="Tech Growth Pie",
+            positions=[
+                Position(**{**sample_position_data, "symbol": "AAPL"}),
+                Position(**{**sample_position_data, "symbol": "MSFT"})
+            ],
+            metrics=PieMetrics(
+                total_value=Decimal("10000.00"),
+                total_invested=Decimal("9500.00"),
+                total_return=Decimal("500.00"),
+                total_return_pct=Decimal("5.26"),
+                portfolio_weight=Decimal("20.0")
+            ),
+            created_at=datetime(2024, 1, 1, 12, 0, 0)
+        )
+        portfolio = Portfolio(
+            id="portfolio_123",
+            user_id="user_456",
+            pies=[pie],
+            individual_positions=[Position(**{**sample_position_data, "symbol": "AAPL"})],
+            metrics=PortfolioMetrics(
+                total_value=Decimal("50000.00"),
+                total_invested=Decimal("45000.00"),
+                total_return=Decimal("5000.00"),
+                total_return_pct=Decimal("11.11")
+            )
+        )
+        
+        assert portfolio.symbol_index == {"AAPL": [(0, 0), (-1, 0)], "MSFT": [(0, 1)]}
+        assert portfolio.find_position("MSFT") is pie.positions[1]
+        assert portfolio.find_position("AAPL") is pie.positions[0]
+        assert portfolio.find_positions("AAPL") == [pie.positions[0], portfolio.individual_positions[0]]
+        assert portfolio.find_position("TSLA") is None
+        assert portfolio.find_positions("TSLA") == []
+        
+        # Index is rebuilt when holdings change
+        pie.remove_position("MSFT")
+        assert portfolio.find_position("MSFT") is None
+    
     def test_top_holdings_property(self, sample_position_data):
         """Test top_holdings property returns top 10 positions by market value."""
         # Create multiple positions with different market values by varying current_price
@@ -2,12 +2,14 @@
 Tests for Position model.
 """
 
+import json
 import pytest
 from datetime import datetime
 from decimal import Decimal
-from pydantic import ValidationError
+from typing import List
+from pydantic import TypeAdapter, ValidationError
 
-from app.models.position import Position
+from app.models.position import Position, dump_positions_json
 from app.models.enums import AssetType
 
 
@@ -77,6 +79,31 @@ class TestPosition:
         position = Position(**position_data)
         assert position.unrealized_pnl_pct == Decimal("10")  # (110 - 100) / 100 * 100
     
+    def test_update_price(self):
+        """Test that a price update recomputes all derived values."""
+        position = Position(
+            symbol="AAPL",
+            name="Apple Inc.",
+            quantity=Decimal("10"),
+            average_price=Decimal("100"),
+            current_price=Decimal("110"),
+            market_value=Decimal("0"),
+            unrealized_pnl=Decimal("0"),
+            unrealized_pnl_pct=Decimal("0"),
+            asset_type=AssetType.STOCK
+        )
+        
+        position.update_price(Decimal("90"))
+        
+        assert position.current_price == Decimal("90")
+        assert position.market_value == Decimal("900")
+        assert position.unrealized_pnl == Decimal("-100")
+        assert position.unrealized_pnl_pct == Decimal("-10")
+        
+        with pytest.raises(ValueError):
+            position.update_price(Decimal("-1"))
+        assert position.current_price == Decimal("90")
+    
     def test_negative_quantity_validation(self):
         """Test that negative quantity raises validation error."""
         with pytest.raises(ValidationError) as exc_info:
@@ -233,4 +260,16 @@ class TestPosition:
         
         assert position.sector is None
         assert position.industry is None
-        assert position.country is None
\ No newline at end of file
+        assert position.country is None
+    
+    def test_dump_positions_json_matches_model_serialization(self, sample_position_data):
+        """Test that the orjson fast path matches the model JSON output."""
+        positions = [
+            Position(**sample_position_data),
+            Position(**{**sample_position_data, "symbol": "MSFT", "last_updated": datetime(2024, 1, 2, 3, 4, 5, 6)})
+        ]
+        
+        expected = TypeAdapter(List[Position]).dump_json(positions)
+        
+        assert json.loads(dump_positions_json(positions)) == json.loads(expected)
+        assert dump_positions_json([]) == b"[]"
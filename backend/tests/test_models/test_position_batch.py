@@ -0,0 +1,133 @@
+"""
+Tests for PositionBatch columnar view.
+"""
+
+import numpy as np
+import pytest
+from decimal import Decimal
+
+from app.models.position import Position
+from app.models.position_batch import AllocationBreakdown, PositionBatch, sum_by_group, top_k_indices, top_positions
+from app.models.enums import AssetType
+
+
+def make_position(symbol, quantity, average_price, current_price, sector=None):
+    """Build a position; derived fields are recalculated by its validators."""
+    return Position(
+        symbol=symbol,
+        name=f"{symbol} Inc.",
+        quantity=Decimal(quantity),
+        average_price=Decimal(average_price),
+        current_price=Decimal(current_price),
+        market_value=Decimal("0"),
+        unrealized_pnl=Decimal("0"),
+        unrealized_pnl_pct=Decimal("0"),
+        sector=sector,
+        asset_type=AssetType.STOCK
+    )
+
+
+class TestPositionBatch:
+    """Test PositionBatch construction and derived columns."""
+    
+    @pytest.fixture
+    def positions(self):
+        """Positions with a gain, a loss and a zero cost basis."""
+        return [
+            make_position("AAPL", "10", "100", "110", sector="Technology"),
+            make_position("XOM", "5", "80", "60", sector="Energy"),
+            make_position("NEW", "3", "0", "20"),
+        ]
+    
+    def test_from_positions(self, positions):
+        """Test transposing positions into columns."""
+        batch = PositionBatch.from_positions(positions)
+        
+        assert len(batch) == 3
+        assert batch.quantity.dtype == np.float64
+        assert list(batch.symbol) == ["AAPL", "XOM", "NEW"]
+        assert list(batch.sector) == ["Technology", "Energy", "Unknown"]
+        assert list(batch.asset_type) == ["STOCK", "STOCK", "STOCK"]
+        assert batch.sector_id.dtype == np.int32
+        assert batch.asset_type_id[0] == batch.asset_type_id[2]
+    
+    def test_breakdown(self, positions):
+        """Test grouping values on interned category IDs, largest first."""
+        batch = PositionBatch.from_positions(positions)
+        
+        breakdown = batch.breakdown(batch.market_value, batch.sector_id)
+        
+        assert breakdown.labels == ["Technology", "Energy", "Unknown"]
+        np.testing.assert_allclose(breakdown.weights, [1100.0, 300.0, 60.0])
+        assert list(breakdown.to_dict()) == breakdown.labels
+        assert batch.breakdown(batch.market_value, batch.asset_type_id).labels == ["STOCK"]
+    
+    def test_breakdown_orders_by_weight(self):
+        """Test that groups are ordered by weight with ties in first-seen order."""
+        breakdown = AllocationBreakdown.from_groups(["A", "B", "C", "D"], np.array([1.0, 3.0, 1.0, 2.0]))
+        
+        assert breakdown.labels == ["B", "D", "A", "C"]
+        assert breakdown.to_dict() == {"B": Decimal("3.0"), "D": Decimal("2.0"), "A": Decimal("1.0"), "C": Decimal("1.0")}
+        assert len(AllocationBreakdown()) == 0
+    
+    def test_derived_columns_match_positions(self, positions):
+        """Test that vectorized columns match the per-position validators."""
+        batch = PositionBatch.from_positions(positions)
+        
+        np.testing.assert_allclose(batch.market_value, [float(p.market_value) for p in positions])
+        np.testing.assert_allclose(batch.unrealized_pnl, [float(p.unrealized_pnl) for p in positions])
+        np.testing.assert_allclose(batch.unrealized_pnl_pct, [10.0, -25.0, 0.0])
+        assert batch.total_value == pytest.approx(1460.0)
+        assert batch.weights.sum() == pytest.approx(1.0)
+    
+    def test_total_value_is_compensated(self):
+        """Test that small values are not lost next to a large one."""
+        batch = PositionBatch.from_positions([
+            make_position("BIG", "1", "1", "1e16"),
+            make_position("ONE", "1", "1", "1"),
+            make_position("TWO", "1", "1", "1"),
+        ])
+        
+        assert batch.total_value == 1e16 + 2
+        assert batch.weights.sum() == pytest.approx(1.0)
+    
+    def test_empty_batch(self):
+        """Test that an empty batch has empty columns and zero value."""
+        batch = PositionBatch.from_positions([])
+        
+        assert len(batch) == 0
+        assert batch.total_value == 0.0
+        assert batch.weights.size == 0
+
+
+class TestKernels:
+    """Test the vectorized ranking and grouping kernels."""
+    
+    def test_top_k_indices_matches_stable_sort(self):
+        """Test that top-k selection matches sorted(..., reverse=True)[:k], ties included."""
+        values = np.array([5.0, 1.0, 7.0, 5.0, 3.0, 7.0, 5.0, 0.0])
+        
+        for k in range(0, len(values) + 2):
+            expected = sorted(range(len(values)), key=lambda i: values[i], reverse=True)[:k]
+            assert list(top_k_indices(values, k)) == expected
+    
+    def test_sum_by_group_first_seen_order(self):
+        """Test grouped sums are returned in first-seen label order."""
+        labels = np.array(["Tech", "Energy", "Tech", "Unknown", "Energy"], dtype=object)
+        values = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+        
+        groups, sums = sum_by_group(values, labels)
+        
+        assert list(groups) == ["Tech", "Energy", "Unknown"]
+        np.testing.assert_allclose(sums, [4.0, 7.0, 4.0])
+    
+    def test_top_positions(self):
+        """Test ranking positions by market value."""
+        positions = [
+            make_position("A", "1", "10", "10"),
+            make_position("B", "1", "10", "30"),
+            make_position("C", "1", "10", "20"),
+        ]
+        
+        assert [pos.symbol for pos in top_positions(positions, 2)] == ["B", "C"]
+        assert top_positions([], 10) == []
@@ -0,0 +1,32 @@
+"""
+Tests for the categorical label vocabulary.
+"""
+
+import numpy as np
+
+from app.models.vocab import Vocabulary
+
+
+class TestVocabulary:
+    """Test interning and decoding labels."""
+    
+    def test_get_id_is_stable(self):
+        """Test that IDs are dense and reused for repeated names."""
+        vocab = Vocabulary()
+        
+        assert vocab.get_id("Technology") == 0
+        assert vocab.get_id("Energy") == 1
+        assert vocab.get_id("Technology") == 0
+        assert len(vocab) == 2
+        assert vocab.name(1) == "Energy"
+    
+    def test_encode_decode_round_trip(self):
+        """Test encoding names to int32 IDs and back."""
+        vocab = Vocabulary()
+        names = ["US", "GB", "US", "DE"]
+        
+        ids = vocab.encode(names, count=len(names))
+        
+        assert ids.dtype == np.int32
+        assert ids.tolist() == [0, 1, 0, 2]
+        assert vocab.decode(ids) == names
@@ -186,6 +186,34 @@ def test_concentration_analysis(calc_service, sample_positions):
     assert "top_10" in buckets
 
 
+def test_concentration_analysis_beyond_top_20(calc_service):
+    """Test that holdings outside the top 20 land in the remaining bucket."""
+    positions = [
+        Position(
+            symbol=f"SYM{i}",
+            name=f"Symbol {i}",
+            quantity=Decimal('1'),
+            average_price=Decimal('10'),
+            current_price=Decimal(i + 1),
+            market_value=Decimal(i + 1),
+            unrealized_pnl=Decimal('0'),
+            unrealized_pnl_pct=Decimal('0'),
+            asset_type=AssetType.STOCK
+        )
+        for i in range(25)
+    ]
+    
+    analysis = calc_service.calculate_concentration_analysis(positions)
+    
+    top_holdings = analysis["top_holdings"]
+    assert [holding["symbol"] for holding in top_holdings] == [f"SYM{i}" for i in range(24, 4, -1)]
+    
+    # Total value is 325; the five smallest holdings are worth 15
+    buckets = analysis["concentration_buckets"]
+    assert abs(float(buckets["remaining"]) - 15 / 325 * 100) < 1e-9
+    assert abs(float(buckets["top_20"] + buckets["remaining"]) - 100) < 1e-9
+
+
 def test_comprehensive_allocation_analysis(calc_service, sample_positions):
     """Test comprehensive allocation analysis."""
     analysis = calc_service.calculate_comprehensive_allocation_analysis(sample_positions)
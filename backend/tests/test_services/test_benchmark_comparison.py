@@ -10,7 +10,9 @@ from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from app.services.benchmark_service import BenchmarkService, BenchmarkAPIError
-from app.models.benchmark import BenchmarkData, BenchmarkDataPoint, BenchmarkComparison, CustomBenchmark
+from app.models.benchmark import (
+    BenchmarkAnalysis, BenchmarkData, BenchmarkDataPoint, BenchmarkComparison, CustomBenchmark
+)
 from app.models.portfolio import Portfolio, PortfolioMetrics
 from app.models.pie import Pie, PieMetrics
 
@@ -186,6 +188,119 @@ class TestBenchmarkComparison:
         for i in range(1, len(returns_series)):
             if not pd.isna(returns_series.iloc[i]):
                 assert isinstance(returns_series.iloc[i], (int, float))
+    
+    @pytest.mark.asyncio
+    async def test_compute_batch_matches_single_comparison(
+        self,
+        benchmark_service,
+        sample_benchmark_data
+    ):
+        """Test that the vectorized batch matches per-entity comparisons."""
+        rng = np.random.default_rng(7)
+        benchmark_returns = benchmark_service._calculate_returns_series(sample_benchmark_data.data_points)
+        entity_returns = rng.normal(0.004, 0.02, (3, len(benchmark_returns)))
+        entities = [("pie", f"pie_{i}", f"Pie {i}") for i in range(3)]
+        
+        batch = BenchmarkAnalysis.compute_batch(
+            entity_returns=entity_returns,
+            benchmark_returns=benchmark_returns.to_numpy(),
+            entities=entities,
+            benchmark=sample_benchmark_data
+        )
+        
+        assert len(batch) == 3
+        for row, (entity_type, entity_id, entity_name), comparison in zip(entity_returns, entities, batch):
+            expected = await benchmark_service.calculate_benchmark_comparison(
+                entity_returns=pd.Series(row, index=benchmark_returns.index),
+                benchmark_data=sample_benchmark_data,
+                entity_type=entity_type,
+                entity_id=entity_id,
+                entity_name=entity_name
+            )
+            
+            assert comparison.entity_id == entity_id
+            assert comparison.outperforming == expected.outperforming
+            for field in (
+                "entity_return_pct", "benchmark_return_pct", "alpha", "beta", "tracking_error",
+                "correlation", "r_squared", "information_ratio", "up_capture", "down_capture"
+            ):
+                assert float(getattr(comparison, field)) == pytest.approx(float(getattr(expected, field)))
+    
+    @pytest.mark.asyncio
+    async def test_compare_multiple_entities_compares_each_pie(self, benchmark_service):
+        """Test that pies built at different times are all compared and a bad pie is skipped alone."""
+        today = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+        start_date = today - timedelta(days=59)
+        data_points = [
+            BenchmarkDataPoint(
+                date=start_date + timedelta(days=i),
+                price=100 + i * 0.5 + (i % 3),
+                volume=1000000
+            )
+            for i in range(60)
+        ]
+        benchmark_data = BenchmarkData(
+            symbol="SPY",
+            name="SPDR S&P 500 ETF Trust",
+            period="1y",
+            start_date=start_date,
+            end_date=today,
+            data_points=data_points,
+            total_return_pct=Decimal("30"),
+            annualized_return_pct=Decimal("10"),
+            volatility=Decimal("15"),
+            max_drawdown=Decimal("5"),
+            sharpe_ratio=Decimal("0.6")
+        )
+        
+        def make_pie(pie_id):
+            return Pie(
+                id=pie_id,
+                name=f"Pie {pie_id}",
+                metrics=PieMetrics(
+                    total_value=Decimal("1000"),
+                    total_invested=Decimal("900"),
+                    total_return=Decimal("100"),
+                    total_return_pct=Decimal("11.1"),
+                    portfolio_weight=Decimal("33.3")
+                ),
+                created_at=datetime.utcnow()
+            )
+        
+        portfolio = Portfolio(
+            id="test_portfolio",
+            name="Test Portfolio",
+            user_id="test_user",
+            pies=[make_pie("growth"), make_pie("short"), make_pie("income")],
+            individual_positions=[],
+            metrics=PortfolioMetrics(
+                total_value=Decimal("3000"),
+                total_invested=Decimal("2700"),
+                total_return=Decimal("300"),
+                total_return_pct=Decimal("11.1")
+            ),
+            last_updated=datetime.utcnow()
+        )
+        
+        calculate_pie_returns = benchmark_service._calculate_pie_returns_series
+        
+        def pie_returns(pie, period):
+            returns = calculate_pie_returns(pie, period)
+            # Too little history to compare this pie
+            return returns.iloc[-3:] if pie.id == "short" else returns
+        
+        portfolio_returns = pd.Series(
+            np.random.default_rng(1).normal(0.001, 0.01, 60),
+            index=pd.date_range(start=start_date, periods=60, freq="D")
+        )
+        
+        with patch.object(benchmark_service, "fetch_benchmark_data", AsyncMock(return_value=benchmark_data)), \
+                patch.object(benchmark_service, "_calculate_pie_returns_series", side_effect=pie_returns), \
+                patch.object(benchmark_service, "_calculate_portfolio_returns_series", return_value=portfolio_returns):
+            analysis = await benchmark_service.compare_multiple_entities_to_benchmark(portfolio, "SPY", "1y")
+        
+        assert [comparison.entity_id for comparison in analysis.pie_analyses] == ["growth", "income"]
+        assert analysis.summary_stats["total_entities"] == 3
 
 
 class TestCustomBenchmark:
@@ -346,11 +461,15 @@ class TestCustomBenchmark:
         
         # Check that weighted prices are calculated correctly
         # SPY: 60% weight, AGG: 40% weight
-        expected_price_1 = Decimal("100") * Decimal("0.6") + Decimal("50") * Decimal("0.4")  # 60 + 20 = 80
-        expected_price_2 = Decimal("101") * Decimal("0.6") + Decimal("50.5") * Decimal("0.4")  # 60.6 + 20.2 = 80.8
+        expected_price_1 = 100 * 0.6 + 50 * 0.4  # 60 + 20 = 80
+        expected_price_2 = 101 * 0.6 + 50.5 * 0.4  # 60.6 + 20.2 = 80.8
+        
+        assert custom_data.data_points[0].price == pytest.approx(expected_price_1)
+        assert custom_data.data_points[1].price == pytest.approx(expected_price_2)
         
-        assert abs(custom_data.data_points[0].price - expected_price_1) < Decimal("0.01")
-        assert abs(custom_data.data_points[1].price - expected_price_2) < Decimal("0.01")
+        # Summary statistics come from the weighted series
+        assert float(custom_data.total_return_pct) == pytest.approx(1.0)
+        assert float(custom_data.max_drawdown) == pytest.approx(0.0)
     
     @pytest.mark.asyncio
     async def test_calculate_custom_benchmark_data_no_component_data(
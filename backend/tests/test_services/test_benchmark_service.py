@@ -11,14 +11,18 @@ This test file covers:
 import pytest
 import json
 import asyncio
+import time
 from datetime import datetime, timedelta
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, patch
 import pandas as pd
 import numpy as np
 import httpx
+import orjson
 
-from app.services.benchmark_service import BenchmarkService, BenchmarkAPIError
+from app.services.benchmark_service import (
+    BenchmarkService, BenchmarkAPIError, _benchmark_l1_cache, _pack_cache_value, _unpack_cache_value
+)
 from app.models.benchmark import (
     BenchmarkData, BenchmarkDataPoint, BenchmarkInfo, BenchmarkComparison,
     CustomBenchmark, BenchmarkAnalysis
@@ -27,6 +31,34 @@ from app.models.portfolio import Portfolio, PortfolioMetrics
 from app.models.pie import Pie, PieMetrics
 
 
+async def _aiter(items):
+    """Async iterator over items, standing in for Redis SCAN iteration."""
+    for item in items:
+        yield item
+
+
+def _stream_response(payload, status_code=200, chunk_size=64):
+    """Mock of an httpx streaming response yielding the JSON payload in small chunks."""
+    body = orjson.dumps(payload)
+    response = MagicMock()
+    response.status_code = status_code
+    response.aiter_bytes = lambda: _aiter(
+        body[i:i + chunk_size] for i in range(0, len(body), chunk_size)
+    )
+    stream = MagicMock()
+    stream.__aenter__ = AsyncMock(return_value=response)
+    stream.__aexit__ = AsyncMock(return_value=False)
+    return stream
+
+
+@pytest.fixture(autouse=True)
+def clear_benchmark_l1_cache():
+    """Start every test without in-process cached benchmark data."""
+    _benchmark_l1_cache.invalidate()
+    yield
+    _benchmark_l1_cache.invalidate()
+
+
 class TestBenchmarkDataFetching:
     """Test benchmark data fetching from external APIs."""
     
@@ -114,20 +146,23 @@ class TestBenchmarkDataFetching:
         mock_alpha_vantage_response
     ):
         """Test successful Alpha Vantage data fetching."""
-        # Create a proper mock response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = mock_alpha_vantage_response
-        
-        # Mock the session.get method to return the mock response
         with patch.object(benchmark_service, 'session') as mock_session:
-            mock_session.get = AsyncMock(return_value=mock_response)
+            mock_session.stream = MagicMock(return_value=_stream_response(mock_alpha_vantage_response))
             
             result = await benchmark_service._fetch_alpha_vantage_data("SPY", "1y")
             
             assert result is not None
-            assert result == mock_alpha_vantage_response
-            mock_session.get.assert_called_once()
+            # Only the fields the transform reads are kept from the stream
+            assert "Meta Data" not in result
+            assert result["Time Series (Daily)"]["2024-01-30"] == {
+                "4. close": "101.5000",
+                "6. volume": "1000000"
+            }
+            assert len(result["Time Series (Daily)"]) == 3
+            mock_session.stream.assert_called_once()
+            
+            transformed = benchmark_service._transform_alpha_vantage_data(result, "SPY", "1y")
+            assert [p.price for p in transformed.data_points] == [99.0, 100.0, 101.5]
     
     @pytest.mark.asyncio
     async def test_fetch_alpha_vantage_data_api_error(self, benchmark_service):
@@ -137,12 +172,7 @@ class TestBenchmarkDataFetching:
         }
         
         with patch.object(benchmark_service, 'session') as mock_session:
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = error_response
-            mock_session.get.return_value = mock_response
-            
-            benchmark_service.session = mock_session
+            mock_session.stream = MagicMock(return_value=_stream_response(error_response))
             
             result = await benchmark_service._fetch_alpha_vantage_data("INVALID", "1y")
             
@@ -156,12 +186,17 @@ class TestBenchmarkDataFetching:
         }
         
         with patch.object(benchmark_service, 'session') as mock_session:
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = rate_limit_response
-            mock_session.get.return_value = mock_response
+            mock_session.stream = MagicMock(return_value=_stream_response(rate_limit_response))
             
-            benchmark_service.session = mock_session
+            result = await benchmark_service._fetch_alpha_vantage_data("SPY", "1y")
+            
+            assert result is None
+    
+    @pytest.mark.asyncio
+    async def test_fetch_alpha_vantage_data_http_error(self, benchmark_service):
+        """Test Alpha Vantage non-200 responses are not parsed."""
+        with patch.object(benchmark_service, 'session') as mock_session:
+            mock_session.stream = MagicMock(return_value=_stream_response({}, status_code=503))
             
             result = await benchmark_service._fetch_alpha_vantage_data("SPY", "1y")
             
@@ -177,7 +212,7 @@ class TestBenchmarkDataFetching:
         # Create a proper mock response
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = mock_yahoo_finance_response
+        mock_response.content = orjson.dumps(mock_yahoo_finance_response)
         
         # Mock the session.get method to return the mock response
         with patch.object(benchmark_service, 'session') as mock_session:
@@ -189,6 +224,28 @@ class TestBenchmarkDataFetching:
             assert result == mock_yahoo_finance_response
             mock_session.get.assert_called_once()
     
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("period,days", [("1mo", 30), ("5y", 1825), ("max", 3650), ("unknown", 3650)])
+    async def test_fetch_yahoo_finance_data_period_range(
+        self, 
+        benchmark_service, 
+        mock_yahoo_finance_response,
+        period,
+        days
+    ):
+        """Test the requested Yahoo Finance range matches the period lookback."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.content = orjson.dumps(mock_yahoo_finance_response)
+        
+        with patch.object(benchmark_service, 'session') as mock_session:
+            mock_session.get = AsyncMock(return_value=mock_response)
+            
+            await benchmark_service._fetch_yahoo_finance_data("SPY", period)
+            
+            params = mock_session.get.call_args.kwargs["params"]
+            assert params["period2"] - params["period1"] == pytest.approx(days * 86400, abs=1)
+    
     @pytest.mark.asyncio
     async def test_fetch_yahoo_finance_data_no_data(self, benchmark_service):
         """Test Yahoo Finance response with no data."""
@@ -202,7 +259,7 @@ class TestBenchmarkDataFetching:
         with patch.object(benchmark_service, 'session') as mock_session:
             mock_response = MagicMock()
             mock_response.status_code = 200
-            mock_response.json.return_value = no_data_response
+            mock_response.content = orjson.dumps(no_data_response)
             mock_session.get.return_value = mock_response
             
             benchmark_service.session = mock_session
@@ -256,6 +313,24 @@ class TestBenchmarkDataFetching:
         assert result.data_points[1].return_pct is not None
         assert result.data_points[2].return_pct is not None
     
+    def test_transform_alpha_vantage_data_skips_invalid_rows(
+        self,
+        benchmark_service,
+        mock_alpha_vantage_response
+    ):
+        """Test that rows with an unparseable date or close are skipped."""
+        time_series = mock_alpha_vantage_response["Time Series (Daily)"]
+        time_series["not-a-date"] = dict(time_series["2024-01-30"])
+        time_series["2024-01-29"] = {**time_series["2024-01-29"], "4. close": "n/a"}
+        
+        result = benchmark_service._transform_alpha_vantage_data(
+            mock_alpha_vantage_response, "SPY", "1y"
+        )
+        
+        assert [dp.date for dp in result.data_points] == [datetime(2024, 1, 28), datetime(2024, 1, 30)]
+        assert [dp.price for dp in result.data_points] == [99.0, 101.5]
+        assert [dp.volume for dp in result.data_points] == [900000, 1000000]
+    
     @pytest.mark.asyncio
     async def test_transform_yahoo_finance_data(
         self, 
@@ -278,6 +353,41 @@ class TestBenchmarkDataFetching:
         assert result.data_points[1].price == Decimal("100.0")
         assert result.data_points[2].price == Decimal("101.5")
     
+    def test_transform_yahoo_finance_data_skips_missing_closes(
+        self,
+        benchmark_service,
+        mock_yahoo_finance_response
+    ):
+        """Test that rows without a close are dropped before returns are computed."""
+        quote = mock_yahoo_finance_response["chart"]["result"][0]["indicators"]["quote"][0]
+        quote["close"] = [99.0, None, 101.5]
+        quote["volume"] = [900000, 950000, None]
+        
+        result = benchmark_service._transform_yahoo_finance_data(
+            mock_yahoo_finance_response, "SPY", "1y"
+        )
+        
+        assert [dp.price for dp in result.data_points] == [Decimal("99.0"), Decimal("101.5")]
+        assert result.data_points[0].return_pct is None
+        assert float(result.data_points[1].return_pct) == pytest.approx(2.5 / 99.0 * 100)
+        assert [dp.volume for dp in result.data_points] == [900000, None]
+        assert result.start_date < result.end_date
+    
+    def test_compute_stats_known_series(self):
+        """Test summary statistics against hand-computed values."""
+        prices = np.array([100.0, 110.0, 99.0, 121.0])
+        
+        total, annualized, volatility, max_drawdown, sharpe = BenchmarkService._compute_stats(prices, 0)
+        
+        returns = np.array([0.1, -0.1, 22.0 / 99.0])
+        assert total == pytest.approx(21.0)
+        assert annualized == pytest.approx(21.0)  # No elapsed days
+        assert volatility == pytest.approx(returns.std() * np.sqrt(252) * 100)
+        assert max_drawdown == pytest.approx(10.0)  # 110 -> 99
+        assert sharpe == pytest.approx((21.0 - 2.0) / volatility)
+        
+        assert BenchmarkService._compute_stats(np.array([100.0]), 0) == (0.0, 0.0, 0.0, 0.0, 0.0)
+    
     @pytest.mark.asyncio
     async def test_transform_data_invalid_format(self, benchmark_service):
         """Test transformation with invalid data format."""
@@ -289,6 +399,115 @@ class TestBenchmarkDataFetching:
         
         assert result is None
     
+    def test_alpha_vantage_series_key_follows_period(
+        self, 
+        benchmark_service, 
+        mock_alpha_vantage_response
+    ):
+        """Test the time series key is derived from the requested period."""
+        assert BenchmarkService._alpha_vantage_series("1d") == (
+            "TIME_SERIES_INTRADAY", "60min", "Time Series (60min)"
+        )
+        assert BenchmarkService._alpha_vantage_series("5y")[2] == "Time Series (Daily)"
+        
+        # A daily series is not read for an intraday period
+        assert benchmark_service._transform_alpha_vantage_data(
+            mock_alpha_vantage_response, "SPY", "1d"
+        ) is None
+    
+    @pytest.mark.asyncio
+    async def test_yahoo_finance_requests_are_bounded(self, benchmark_service, mock_yahoo_finance_response):
+        """Test concurrent Yahoo Finance requests stay within the provider limit."""
+        in_flight = 0
+        peak = 0
+        
+        async def slow_get(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            response = MagicMock()
+            response.status_code = 200
+            response.content = orjson.dumps(mock_yahoo_finance_response)
+            return response
+        
+        with patch.object(benchmark_service, 'session') as mock_session:
+            mock_session.get = slow_get
+            
+            results = await asyncio.gather(*[
+                benchmark_service._fetch_yahoo_finance_data("SPY", "1y") for _ in range(20)
+            ])
+        
+        assert all(result is not None for result in results)
+        assert peak == BenchmarkService.PROVIDER_CONCURRENCY["yahoo_finance"]
+    
+    @pytest.mark.asyncio
+    async def test_instances_share_http_client(self):
+        """Test that service instances reuse one pooled HTTP client."""
+        with patch("app.services.benchmark_service.redis.from_url", side_effect=Exception("no redis")):
+            async with BenchmarkService() as first, BenchmarkService() as second:
+                assert first.session is second.session
+            
+            # Leaving the context keeps the shared client open
+            assert not first.session.is_closed
+        
+        await BenchmarkService.close_shared_session()
+        assert first.session.is_closed
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_fetches_are_coalesced(
+        self,
+        benchmark_service,
+        mock_yahoo_finance_response
+    ):
+        """Test that concurrent requests for the same benchmark share one upstream call."""
+        benchmark_service.alpha_vantage_api_key = None
+        
+        async def slow_fetch(symbol, period):
+            await asyncio.sleep(0.01)
+            return mock_yahoo_finance_response
+        
+        with patch.object(benchmark_service, '_fetch_yahoo_finance_data', side_effect=slow_fetch) as mock_fetch:
+            first, second = await asyncio.gather(
+                benchmark_service.fetch_benchmark_data("SPY", "1y", use_cache=False),
+                BenchmarkService().fetch_benchmark_data("SPY", "1y", use_cache=False)
+            )
+        
+        assert isinstance(first, BenchmarkData)
+        assert second is first
+        mock_fetch.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_coalesced_fetch(
+        self,
+        benchmark_service,
+        mock_yahoo_finance_response
+    ):
+        """Test that cancelling the caller that started a shared fetch leaves other callers served."""
+        benchmark_service.alpha_vantage_api_key = None
+        release = asyncio.Event()
+        
+        async def slow_fetch(symbol, period):
+            await release.wait()
+            return mock_yahoo_finance_response
+        
+        with patch.object(benchmark_service, '_fetch_yahoo_finance_data', side_effect=slow_fetch) as mock_fetch:
+            starter = asyncio.create_task(benchmark_service.fetch_benchmark_data("SPY", "1y", use_cache=False))
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(BenchmarkService().fetch_benchmark_data("SPY", "1y", use_cache=False))
+            await asyncio.sleep(0)
+            
+            starter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await starter
+            
+            release.set()
+            result = await waiter
+        
+        assert isinstance(result, BenchmarkData)
+        mock_fetch.assert_called_once()
+    
     @pytest.mark.asyncio
     async def test_rate_limit_checking(self, benchmark_service):
         """Test rate limit checking functionality."""
@@ -300,7 +519,24 @@ class TestBenchmarkDataFetching:
         assert await benchmark_service._check_rate_limit("alpha_vantage") is False
         
         # Test rate limit reset
-        benchmark_service._rate_limits["alpha_vantage"]["reset_time"] = datetime.utcnow() - timedelta(minutes=2)
+        benchmark_service._rate_limits["alpha_vantage"]["reset_ns"] = time.monotonic_ns() - 1
+        assert await benchmark_service._check_rate_limit("alpha_vantage") is True
+    
+    @pytest.mark.asyncio
+    async def test_rate_limit_uses_shared_token_bucket(self, benchmark_service):
+        """Test that the Redis token bucket decides when it is available."""
+        script = AsyncMock(side_effect=[1, 0])
+        benchmark_service._rate_limit_script = script
+        
+        assert await benchmark_service._check_rate_limit("alpha_vantage") is True
+        assert await benchmark_service._check_rate_limit("alpha_vantage") is False
+        
+        call = script.await_args
+        assert call.kwargs["keys"] == ["rate_limit:benchmark:alpha_vantage"]
+        assert call.kwargs["args"][:3] == [5, 5 / 60, 1]
+        
+        # Falls back to the local counter if the script fails
+        script.side_effect = Exception("NOSCRIPT")
         assert await benchmark_service._check_rate_limit("alpha_vantage") is True
     
     @pytest.mark.asyncio
@@ -373,14 +609,15 @@ class TestBenchmarkCaching:
         benchmark_service.redis_client = mock_redis_client
         
         # Mock cached data
-        cached_data = json.dumps(sample_benchmark_data.model_dump(), default=str)
+        cached_data = _pack_cache_value(sample_benchmark_data.model_dump())
         mock_redis_client.get.return_value = cached_data
         
         result = await benchmark_service._get_cached_data("test_key")
         
         assert result is not None
         assert result["symbol"] == "SPY"
-        mock_redis_client.get.assert_called_once_with("test_key")
+        assert BenchmarkData(**result) == sample_benchmark_data
+        mock_redis_client.get.assert_called_once_with("v2:test_key")
     
     @pytest.mark.asyncio
     async def test_cache_get_miss(self, benchmark_service, mock_redis_client):
@@ -391,7 +628,7 @@ class TestBenchmarkCaching:
         result = await benchmark_service._get_cached_data("test_key")
         
         assert result is None
-        mock_redis_client.get.assert_called_once_with("test_key")
+        mock_redis_client.get.assert_called_once_with("v2:test_key")
     
     @pytest.mark.asyncio
     async def test_cache_get_error(self, benchmark_service, mock_redis_client):
@@ -413,9 +650,21 @@ class TestBenchmarkCaching:
         
         mock_redis_client.setex.assert_called_once()
         args = mock_redis_client.setex.call_args[0]
-        assert args[0] == "test_key"
+        assert args[0] == "v2:test_key"
         assert args[1] == 3600
-        assert json.loads(args[2]) == test_data
+        assert isinstance(args[2], bytes)
+        assert _unpack_cache_value(args[2]) == test_data
+    
+    @pytest.mark.asyncio
+    async def test_cache_set_model_round_trip(self, benchmark_service, mock_redis_client, sample_benchmark_data):
+        """Test models are cached without a dict conversion and read back unchanged."""
+        benchmark_service.redis_client = mock_redis_client
+        
+        await benchmark_service._set_cached_data("test_key", sample_benchmark_data, 3600)
+        
+        packed = mock_redis_client.setex.call_args[0][2]
+        assert packed == _pack_cache_value(sample_benchmark_data.model_dump())
+        assert BenchmarkData(**_unpack_cache_value(packed)) == sample_benchmark_data
     
     @pytest.mark.asyncio
     async def test_cache_set_error(self, benchmark_service, mock_redis_client):
@@ -445,7 +694,7 @@ class TestBenchmarkCaching:
         benchmark_service.redis_client = mock_redis_client
         
         # Mock cache hit
-        cached_data = json.dumps(sample_benchmark_data.model_dump(), default=str)
+        cached_data = _pack_cache_value(sample_benchmark_data.model_dump())
         mock_redis_client.get.return_value = cached_data
         
         result = await benchmark_service.fetch_benchmark_data("SPY", "1y", use_cache=True)
@@ -454,6 +703,52 @@ class TestBenchmarkCaching:
         assert result.symbol == "SPY"
         mock_redis_client.get.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_fetch_benchmark_data_in_process_cache(
+        self,
+        benchmark_service,
+        mock_redis_client,
+        sample_benchmark_data
+    ):
+        """Test that repeated reads are served without going back to Redis."""
+        benchmark_service.redis_client = mock_redis_client
+        mock_redis_client.get.return_value = _pack_cache_value(sample_benchmark_data.model_dump())
+        
+        first = await benchmark_service.fetch_benchmark_data("SPY", "1y", use_cache=True)
+        second = await BenchmarkService().fetch_benchmark_data("SPY", "1y", use_cache=True)
+        
+        assert second is first
+        mock_redis_client.get.assert_called_once()
+        
+        # Clearing the cache also drops the in-process entry
+        await benchmark_service.clear_benchmark_cache("SPY")
+        await benchmark_service.fetch_benchmark_data("SPY", "1y", use_cache=True)
+        assert mock_redis_client.get.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_fetch_multiple_benchmarks_batches_cache_reads(
+        self,
+        benchmark_service,
+        mock_redis_client,
+        sample_benchmark_data
+    ):
+        """Test that cached benchmarks are read with one MGET and only misses are fetched."""
+        benchmark_service.redis_client = mock_redis_client
+        mock_redis_client.mget.return_value = [_pack_cache_value(sample_benchmark_data.model_dump()), None]
+        fetched = sample_benchmark_data.model_copy(update={"symbol": "QQQ"})
+        
+        with patch.object(benchmark_service, 'fetch_benchmark_data', return_value=fetched) as mock_fetch:
+            results = await benchmark_service.fetch_multiple_benchmarks(["SPY", "QQQ"], "1y")
+        
+        mock_redis_client.mget.assert_called_once_with(["v2:benchmark:SPY:1y", "v2:benchmark:QQQ:1y"])
+        mock_redis_client.get.assert_not_called()
+        mock_fetch.assert_called_once_with("QQQ", "1y", use_cache=False)
+        assert results["SPY"] == sample_benchmark_data
+        assert results["QQQ"] is fetched
+        
+        # The fetched miss is written back to the cache
+        assert mock_redis_client.setex.call_args[0][0] == "v2:benchmark:QQQ:1y"
+    
     @pytest.mark.asyncio
     async def test_fetch_benchmark_data_cache_miss_fallback(
         self, 
@@ -499,7 +794,7 @@ class TestBenchmarkCaching:
         # Mock successful API call
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = mock_yahoo_finance_response
+        mock_response.content = orjson.dumps(mock_yahoo_finance_response)
         
         with patch.object(benchmark_service, 'session') as mock_session:
             mock_session.get = AsyncMock(return_value=mock_response)
@@ -516,23 +811,40 @@ class TestBenchmarkCaching:
     async def test_clear_benchmark_cache_specific(self, benchmark_service, mock_redis_client):
         """Test clearing cache for specific benchmark."""
         benchmark_service.redis_client = mock_redis_client
-        mock_redis_client.keys.return_value = ["benchmark:SPY:1y", "benchmark:SPY:2y"]
+        mock_redis_client.scan_iter = MagicMock(
+            return_value=_aiter(["v2:benchmark:SPY:1y", "v2:benchmark:SPY:2y"])
+        )
         
         await benchmark_service.clear_benchmark_cache("SPY")
         
-        mock_redis_client.keys.assert_called_once_with("benchmark:SPY:*")
-        mock_redis_client.delete.assert_called_once()
+        mock_redis_client.scan_iter.assert_called_once_with(match="v2:benchmark:SPY:*", count=500)
+        mock_redis_client.unlink.assert_called_once_with("v2:benchmark:SPY:1y", "v2:benchmark:SPY:2y")
+        mock_redis_client.keys.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_clear_benchmark_cache_all(self, benchmark_service, mock_redis_client):
         """Test clearing all benchmark cache."""
         benchmark_service.redis_client = mock_redis_client
-        mock_redis_client.keys.return_value = ["benchmark:SPY:1y", "benchmark:QQQ:1y"]
+        mock_redis_client.scan_iter = MagicMock(
+            return_value=_aiter(["v2:benchmark:SPY:1y", "v2:benchmark:QQQ:1y"])
+        )
         
         await benchmark_service.clear_benchmark_cache()
         
-        mock_redis_client.keys.assert_called_once_with("benchmark:*")
-        mock_redis_client.delete.assert_called_once()
+        mock_redis_client.scan_iter.assert_called_once_with(match="v2:benchmark:*", count=500)
+        mock_redis_client.unlink.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_clear_benchmark_cache_unlinks_in_batches(self, benchmark_service, mock_redis_client):
+        """Test that large clears are unlinked in fixed-size batches."""
+        benchmark_service.redis_client = mock_redis_client
+        keys = [f"v2:benchmark:SYM{i}:1y" for i in range(1201)]
+        mock_redis_client.scan_iter = MagicMock(return_value=_aiter(keys))
+        
+        await benchmark_service.clear_benchmark_cache()
+        
+        batch_sizes = [len(call.args) for call in mock_redis_client.unlink.call_args_list]
+        assert batch_sizes == [500, 500, 201]
     
     @pytest.mark.asyncio
     async def test_clear_cache_no_redis(self, benchmark_service):
@@ -1058,6 +1370,10 @@ class TestBenchmarkServiceEdgeCases:
         # Search with no matches
         results = await benchmark_service.search_benchmarks("NONEXISTENT")
         assert len(results) == 0
+        
+        # Matches do not span the boundary between two fields
+        results = await benchmark_service.search_benchmarks("spy spdr")
+        assert len(results) == 0
     
     @pytest.mark.asyncio
     async def test_get_benchmark_info(self, benchmark_service):
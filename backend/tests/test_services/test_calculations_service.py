@@ -9,11 +9,13 @@ import pandas as pd
 import numpy as np
 
 from app.services.calculations_service import CalculationsService
+from app.models.position_batch import PositionBatch
 from app.models.position import Position
 from app.models.dividend import Dividend
 from app.models.historical import HistoricalData, PricePoint
 from app.models.enums import AssetType, DividendType, RiskCategory
-from app.models.pie import Pie
+from app.models.pie import Pie, PieMetrics
+from app.models.portfolio import Portfolio, PortfolioMetrics
 
 
 class TestCalculationsService:
@@ -247,6 +249,92 @@ class TestCalculationsService:
         assert conc_risk > Decimal('0')
         assert top_10_weight == Decimal('100')  # Only 3 positions, so top 10 is 100%
     
+    def test_compute_portfolio_aggregates(self):
+        """Test the fused aggregates match the per-metric calculations."""
+        aggregates = self.calc_service.compute_portfolio_aggregates(PositionBatch.from_positions(self.positions))
+        
+        assert aggregates.total_positions == 3
+        for aggregate, expected in (
+            (aggregates.sector_allocation, self.calc_service._calculate_sector_allocation(self.positions)),
+            (aggregates.country_allocation, self.calc_service._calculate_country_allocation(self.positions)),
+            (aggregates.asset_type_allocation, self.calc_service._calculate_asset_type_allocation(self.positions))
+        ):
+            allocation = aggregate.to_dict()
+            assert list(allocation) == sorted(expected, key=expected.get, reverse=True)
+            for key, value in expected.items():
+                assert abs(allocation[key] - value) < Decimal('0.000001')
+        
+        # Weights are 1600, 1600 and 8400 out of 11600
+        weights = np.array([1600, 1600, 8400]) / 11600
+        assert abs(float(aggregates.concentration_risk) - float(np.sum(weights ** 2)) * 100) < 1e-9
+        assert aggregates.top_10_weight == Decimal('100')
+        
+        empty = self.calc_service.compute_portfolio_aggregates(PositionBatch.from_positions([]))
+        assert empty.total_positions == 0
+        assert empty.sector_allocation.to_dict() == {}
+        assert empty.top_10_weight == Decimal('0')
+    
+    def test_get_portfolio_metrics_cached_by_data_revision(self):
+        """Test that metrics are reused across fetches of unchanged holdings."""
+        def make_portfolio(positions):
+            return Portfolio(
+                id="portfolio_cache_test",
+                user_id="user_456",
+                individual_positions=positions,
+                metrics=PortfolioMetrics(
+                    total_value=Decimal("0"),
+                    total_invested=Decimal("0"),
+                    total_return=Decimal("0"),
+                    total_return_pct=Decimal("0")
+                )
+            )
+        
+        CalculationsService.invalidate_metrics("portfolio_cache_test")
+        metrics = self.calc_service.get_portfolio_metrics(make_portfolio(list(self.positions)))
+        
+        # A re-fetched portfolio with the same holdings hits the cache
+        refetched = make_portfolio([position.model_copy() for position in self.positions])
+        assert CalculationsService().get_portfolio_metrics(refetched) is metrics
+        assert metrics.total_value == Decimal("11600")
+        
+        # Changed prices produce a new revision
+        repriced = make_portfolio([position.model_copy() for position in self.positions])
+        repriced.individual_positions[0].update_price(Decimal("170.00"))
+        assert self.calc_service.get_portfolio_metrics(repriced).total_value == Decimal("11700")
+        
+        # Invalidation forces a recalculation
+        CalculationsService.invalidate_metrics("portfolio_cache_test")
+        assert self.calc_service.get_portfolio_metrics(refetched) is not metrics
+    
+    def test_get_pie_metrics_skips_unchanged_pies(self):
+        """Test that pie metrics are reused until the pie's holdings change."""
+        def make_pie(positions):
+            return Pie(
+                id="pie_cache_test",
+                name="Cache Test Pie",
+                positions=positions,
+                metrics=PieMetrics(
+                    total_value=Decimal("0"),
+                    total_invested=Decimal("0"),
+                    total_return=Decimal("0"),
+                    total_return_pct=Decimal("0"),
+                    portfolio_weight=Decimal("0")
+                ),
+                created_at=datetime(2024, 1, 1)
+            )
+        
+        CalculationsService.invalidate_pie_metrics("pie_cache_test")
+        metrics = self.calc_service.get_pie_metrics(make_pie(list(self.positions)), Decimal("23200"))
+        assert metrics.portfolio_weight == Decimal("50")
+        
+        refetched = make_pie([position.model_copy() for position in self.positions])
+        assert self.calc_service.get_pie_metrics(refetched, Decimal("23200")) is metrics
+        
+        # A different portfolio total or changed holdings are recalculated
+        assert self.calc_service.get_pie_metrics(refetched, Decimal("11600")).portfolio_weight == Decimal("100")
+        refetched.remove_position("AAPL")
+        assert self.calc_service.get_pie_metrics(refetched, Decimal("23200")) is not metrics
+    
     def test_calculate_dividend_metrics(self):
         """Test dividend metrics calculation."""
         total_value = Decimal('11600')  # Sum of position values
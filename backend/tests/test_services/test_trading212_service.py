@@ -22,6 +22,10 @@ from app.services.trading212_service import (
     AuthResult
 )
 from app.models.enums import AssetType
+from app.models.pie import Pie, PieMetrics
+from app.models.portfolio import Portfolio, PortfolioMetrics
+from app.models.position import Position
+from app.services.calculations_service import CalculationsService
 
 
 class TestTrading212ServiceAuthentication:
@@ -649,6 +653,192 @@ class TestTrading212ServiceDataTransformation:
         assert dividend.payment_date.day == 15
 
 
+class TestTrading212ServiceBatchTransformation:
+    """Test batch position transformation, which needs no HTTP session."""
+    
+    @pytest.fixture
+    def service(self):
+        """Create Trading212Service instance without opening a session."""
+        return Trading212Service(use_demo=True)
+    
+    def test_transform_positions_batch(self, service):
+        """Test batch transformation matches row-by-row and skips invalid rows."""
+        raw_positions = [
+            {
+                "ticker": "AAPL",
+                "name": "Apple Inc.",
+                "quantity": 10.5,
+                "averagePrice": 150.25,
+                "currentPrice": 155.75,
+                "pplPercent": 3.66,
+                "sector": "Technology",
+                "type": "STOCK"
+            },
+            {"ticker": "BAD", "name": "Negative", "quantity": -1, "averagePrice": 10, "currentPrice": 10},
+            {"ticker": "VUSA", "name": "Vanguard S&P 500", "quantity": "4", "averagePrice": 0, "currentPrice": 80, "type": "ETF"}
+        ]
+        
+        positions = service._transform_positions(raw_positions)
+        
+        assert [position.symbol for position in positions] == ["AAPL", "VUSA"]
+        for position, raw_position in zip(positions, (raw_positions[0], raw_positions[2])):
+            expected = service._transform_position_data(raw_position)
+            assert position.model_dump(exclude={"last_updated"}) == expected.model_dump(exclude={"last_updated"})
+        
+        # Non-numeric amounts fall back to row-by-row validation
+        assert service._transform_positions([{**raw_positions[0], "quantity": "n/a"}]) == []
+    
+    @pytest.mark.parametrize("overrides", [
+        {"currency": None},
+        {"currency": 840},
+        {"sector": 12},
+        {"industry": ["Software"]},
+        {"country": {"code": "US"}}
+    ])
+    def test_transform_positions_rejects_invalid_string_fields(self, service, overrides):
+        """Test the batch path skips rows the row-by-row path rejects for string fields."""
+        raw_position = {
+            "ticker": "AAPL",
+            "name": "Apple Inc.",
+            "quantity": 10,
+            "averagePrice": 150,
+            "currentPrice": 155,
+            **overrides
+        }
+        
+        with pytest.raises(Trading212APIError):
+            service._transform_position_data(raw_position)
+        assert service._transform_positions([raw_position]) == []
+    
+    def test_transform_positions_skips_non_object_rows(self, service):
+        """Test rows that are not objects are skipped without failing the batch."""
+        raw_position = {"ticker": "AAPL", "name": "Apple Inc.", "quantity": 10, "averagePrice": 150, "currentPrice": 155}
+        
+        positions = service._transform_positions([raw_position, None, "AAPL", ["MSFT"]])
+        
+        assert [position.symbol for position in positions] == ["AAPL"]
+
+
+class TestTrading212ServicePortfolioMetrics:
+    """Test portfolio metrics produced by fetch_portfolio_data."""
+    
+    @pytest.fixture
+    def service(self):
+        """Create Trading212Service instance with the API calls mocked."""
+        service = Trading212Service(use_demo=True)
+        service.get_account_info = AsyncMock(return_value={"id": "metrics_cache_test", "currencyCode": "USD"})
+        service.get_pies = AsyncMock(return_value=[])
+        service.get_positions = AsyncMock(return_value=[
+            {"ticker": "AAPL", "name": "Apple Inc.", "quantity": 10, "averagePrice": 150, "currentPrice": 160, "sector": "Technology"},
+            {"ticker": "VUSA", "name": "Vanguard S&P 500", "quantity": 5, "averagePrice": 80, "currentPrice": 90, "type": "ETF"}
+        ])
+        service.get_cash_balance = AsyncMock(return_value={"free": 250})
+        return service
+    
+    @pytest.mark.asyncio
+    async def test_fetch_portfolio_data_uses_metrics_cache(self, service):
+        """Test that repeated fetches of unchanged holdings reuse the derived metrics."""
+        CalculationsService.invalidate_metrics("metrics_cache_test")
+        
+        with patch.object(
+            CalculationsService, "calculate_portfolio_metrics", autospec=True,
+            side_effect=CalculationsService.calculate_portfolio_metrics
+        ) as calculate:
+            first = await service.fetch_portfolio_data()
+            second = await service.fetch_portfolio_data()
+            
+            assert calculate.call_count == 1
+            
+            # A sync drops the cached metrics
+            CalculationsService.invalidate_metrics("metrics_cache_test")
+            await service.fetch_portfolio_data()
+            assert calculate.call_count == 2
+        
+        assert first.metrics.total_value == Decimal("2050")
+        assert first.metrics.cash_balance == Decimal("250")
+        assert first.metrics.sector_allocation
+        assert second.metrics == first.metrics
+
+
+class TestTrading212ServicePriceUpdates:
+    """Test applying price updates to a fetched portfolio."""
+    
+    @pytest.fixture
+    def service(self):
+        """Create Trading212Service instance without opening a session."""
+        return Trading212Service(use_demo=True)
+    
+    @pytest.fixture
+    def portfolio(self):
+        """Portfolio holding AAPL in two pies and individually, and MSFT individually."""
+        def position(symbol):
+            return Position(
+                symbol=symbol,
+                name=symbol,
+                quantity=Decimal("10"),
+                average_price=Decimal("100"),
+                current_price=Decimal("110"),
+                market_value=Decimal("1100"),
+                unrealized_pnl=Decimal("100"),
+                unrealized_pnl_pct=Decimal("10"),
+                asset_type=AssetType.STOCK
+            )
+        
+        def pie(pie_id):
+            return Pie(
+                id=pie_id,
+                name=pie_id,
+                positions=[position("AAPL")],
+                metrics=PieMetrics(
+                    total_value=Decimal("1100"),
+                    total_invested=Decimal("1000"),
+                    total_return=Decimal("100"),
+                    total_return_pct=Decimal("10"),
+                    portfolio_weight=Decimal("25")
+                ),
+                created_at=datetime(2024, 1, 1)
+            )
+        
+        return Portfolio(
+            id="price_update_test",
+            user_id="user_456",
+            pies=[pie("growth"), pie("income")],
+            individual_positions=[position("AAPL"), position("MSFT")],
+            metrics=PortfolioMetrics(
+                total_value=Decimal("4400"),
+                total_invested=Decimal("4000"),
+                total_return=Decimal("400"),
+                total_return_pct=Decimal("10")
+            )
+        )
+    
+    def test_apply_price_updates(self, service, portfolio):
+        """Test every holding of a symbol is repriced and derived holdings are refreshed."""
+        portfolio_revision = portfolio.data_revision
+        pie_revisions = [pie.data_revision for pie in portfolio.pies]
+        
+        updated = service.apply_price_updates(portfolio, {"AAPL": Decimal("120"), "TSLA": Decimal("250")})
+        
+        # AAPL in both pies and individually; TSLA is not held and is ignored
+        assert updated == 3
+        assert all(position.current_price == Decimal("120") for position in portfolio.find_positions("AAPL"))
+        assert portfolio.find_position("AAPL").market_value == Decimal("1200")
+        assert portfolio.find_position("MSFT").current_price == Decimal("110")
+        assert portfolio.find_position("TSLA") is None
+        
+        # Cached derived holdings were invalidated and reflect the new prices
+        assert portfolio.data_revision != portfolio_revision
+        assert all(pie.data_revision != revision for pie, revision in zip(portfolio.pies, pie_revisions))
+    
+    def test_apply_price_updates_unknown_symbols_only(self, service, portfolio):
+        """Test updates for symbols the portfolio does not hold change nothing."""
+        portfolio_revision = portfolio.data_revision
+        
+        assert service.apply_price_updates(portfolio, {"TSLA": Decimal("250")}) == 0
+        assert portfolio.data_revision == portfolio_revision
+        assert all(position.current_price == Decimal("110") for position in portfolio.all_positions)
+
+
 class TestTrading212ServiceHealthCheck:
     """Test health check functionality."""
     